@@ -0,0 +1,37 @@
+from django.contrib.auth.mixins import UserPassesTestMixin
+from django.db.models import Q
+
+from board.models import Project
+
+
+def can_edit_project(request, project_id):
+    """Tell whether ``request.user`` owns or is on the team of a project.
+
+    Answered with a single EXISTS query, memoized for the request.
+    """
+    answers = request.__dict__.setdefault("_project_access", {})
+    if project_id not in answers:
+        user = request.user
+        answers[project_id] = (
+            user.is_authenticated
+            and Project.objects.filter(
+                Q(owner=user) | Q(team__members=user), pk=project_id
+            ).exists()
+        )
+    return answers[project_id]
+
+
+class ProjectEditorRequiredMixin(UserPassesTestMixin):
+    """Let only the owner and team members of a project through.
+
+    The project is named by the ``project_url_kwarg`` URL argument; views
+    that reach it through another object override ``get_project_id()``.
+    """
+
+    project_url_kwarg = "pk"
+
+    def get_project_id(self):
+        return self.kwargs[self.project_url_kwarg]
+
+    def test_func(self):
+        return can_edit_project(self.request, self.get_project_id())
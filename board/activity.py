@@ -0,0 +1,136 @@
+"""Buffered writes to the activity log.
+
+Signals call ``record()``. Each entry waits for its transaction, or
+savepoint, to commit, so rolled-back changes leave no trace. Inside
+``deferred()``, which ``ActivityMiddleware`` opens around every request,
+committed entries are held and written with one ``bulk_create`` when the
+block ends. Elsewhere, such as in management commands, the last entry a
+transaction records writes them all as it commits; if that entry's
+savepoint is rolled back, the others wait for the next write.
+"""
+
+from contextlib import contextmanager
+from functools import partial
+
+from asgiref.local import Local
+from asgiref.sync import (
+    iscoroutinefunction,
+    markcoroutinefunction,
+    sync_to_async,
+)
+from django.db import transaction
+from django.utils import timezone
+
+from board.models import Activity
+
+_state = Local()
+
+
+def _committed():
+    if not hasattr(_state, "committed"):
+        _state.committed = []
+    return _state.committed
+
+
+def current_actor_id():
+    request = getattr(_state, "request", None)
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated:
+        return user.pk
+    return None
+
+
+def record(project_id, verb, model, object_id, **data):
+    if project_id is None:
+        return
+    entry = Activity(
+        project_id=project_id,
+        actor_id=current_actor_id(),
+        verb=verb,
+        model=model,
+        object_id=object_id,
+        data=data,
+        timestamp=timezone.now(),
+    )
+    if transaction.get_connection().in_atomic_block:
+        _state.last = entry
+        transaction.on_commit(partial(_commit, entry))
+    else:
+        _commit(entry, last=True)
+
+
+def _commit(entry, last=False):
+    _committed().append(entry)
+    if getattr(_state, "deferred", False):
+        return
+    if last or entry is getattr(_state, "last", None):
+        flush()
+
+
+def flush():
+    entries, _state.committed = _committed(), []
+    if entries:
+        Activity.objects.bulk_create(entries)
+    return len(entries)
+
+
+def _defer(request):
+    previous = (
+        getattr(_state, "request", None),
+        getattr(_state, "deferred", False),
+    )
+    _state.request = request or previous[0]
+    _state.deferred = True
+    # Created here, so ``sync_to_async`` threads append to this list.
+    _committed()
+    return previous
+
+
+def _restore(previous):
+    """Leave a ``_defer()`` block; tell whether entries should be written."""
+    _state.request, _state.deferred = previous
+    return not _state.deferred
+
+
+@contextmanager
+def deferred(request=None):
+    """Hold committed entries until the block ends, then write them once.
+
+    Entries recorded inside are attributed to ``request.user``.
+    """
+    previous = _defer(request)
+    try:
+        yield
+    finally:
+        if _restore(previous):
+            flush()
+
+
+class ActivityMiddleware:
+    """Attribute entries to the signed-in user and write them per request.
+
+    Under ASGI the view's ORM work runs in ``sync_to_async`` threads, which
+    see the request through the context-local state.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with deferred(request):
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        previous = _defer(request)
+        try:
+            return await self.get_response(request)
+        finally:
+            if _restore(previous):
+                await sync_to_async(flush)()
@@ -0,0 +1,402 @@
+"""Time a request to every named route of the board app.
+
+Each :class:`Scenario` names a route and builds its arguments and
+form or query data from the :class:`Targets` picked out of the dataset.
+Writes run in a savepoint that is rolled back, so every repeat sees the
+same rows. Results are plain dicts, ready to be saved as JSON and
+compared with a run from another commit.
+"""
+
+import statistics
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Callable, NamedTuple
+
+from django.contrib.auth import get_user_model
+from django.db import connections, router, transaction
+from django.db.models import Count
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+from board import bulk
+from board.models import Position, Project, Task, TaskType, Team
+from board.urls import urlpatterns
+
+# Routes that cannot be timed as a single request.
+SKIPPED = {"project-events": "streams until the client disconnects"}
+
+# Tasks sent to the list-style endpoints that take ids.
+TARGET_TASKS = 100
+
+
+class Scenario(NamedTuple):
+    url_name: str
+    method: str
+    build: Callable
+
+    @property
+    def label(self):
+        if self.method == "get":
+            return self.url_name
+        return f"{self.url_name} {self.method.upper()}"
+
+
+@dataclass
+class Targets:
+    """The rows the scenarios point at, the largest as the worst case."""
+
+    user: object
+    project: Project
+    board: object
+    other_board: object
+    tasks: list
+    worker: object
+    team: Team
+    task_type: TaskType
+    position: Position
+    word: str
+
+    @classmethod
+    def pick(cls):
+        project = (
+            Project.objects.filter(owner__isnull=False)
+            .select_related("owner", "team")
+            .order_by("-task_count", "pk")
+            .first()
+        )
+        board = project and project.boards.order_by("-task_count").first()
+        if board is None or board.task_count < 3:
+            raise ValueError("The dataset needs a board with three tasks.")
+        tasks = list(
+            board.tasks.select_related("task_type").order_by(
+                *Task.COLUMN_ORDERING
+            )[:TARGET_TASKS]
+        )
+        worker = (
+            get_user_model()
+            .objects.annotate(task_total=Count("tasks"))
+            .order_by("-task_total", "pk")
+            .first()
+        )
+        return cls(
+            user=project.owner,
+            project=project,
+            board=board,
+            other_board=(project.boards.exclude(pk=board.pk).first() or board),
+            tasks=tasks,
+            worker=worker,
+            team=project.team or Team.objects.first(),
+            task_type=tasks[0].task_type,
+            position=worker.position or Position.objects.first(),
+            word=tasks[0].name.split()[0].lower(),
+        )
+
+    @property
+    def task(self):
+        return self.tasks[0]
+
+    @property
+    def deadline(self):
+        return (timezone.localdate() + timedelta(days=30)).isoformat()
+
+
+def project_data(targets, name="Benchmark project"):
+    return {
+        "name": name,
+        "description": "Benchmark",
+        "deadline": targets.deadline,
+        "team": targets.team.pk if targets.team else "",
+        "owner": targets.user.pk,
+    }
+
+
+def task_data(targets):
+    return {
+        "name": "Benchmark task",
+        "description": "Benchmark",
+        "deadline": targets.deadline,
+        "priority": Task.HIGH,
+        "task_type": targets.task_type.pk,
+        "assignees": [targets.user.pk],
+    }
+
+
+def worker_data(targets):
+    return {
+        "username": "benchmark-worker",
+        "password1": "correct-horse-battery-9",
+        "password2": "correct-horse-battery-9",
+        "position": targets.position.pk,
+        "email": "benchmark@example.com",
+    }
+
+
+def team_data(targets):
+    members = list(targets.team.members.values_list("pk", flat=True))
+    return {"name": targets.team.name, "members": members or targets.user.pk}
+
+
+SCENARIOS = [
+    Scenario("index", "get", lambda t: ([], {})),
+    Scenario("search", "get", lambda t: ([], {"q": t.word})),
+    Scenario("project-list", "get", lambda t: ([], {})),
+    Scenario("project-create", "get", lambda t: ([], {})),
+    Scenario("project-create", "post", lambda t: ([], project_data(t))),
+    Scenario("project-update", "get", lambda t: ([t.project.pk], {})),
+    Scenario(
+        "project-update",
+        "post",
+        lambda t: ([t.project.pk], project_data(t, t.project.name)),
+    ),
+    Scenario("project-delete", "get", lambda t: ([t.project.pk], {})),
+    Scenario("project-delete", "post", lambda t: ([t.project.pk], {})),
+    Scenario("project-detail", "get", lambda t: ([t.project.pk], {})),
+    Scenario(
+        "project-changes", "get", lambda t: ([t.project.pk], {"since": 0})
+    ),
+    Scenario("project-activity", "get", lambda t: ([t.project.pk], {})),
+    Scenario("project-export", "get", lambda t: ([t.project.pk], {})),
+    Scenario("project-burndown", "get", lambda t: ([t.project.pk], {})),
+    Scenario("project-cumulative-flow", "get", lambda t: ([t.project.pk], {})),
+    Scenario("task-list", "get", lambda t: ([], {})),
+    Scenario(
+        "task-details",
+        "get",
+        lambda t: ([], {"ids": ",".join(str(task.pk) for task in t.tasks)}),
+    ),
+    Scenario(
+        "task-bulk",
+        "post",
+        lambda t: (
+            [],
+            {
+                "tasks": [task.pk for task in t.tasks],
+                "action": bulk.PRIORITY,
+                "priority": Task.URGENT,
+            },
+        ),
+    ),
+    Scenario("task-detail", "get", lambda t: ([t.task.pk], {})),
+    Scenario("task-update", "get", lambda t: ([t.task.pk], {})),
+    Scenario("task-update", "post", lambda t: ([t.task.pk], task_data(t))),
+    Scenario("task-create", "get", lambda t: ([t.board.pk], {})),
+    Scenario("task-create", "post", lambda t: ([t.board.pk], task_data(t))),
+    Scenario("task-change-board", "get", lambda t: ([t.task.pk], {})),
+    Scenario(
+        "task-change-board",
+        "post",
+        lambda t: ([t.task.pk], {"board": t.other_board.pk}),
+    ),
+    Scenario(
+        "task-reorder",
+        "post",
+        lambda t: (
+            [t.task.pk],
+            {"after": t.tasks[1].pk, "before": t.tasks[2].pk},
+        ),
+    ),
+    Scenario("board-create", "get", lambda t: ([t.project.pk], {})),
+    Scenario(
+        "board-create",
+        "post",
+        lambda t: ([t.project.pk], {"name": "Benchmark", "color": ""}),
+    ),
+    Scenario("board-delete", "get", lambda t: ([t.board.pk], {})),
+    Scenario("board-delete", "post", lambda t: ([t.board.pk], {})),
+    Scenario("board-update", "get", lambda t: ([t.board.pk], {})),
+    Scenario(
+        "board-update",
+        "post",
+        lambda t: (
+            [t.board.pk],
+            {"name": t.board.name, "project": t.project.pk, "color": ""},
+        ),
+    ),
+    Scenario("board-tasks", "get", lambda t: ([t.board.pk], {})),
+    Scenario("task-delete", "get", lambda t: ([t.task.pk], {})),
+    Scenario("task-delete", "post", lambda t: ([t.task.pk], {})),
+    Scenario("worker-list", "get", lambda t: ([], {})),
+    Scenario("worker-detail", "get", lambda t: ([t.worker.pk], {})),
+    Scenario("worker-activity", "get", lambda t: ([t.user.pk], {})),
+    Scenario("worker-create", "get", lambda t: ([], {})),
+    Scenario("worker-create", "post", lambda t: ([], worker_data(t))),
+    Scenario(
+        "worker-autocomplete",
+        "get",
+        lambda t: ([], {"q": t.worker.username[:3]}),
+    ),
+    Scenario("team-create", "get", lambda t: ([], {})),
+    Scenario("team-create", "post", lambda t: ([], team_data(t))),
+    Scenario("team-update", "get", lambda t: ([t.team.pk], {})),
+    Scenario("team-update", "post", lambda t: ([t.team.pk], team_data(t))),
+    # A GET that writes: it toggles the user's team membership.
+    Scenario("toggle-assign-to-team", "get", lambda t: ([t.project.pk], {})),
+    Scenario("task-type-create", "get", lambda t: ([], {})),
+    Scenario(
+        "task-type-create", "post", lambda t: ([], {"name": "Benchmark"})
+    ),
+    Scenario("task-type-list", "get", lambda t: ([], {})),
+    Scenario("task-type-detail", "get", lambda t: ([t.task_type.pk], {})),
+    Scenario("task-type-delete", "get", lambda t: ([t.task_type.pk], {})),
+    # Deleting a used type or position cascades to every task or worker;
+    # time the view on a spare one instead.
+    Scenario(
+        "task-type-delete",
+        "post",
+        lambda t: ([TaskType.objects.create(name="Spare").pk], {}),
+    ),
+    Scenario("task-type-update", "get", lambda t: ([t.task_type.pk], {})),
+    Scenario(
+        "task-type-update",
+        "post",
+        lambda t: ([t.task_type.pk], {"name": t.task_type.name}),
+    ),
+    Scenario("position-create", "get", lambda t: ([], {})),
+    Scenario("position-create", "post", lambda t: ([], {"name": "Benchmark"})),
+    Scenario("position-list", "get", lambda t: ([], {})),
+    Scenario("position-detail", "get", lambda t: ([t.position.pk], {})),
+    Scenario("position-delete", "get", lambda t: ([t.position.pk], {})),
+    Scenario(
+        "position-delete",
+        "post",
+        lambda t: ([Position.objects.create(name="Spare").pk], {}),
+    ),
+    Scenario("position-update", "get", lambda t: ([t.position.pk], {})),
+    Scenario(
+        "position-update",
+        "post",
+        lambda t: ([t.position.pk], {"name": t.position.name}),
+    ),
+    Scenario("register", "get", lambda t: ([], {})),
+    Scenario(
+        "register",
+        "post",
+        lambda t: ([], {**worker_data(t), "username": "benchmark-signup"}),
+    ),
+]
+
+
+def uncovered():
+    """URL names with neither a scenario nor a reason to skip them."""
+    covered = {scenario.url_name for scenario in SCENARIOS} | set(SKIPPED)
+    return [
+        pattern.name
+        for pattern in urlpatterns
+        if pattern.name and pattern.name not in covered
+    ]
+
+
+class QueryTimer:
+    """Count, time and keep the statements run on a connection."""
+
+    def __init__(self):
+        self.statements = []
+        self.time = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.time += time.perf_counter() - started
+            self.statements.append(sql)
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+
+def send(client, scenario, targets):
+    """Make the scenario's request and read the whole response.
+
+    Returns ``(response, size, wall, timer)``; the wall time and the timer
+    cover the streamed body too, but not building the request.
+    """
+    args, data = scenario.build(targets)
+    path = reverse(f"board:{scenario.url_name}", args=args)
+    connection = connections[router.db_for_read(Task)]
+    timer = QueryTimer()
+    started = time.perf_counter()
+    with connection.execute_wrapper(timer):
+        response = getattr(client, scenario.method)(path, data)
+        if response.streaming:
+            size = sum(len(chunk) for chunk in response.streaming_content)
+        else:
+            size = len(response.content)
+    return response, size, time.perf_counter() - started, timer
+
+
+def measure(client, scenario, targets, repeat):
+    """Medians over ``repeat`` requests, each rolled back."""
+    walls = []
+    sql_times = []
+    counts = []
+    for _ in range(repeat):
+        with transaction.atomic():
+            response, size, wall, timer = send(client, scenario, targets)
+            transaction.set_rollback(True)
+        walls.append(wall)
+        sql_times.append(timer.time)
+        counts.append(timer.count)
+    return {
+        "status": response.status_code,
+        "wall_ms": round(statistics.median(walls) * 1000, 3),
+        "queries": max(counts),
+        "sql_ms": round(statistics.median(sql_times) * 1000, 3),
+        "bytes": size,
+    }
+
+
+def run(repeat=5, labels=None, targets=None):
+    """Measure every scenario, or those labelled ``labels``."""
+    targets = targets or Targets.pick()
+    # A failing route is recorded with its 500 rather than ending the run.
+    client = Client(raise_request_exception=False)
+    client.force_login(targets.user)
+    results = {}
+    for scenario in SCENARIOS:
+        if labels and scenario.label not in labels:
+            continue
+        results[scenario.label] = measure(client, scenario, targets, repeat)
+    return results
+
+
+def compare(
+    baseline,
+    results,
+    max_slowdown=1.25,
+    max_extra_queries=0,
+    min_difference_ms=1.0,
+):
+    """Regressions of ``results`` against ``baseline``, as messages.
+
+    A route regresses when its status changes, when it runs more than
+    ``max_extra_queries`` extra queries, or when its wall time grows by
+    more than ``max_slowdown`` times and ``min_difference_ms``, which
+    keeps timer noise on fast routes out.
+    """
+    regressions = []
+    for label, before in baseline.items():
+        after = results.get(label)
+        if after is None:
+            continue
+        if after["status"] != before["status"]:
+            regressions.append(
+                f"{label}: status {before['status']} -> {after['status']}"
+            )
+        if after["queries"] > before["queries"] + max_extra_queries:
+            regressions.append(
+                f"{label}: {before['queries']} -> {after['queries']} queries"
+            )
+        slower = after["wall_ms"] - before["wall_ms"]
+        if (
+            after["wall_ms"] > before["wall_ms"] * max_slowdown
+            and slower > min_difference_ms
+        ):
+            regressions.append(
+                f"{label}: {before['wall_ms']:.1f} -> "
+                f"{after['wall_ms']:.1f}ms"
+            )
+    return regressions
@@ -0,0 +1,173 @@
+"""How many queries each route may run, checked on two dataset sizes.
+
+Budgets are keyed by the scenario labels of :mod:`board.benchmarks`: the
+URL name, with the method for writes. A number holds for every size of
+``DATASETS``; a dict gives one per size, for a route whose work is meant
+to grow with the data. Either way, a route that runs more queries on the
+large dataset than on the small one without a larger budget for it has
+an N+1, and is reported with the statements that multiplied.
+
+The small dataset keeps every list shorter than a page, so a per-row
+query shows up as growth rather than hiding behind the page size.
+"""
+
+from collections import Counter
+
+from django.core.cache import caches
+from django.db import transaction
+from django.test import Client
+
+from board import benchmarks
+from board.synthetic import Sizes
+
+SMALL = "small"
+LARGE = "large"
+
+DATASETS = {
+    SMALL: Sizes(workers=3, teams=1, projects=2, boards=2, tasks=3, skew=0),
+    LARGE: Sizes(workers=30, teams=6, projects=8, boards=4, tasks=20, skew=0),
+}
+
+QUERY_BUDGETS = {
+    "index": 3,
+    "search": 4,
+    "project-list": 5,
+    "project-create": 2,
+    "project-create POST": 17,
+    "project-update": 5,
+    "project-update POST": 15,
+    "project-delete": 3,
+    "project-delete POST": 17,
+    "project-detail": 9,
+    "project-changes": 7,
+    "project-activity": 4,
+    "project-export": 9,
+    "project-burndown": 4,
+    "project-cumulative-flow": 4,
+    "task-list": 6,
+    "task-details": 5,
+    "task-bulk POST": 10,
+    "task-detail": 8,
+    "task-update": 7,
+    "task-update POST": 37,
+    "task-create": 5,
+    "task-create POST": 32,
+    "task-change-board": 5,
+    "task-change-board POST": 22,
+    "task-reorder POST": 14,
+    "board-create": 3,
+    "board-create POST": 8,
+    "board-delete": 3,
+    "board-delete POST": 16,
+    "board-update": 4,
+    "board-update POST": 11,
+    "board-tasks": 6,
+    "task-delete": 4,
+    "task-delete POST": 16,
+    "worker-list": 3,
+    "worker-detail": 5,
+    "worker-activity": 4,
+    "worker-create": 3,
+    "worker-create POST": 14,
+    "worker-autocomplete": 3,
+    "team-create": 2,
+    "team-create POST": 9,
+    "team-update": 5,
+    "team-update POST": 8,
+    "toggle-assign-to-team": 9,
+    "task-type-create": 2,
+    "task-type-create POST": 3,
+    "task-type-list": 3,
+    "task-type-detail": 3,
+    "task-type-delete": 3,
+    "task-type-delete POST": 5,
+    "task-type-update": 3,
+    "task-type-update POST": 5,
+    "position-create": 2,
+    "position-create POST": 4,
+    "position-list": 3,
+    "position-detail": 3,
+    "position-delete": 3,
+    "position-delete POST": 5,
+    "position-update": 3,
+    "position-update POST": 6,
+    "register": 1,
+    "register POST": 12,
+}
+
+# Statements shown per failing route.
+REPORTED_STATEMENTS = 5
+
+
+def budget(label, size):
+    allowed = QUERY_BUDGETS[label]
+    return allowed[size] if isinstance(allowed, dict) else allowed
+
+
+def record(targets, labels=None):
+    """The statements each scenario runs, keyed by label.
+
+    Caches are cleared first so each count is the cold, worst case. A
+    route that raises fails the recording rather than being budgeted by
+    its error page.
+    """
+    client = Client()
+    client.force_login(targets.user)
+    statements = {}
+    for scenario in benchmarks.SCENARIOS:
+        if labels and scenario.label not in labels:
+            continue
+        for cache in caches.all():
+            cache.clear()
+        with transaction.atomic():
+            _, _, _, timer = benchmarks.send(client, scenario, targets)
+            transaction.set_rollback(True)
+        statements[scenario.label] = timer.statements
+    return statements
+
+
+def summarize(statements, limit=REPORTED_STATEMENTS):
+    """The most repeated of ``statements``, with their counts."""
+    return "\n".join(
+        f"  {count} x {sql}"
+        for sql, count in Counter(statements).most_common(limit)
+    )
+
+
+def problems(small, large):
+    """What is wrong with the ``small`` and ``large`` recordings.
+
+    Returns a message per label that is over budget or grew with the data.
+    """
+    found = {}
+    for label in large:
+        counts = {SMALL: len(small[label]), LARGE: len(large[label])}
+        if label not in QUERY_BUDGETS:
+            found[label] = (
+                f"{label} has no query budget; it ran {counts[SMALL]} "
+                f"and {counts[LARGE]} queries."
+            )
+            continue
+        over = [
+            size
+            for size, count in counts.items()
+            if count > budget(label, size)
+        ]
+        if over:
+            size = over[-1]
+            statements = large[label] if size == LARGE else small[label]
+            found[label] = (
+                f"{label} ran {counts[size]} queries on the {size} "
+                f"dataset, over its budget of {budget(label, size)}:\n"
+                + summarize(statements)
+            )
+        elif counts[LARGE] > counts[SMALL] and budget(label, LARGE) <= budget(
+            label, SMALL
+        ):
+            grown = Counter(large[label])
+            grown.subtract(Counter(small[label]))
+            found[label] = (
+                f"{label} went from {counts[SMALL]} to {counts[LARGE]} "
+                "queries as the data grew:\n" + summarize(+grown)
+            )
+    return found
@@ -0,0 +1,244 @@
+"""One action applied to many tasks with set-based writes.
+
+``QuerySet.update()``, ``bulk_update()`` and through-table writes send no
+model signals, so each action does what the task receivers would have:
+board versions, delta-sync stamps, task counts, workers' timestamps,
+tombstones, the search index, the activity log and live events.
+"""
+
+from collections import defaultdict
+
+from django.db import connections, router, transaction
+from django.utils import timezone
+
+from board import activity
+from board.counters import shift_task_counts
+from board.models import (
+    Activity,
+    SearchEntry,
+    SiteCounters,
+    Task,
+    Tombstone,
+    next_sync_version,
+)
+from board.signals import announce_task, bump_board_versions, touch_workers
+
+MOVE = "move"
+COMPLETE = "complete"
+INCOMPLETE = "incomplete"
+ADD_ASSIGNEES = "add_assignees"
+REMOVE_ASSIGNEES = "remove_assignees"
+PRIORITY = "priority"
+DELETE = "delete"
+
+ACTION_CHOICES = [
+    (MOVE, "Move to board"),
+    (COMPLETE, "Mark complete"),
+    (INCOMPLETE, "Mark incomplete"),
+    (ADD_ASSIGNEES, "Add assignees"),
+    (REMOVE_ASSIGNEES, "Remove assignees"),
+    (PRIORITY, "Change priority"),
+    (DELETE, "Delete"),
+]
+
+MAX_TASKS = 500
+
+
+def by_project(tasks):
+    groups = defaultdict(list)
+    for task in tasks:
+        groups[task.board.project_id].append(task)
+    return groups
+
+
+def stamp(tasks, **changes):
+    """Write ``changes`` to ``tasks`` with a fresh sync version per project."""
+    now = timezone.now()
+    for project_id, group in by_project(tasks).items():
+        Task.objects.filter(pk__in=[task.pk for task in group]).update(
+            sync_version=next_sync_version(pk=project_id),
+            updated_at=now,
+            **changes,
+        )
+    bump_board_versions(pk__in={task.board_id for task in tasks})
+
+
+def log(tasks, verb, event_type, **data):
+    for task in tasks:
+        project_id = task.board.project_id
+        announce_task(task, event_type, project_id=project_id)
+        activity.record(
+            project_id, verb, Activity.TASK, task.pk, name=task.name, **data
+        )
+
+
+def move(tasks, board):
+    tasks = [task for task in tasks if task.board_id != board.pk]
+    if not tasks:
+        return []
+    deltas = defaultdict(lambda: [0, 0])
+    start = Task.end_position(board.pk)
+    version = next_sync_version(pk=board.project_id)
+    now = timezone.now()
+    previous = {}
+    for index, task in enumerate(tasks):
+        done = int(task.is_completed)
+        deltas[task.board_id][0] -= 1
+        deltas[task.board_id][1] -= done
+        deltas[board.pk][0] += 1
+        deltas[board.pk][1] += done
+        previous[task.pk] = task.board_id
+        task.board = board
+        task.position = start + index * Task.POSITION_GAP
+        task.sync_version = version
+        task.updated_at = now
+    Task.objects.bulk_update(
+        tasks, ["board", "position", "sync_version", "updated_at"]
+    )
+    bump_board_versions(pk__in=set(previous.values()) | {board.pk})
+    shift_task_counts(deltas)
+    for task in tasks:
+        announce_task(
+            task,
+            "task.moved",
+            project_id=board.project_id,
+            from_board=previous[task.pk],
+            position=task.position,
+        )
+        activity.record(
+            board.project_id,
+            Activity.MOVED,
+            Activity.TASK,
+            task.pk,
+            name=task.name,
+            from_board=previous[task.pk],
+            board=board.pk,
+        )
+    return tasks
+
+
+def set_completed(tasks, is_completed):
+    tasks = [task for task in tasks if task.is_completed != is_completed]
+    if not tasks:
+        return []
+    stamp(tasks, is_completed=is_completed)
+    step = 1 if is_completed else -1
+    deltas = defaultdict(lambda: [0, 0])
+    for task in tasks:
+        deltas[task.board_id][1] += step
+        task.is_completed = is_completed
+    shift_task_counts(deltas)
+    log(tasks, Activity.UPDATED, "task.updated", is_completed=is_completed)
+    return tasks
+
+
+def set_priority(tasks, priority):
+    tasks = [task for task in tasks if task.priority != priority]
+    if tasks:
+        stamp(tasks, priority=priority)
+        log(tasks, Activity.UPDATED, "task.updated", priority=priority)
+    return tasks
+
+
+def add_assignees(tasks, workers):
+    Through = Task.assignees.through
+    Through.objects.bulk_create(
+        [
+            Through(task_id=task.pk, worker_id=worker.pk)
+            for task in tasks
+            for worker in workers
+        ],
+        ignore_conflicts=True,
+    )
+    touch_workers(pk__in=[worker.pk for worker in workers])
+    stamp(tasks)
+    log(
+        tasks,
+        Activity.UPDATED,
+        "task.updated",
+        added_assignees=[worker.pk for worker in workers],
+    )
+    return tasks
+
+
+def remove_assignees(tasks, workers):
+    Task.assignees.through.objects.filter(
+        task_id__in=[task.pk for task in tasks],
+        worker_id__in=[worker.pk for worker in workers],
+    ).delete()
+    touch_workers(pk__in=[worker.pk for worker in workers])
+    stamp(tasks)
+    log(
+        tasks,
+        Activity.UPDATED,
+        "task.updated",
+        removed_assignees=[worker.pk for worker in workers],
+    )
+    return tasks
+
+
+def delete(tasks):
+    task_ids = [task.pk for task in tasks]
+    for project_id, group in by_project(tasks).items():
+        version = next_sync_version(pk=project_id)
+        Tombstone.objects.bulk_create(
+            Tombstone(
+                project_id=project_id,
+                model=Tombstone.TASK,
+                object_id=task.pk,
+                sync_version=version,
+            )
+            for task in group
+        )
+    deltas = defaultdict(lambda: [0, 0])
+    for task in tasks:
+        deltas[task.board_id][0] -= 1
+        deltas[task.board_id][1] -= int(task.is_completed)
+    shift_task_counts(deltas)
+    SiteCounters.add(tasks=-len(tasks))
+    SearchEntry.objects.filter(
+        kind=SearchEntry.TASK, object_id__in=task_ids
+    ).delete()
+    touch_workers(tasks__in=task_ids)
+    Task.assignees.through.objects.filter(task_id__in=task_ids).delete()
+    Task.attachments.through.objects.filter(task_id__in=task_ids).delete()
+    raw_delete(task_ids)
+    bump_board_versions(pk__in={task.board_id for task in tasks})
+    log(tasks, Activity.DELETED, "task.deleted")
+    return tasks
+
+
+def raw_delete(task_ids):
+    """Delete task rows whose relations are already gone.
+
+    ``QuerySet.delete()`` would load every task and send signals for each.
+    """
+    connection = connections[router.db_for_write(Task)]
+    table = connection.ops.quote_name(Task._meta.db_table)
+    placeholders = ", ".join(["%s"] * len(task_ids))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {table} WHERE id IN ({placeholders})", task_ids
+        )
+
+
+def apply(action, tasks, board=None, assignees=(), priority=None):
+    """Run ``action`` on ``tasks`` in one transaction.
+
+    ``tasks`` must be loaded with their board. Returns the tasks that
+    changed.
+    """
+    with transaction.atomic():
+        if action == MOVE:
+            return move(tasks, board)
+        if action in (COMPLETE, INCOMPLETE):
+            return set_completed(tasks, action == COMPLETE)
+        if action == PRIORITY:
+            return set_priority(tasks, priority)
+        if action == ADD_ASSIGNEES:
+            return add_assignees(tasks, assignees)
+        if action == REMOVE_ASSIGNEES:
+            return remove_assignees(tasks, assignees)
+        if action == DELETE:
+            return delete(tasks)
+    raise ValueError(f"Unknown bulk action: {action}")
@@ -0,0 +1,17 @@
+from django.core.cache import caches
+
+FRAGMENT_CACHE_ALIAS = "fragments"
+
+
+def fragment_cache():
+    """Cache holding rendered board columns.
+
+    LocMemCache evicts least recently read entries once ``MAX_ENTRIES`` is
+    reached, and every entry is at most one page of cards, so memory stays
+    bounded.
+    """
+    return caches[FRAGMENT_CACHE_ALIAS]
+
+
+def column_cache_key(board):
+    return f"board-column:{board.pk}:{board.version}"
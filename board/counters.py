@@ -0,0 +1,139 @@
+"""Denormalized task counts on boards and projects.
+
+Signals shift ``task_count`` and ``completed_count`` inside the transaction
+that changes the task. Writes that bypass signals must call
+``shift_task_counts`` themselves, and ``manage.py check_task_counts`` finds
+and repairs any drift.
+"""
+
+from collections import defaultdict
+
+from django.db.models import Count, F, Min, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from board.models import Board, Project, Task
+
+
+def task_count_deltas(task, created):
+    """Return ``{board_id: (tasks, completed)}`` for a task just saved."""
+    previous_board_id = task._loaded_board_id
+    moved = previous_board_id not in (None, task.board_id)
+    if not (created or moved or "is_completed" in task.__dict__):
+        # Deferred and never assigned, so completion cannot have changed.
+        return {}
+    done = int(bool(task.is_completed))
+    if created:
+        return {task.board_id: (1, done)}
+    if task._loaded_is_completed is None:
+        # Loaded without the field, so assume it did not change.
+        was_done = done
+    else:
+        was_done = int(bool(task._loaded_is_completed))
+    if moved:
+        return {previous_board_id: (-1, -was_done), task.board_id: (1, done)}
+    return {task.board_id: (0, done - was_done)}
+
+
+def counter_updates(tasks, completed):
+    return {
+        "task_count": F("task_count") + tasks,
+        "completed_count": F("completed_count") + completed,
+    }
+
+
+def shift_task_counts(deltas):
+    """Apply ``{board_id: (tasks, completed)}`` to boards and projects."""
+    deltas = {
+        board_id: delta
+        for board_id, delta in deltas.items()
+        if board_id is not None and any(delta)
+    }
+    if not deltas:
+        return
+    for board_id, delta in deltas.items():
+        Board.objects.filter(pk=board_id).update(**counter_updates(*delta))
+
+    now = timezone.now()
+    if len(deltas) == 1:
+        [(board_id, delta)] = deltas.items()
+        Project.objects.filter(boards=board_id).update(
+            updated_at=now, **counter_updates(*delta)
+        )
+        return
+
+    by_project = defaultdict(lambda: [0, 0])
+    boards = Board.objects.filter(pk__in=deltas).values_list(
+        "pk", "project_id"
+    )
+    for board_id, project_id in boards:
+        by_project[project_id][0] += deltas[board_id][0]
+        by_project[project_id][1] += deltas[board_id][1]
+    for project_id, delta in by_project.items():
+        if any(delta):
+            Project.objects.filter(pk=project_id).update(
+                updated_at=now, **counter_updates(*delta)
+            )
+
+
+def drifted(model, tasks_path):
+    """Rows of ``model`` whose stored counts differ from the tasks."""
+    return (
+        model.objects.annotate(
+            actual_tasks=Count(tasks_path, distinct=True),
+            actual_completed=Count(
+                tasks_path,
+                filter=Q(**{f"{tasks_path}__is_completed": True}),
+                distinct=True,
+            ),
+        )
+        .exclude(
+            task_count=F("actual_tasks"),
+            completed_count=F("actual_completed"),
+        )
+        .order_by("pk")
+    )
+
+
+def find_drift():
+    return [
+        *drifted(Board, "tasks"),
+        *drifted(Project, "boards__tasks"),
+    ]
+
+
+def repair(rows):
+    for row in rows:
+        type(row).objects.filter(pk=row.pk).update(
+            task_count=row.actual_tasks,
+            completed_count=row.actual_completed,
+        )
+
+
+def with_progress(projects, today=None):
+    """Annotate ``overdue_count`` and ``next_deadline`` of open tasks.
+
+    Totals come from the stored counts. The rest are correlated subqueries,
+    so they run only for the rows a page returns; joining tasks and
+    grouping would aggregate every project before the ``LIMIT``.
+    """
+    today = today or timezone.localdate()
+    open_tasks = (
+        Task.objects.filter(board__project=OuterRef("pk"), is_completed=False)
+        .order_by()
+        .values("board__project")
+    )
+    overdue = (
+        open_tasks.filter(deadline__lt=today)
+        .annotate(count=Count("pk"))
+        .values("count")
+    )
+    upcoming = (
+        open_tasks.filter(deadline__gte=today)
+        .annotate(first=Min("deadline"))
+        .values("first")
+    )
+    return projects.annotate(
+        overdue_count=Coalesce(Subquery(overdue), 0),
+        next_deadline=Subquery(upcoming),
+    )
@@ -0,0 +1,157 @@
+import asyncio
+import json
+import logging
+import select
+import threading
+import time
+from collections import defaultdict
+from functools import cache
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BACKEND = "board.events.LocalBroker"
+
+
+class Subscription:
+    """Queue of events for one stream, fed from any thread."""
+
+    max_pending = 500
+
+    def __init__(self, broker, project_id):
+        self.broker = broker
+        self.project_id = project_id
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=self.max_pending)
+        self.overflowed = False
+
+    def deliver(self, event):
+        self.loop.call_soon_threadsafe(self._put, event)
+
+    def _put(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    async def get(self, timeout=None):
+        """Return the next event, or ``None`` if ``timeout`` expires.
+
+        A client that fell too far behind receives a single ``resync``
+        event instead of the dropped ones.
+        """
+        if self.overflowed:
+            self.overflowed = False
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            return {"type": "resync"}
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class LocalBroker:
+    """In-process pub/sub; only streams served by this process see events."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions = defaultdict(set)
+
+    def subscribe(self, project_id):
+        subscription = Subscription(self, project_id)
+        with self._lock:
+            self._subscriptions[project_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscriptions = self._subscriptions[subscription.project_id]
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscriptions[subscription.project_id]
+
+    def publish(self, project_id, event):
+        self.dispatch(project_id, event)
+
+    def dispatch(self, project_id, event):
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(project_id, ()))
+        for subscription in subscriptions:
+            try:
+                subscription.deliver(event)
+            except RuntimeError:
+                # The stream's event loop is gone.
+                self.unsubscribe(subscription)
+
+
+class PostgresBroker(LocalBroker):
+    """Share events between worker processes through LISTEN/NOTIFY.
+
+    Every process runs one listener thread on its own connection and fans
+    incoming notifications out to its local subscriptions.
+    """
+
+    channel = "board_events"
+    reconnect_delay = 5
+
+    def __init__(self):
+        super().__init__()
+        self._listener = None
+
+    def publish(self, project_id, event):
+        payload = json.dumps({"project": project_id, "event": event})
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_notify(%s, %s)", [self.channel, payload])
+
+    def subscribe(self, project_id):
+        with self._lock:
+            if self._listener is None:
+                self._listener = threading.Thread(
+                    target=self._listen, name="board-events", daemon=True
+                )
+                self._listener.start()
+        return super().subscribe(project_id)
+
+    def _listen(self):
+        import psycopg2
+
+        while True:
+            try:
+                self._consume(psycopg2.connect(**self._connection_params()))
+            except psycopg2.Error:
+                logger.exception("Board event listener lost its connection")
+                time.sleep(self.reconnect_delay)
+
+    def _connection_params(self):
+        return connection.get_connection_params()
+
+    def _consume(self, listen_connection):
+        listen_connection.autocommit = True
+        with listen_connection.cursor() as cursor:
+            cursor.execute(f"LISTEN {self.channel}")
+        while True:
+            if not select.select([listen_connection], [], [], 30)[0]:
+                continue
+            listen_connection.poll()
+            while listen_connection.notifies:
+                notify = listen_connection.notifies.pop(0)
+                message = json.loads(notify.payload)
+                self.dispatch(message["project"], message["event"])
+
+
+@cache
+def get_broker():
+    return import_string(
+        getattr(settings, "BOARD_EVENTS_BACKEND", DEFAULT_BACKEND)
+    )()
+
+
+def publish_on_commit(project_id, event):
+    transaction.on_commit(lambda: get_broker().publish(project_id, event))
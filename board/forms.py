@@ -1,9 +1,13 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 from django.utils import timezone
 
 from django import forms
 from django.contrib.auth import get_user_model
 from django.contrib.auth.forms import UserCreationForm
+from django.core.exceptions import ValidationError
+from django.db.models import Exists, OuterRef
+from django.urls import reverse, reverse_lazy
+from django.utils.http import urlencode
 
 from .models import (
     Task,
@@ -14,7 +18,9 @@ from .models import (
     Worker,
     TaskType,
     Position,
+    SearchEntry,
 )
+from . import bulk
 
 
 class MultipleFileInput(forms.ClearableFileInput):
@@ -35,6 +41,44 @@ class MultipleFileField(forms.FileField):
         return result
 
 
+class AutocompleteSelectMultiple(forms.SelectMultiple):
+    """Multi-select that renders only the chosen options.
+
+    Further options come from ``url`` as the user types, so rendering
+    costs the same however many rows the field's queryset holds.
+    """
+
+    def __init__(self, url, attrs=None):
+        super().__init__(attrs)
+        self.url = url
+
+    class Media:
+        js = ["assets/js/autocomplete.js"]
+
+    def build_attrs(self, base_attrs, extra_attrs=None):
+        attrs = super().build_attrs(base_attrs, extra_attrs)
+        attrs["data-autocomplete-url"] = str(self.url)
+        return attrs
+
+    def optgroups(self, name, value, attrs=None):
+        try:
+            chosen = self.choices.queryset.filter(
+                pk__in=[v for v in value if v]
+            )
+            chosen = list(chosen)
+        except (ValueError, ValidationError):
+            chosen = []
+        options = []
+        for index, obj in enumerate(chosen):
+            option_value, label = self.choices.choice(obj)
+            options.append(
+                self.create_option(
+                    name, option_value, label, True, index, attrs=attrs
+                )
+            )
+        return [(None, options, 0)]
+
+
 def is_deadline_valid(deadline):
     return deadline and deadline > timezone.now().date()
 
@@ -61,6 +105,114 @@ class WorkerSearchForm(forms.Form):
     )
 
 
+class SearchForm(forms.Form):
+    q = forms.CharField(max_length=255)
+    kind = forms.MultipleChoiceField(
+        choices=SearchEntry.KIND_CHOICES, required=False
+    )
+    page = forms.IntegerField(min_value=1, required=False)
+
+    def clean_page(self):
+        return self.cleaned_data["page"] or 1
+
+
+class ReportRangeForm(forms.Form):
+    DEFAULT_DAYS = 30
+
+    start = forms.DateField(required=False)
+    end = forms.DateField(required=False)
+
+    def clean(self):
+        cleaned_data = super().clean()
+        end = cleaned_data.get("end") or timezone.localdate()
+        start = cleaned_data.get("start") or end - timedelta(
+            days=self.DEFAULT_DAYS - 1
+        )
+        if start > end:
+            raise forms.ValidationError(
+                "The range must not end before it starts."
+            )
+        cleaned_data.update(start=start, end=end)
+        return cleaned_data
+
+
+class TaskFilterForm(forms.Form):
+    COMPLETION_CHOICES = [
+        ("", "Any status"),
+        ("open", "Open"),
+        ("done", "Done"),
+    ]
+
+    project = forms.ModelChoiceField(
+        queryset=Project.objects.only("id", "name").order_by("name"),
+        required=False,
+        empty_label="Any project",
+    )
+    board = forms.ModelChoiceField(
+        queryset=Board.objects.none(),
+        required=False,
+        empty_label="Any board",
+    )
+    assignees = forms.ModelMultipleChoiceField(
+        queryset=get_user_model().objects.all(),
+        widget=AutocompleteSelectMultiple(
+            url=reverse_lazy("board:worker-autocomplete")
+        ),
+        required=False,
+    )
+    priority = forms.ChoiceField(
+        choices=[("", "Any priority"), *Task.PRIORITY_CHOICES],
+        required=False,
+    )
+    task_type = forms.ModelChoiceField(
+        queryset=TaskType.objects.all(),
+        required=False,
+        empty_label="Any type",
+    )
+    completion = forms.ChoiceField(choices=COMPLETION_CHOICES, required=False)
+    deadline_after = forms.DateField(
+        required=False, widget=forms.DateInput(attrs={"type": "date"})
+    )
+    deadline_before = forms.DateField(
+        required=False, widget=forms.DateInput(attrs={"type": "date"})
+    )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Boards are only offered once a project narrows them down.
+        project_id = self.data.get("project")
+        if project_id and project_id.isdigit():
+            self.fields["board"].queryset = Board.objects.filter(
+                project_id=project_id
+            )
+
+    def filter_queryset(self, tasks):
+        data = self.cleaned_data
+        if data["board"]:
+            tasks = tasks.filter(board=data["board"])
+        elif data["project"]:
+            tasks = tasks.filter(board__project=data["project"])
+        if data["assignees"]:
+            tasks = tasks.filter(
+                Exists(
+                    Task.assignees.through.objects.filter(
+                        task=OuterRef("pk"), worker__in=data["assignees"]
+                    )
+                )
+            )
+        if data["priority"]:
+            tasks = tasks.filter(priority=data["priority"])
+        if data["task_type"]:
+            tasks = tasks.filter(task_type=data["task_type"])
+        if data["completion"]:
+            tasks = tasks.filter(is_completed=data["completion"] == "done")
+        if data["deadline_after"]:
+            tasks = tasks.filter(deadline__gte=data["deadline_after"])
+        if data["deadline_before"]:
+            tasks = tasks.filter(deadline__lte=data["deadline_before"])
+        return tasks
+
+
 class ProjectCreationForm(forms.ModelForm):
 
     class Meta:
@@ -97,7 +249,9 @@ class BoardCreationForm(forms.ModelForm):
 class TaskForm(forms.ModelForm):
 
     assignees = forms.ModelMultipleChoiceField(
-        widget=forms.CheckboxSelectMultiple,
+        widget=AutocompleteSelectMultiple(
+            url=reverse_lazy("board:worker-autocomplete")
+        ),
         queryset=get_user_model().objects.all(),
         required=False,
     )
@@ -108,9 +262,14 @@ class TaskForm(forms.ModelForm):
         initial_board = kwargs.get("initial", {}).get("board", None)
 
         if initial_board:
-            self.fields["assignees"].queryset = Board.objects.get(
-                id=kwargs["initial"]["board"]
-            ).project.team.members.all()
+            assignees = self.fields["assignees"]
+            assignees.queryset = get_user_model().objects.filter(
+                teams__project__boards=initial_board
+            )
+            assignees.widget.url = "{}?{}".format(
+                reverse("board:worker-autocomplete"),
+                urlencode({"board": initial_board}),
+            )
 
     file_field = MultipleFileField()
 
@@ -167,9 +326,9 @@ class TaskChangeBoardForm(forms.ModelForm):
         initial_board = kwargs.get("initial", {}).get("project", None)
 
         if initial_board:
-            self.fields["board"].queryset = Project.objects.get(
-                id=kwargs["initial"]["project"]
-            ).boards.all()
+            self.fields["board"].queryset = Board.objects.filter(
+                project_id=initial_board
+            )
 
     class Meta:
         model = Task
@@ -178,10 +337,122 @@ class TaskChangeBoardForm(forms.ModelForm):
         ]
 
 
+class TaskBulkForm(forms.Form):
+    tasks = forms.ModelMultipleChoiceField(
+        queryset=Task.objects.select_related("board").only(
+            "id",
+            "name",
+            "is_completed",
+            "priority",
+            "board__id",
+            "board__project_id",
+        )
+    )
+    action = forms.ChoiceField(choices=bulk.ACTION_CHOICES)
+    board = forms.ModelChoiceField(
+        queryset=Board.objects.only("id", "project_id"), required=False
+    )
+    assignees = forms.ModelMultipleChoiceField(
+        queryset=get_user_model().objects.only("id"), required=False
+    )
+    priority = forms.ChoiceField(choices=Task.PRIORITY_CHOICES, required=False)
+
+    def clean_tasks(self):
+        if len(self.data.getlist("tasks")) > bulk.MAX_TASKS:
+            raise ValidationError(
+                f"Select at most {bulk.MAX_TASKS} tasks at a time."
+            )
+        return list(self.cleaned_data["tasks"])
+
+    def clean(self):
+        cleaned_data = super().clean()
+        action = cleaned_data.get("action")
+        tasks = cleaned_data.get("tasks")
+        if action == bulk.MOVE:
+            board = cleaned_data.get("board")
+            if board is None:
+                self.add_error("board", "Choose the board to move to.")
+            elif tasks and any(
+                task.board.project_id != board.project_id for task in tasks
+            ):
+                self.add_error(
+                    "board", "Tasks can only move within their project."
+                )
+        elif action in (bulk.ADD_ASSIGNEES, bulk.REMOVE_ASSIGNEES):
+            assignees = cleaned_data.get("assignees")
+            if not assignees:
+                self.add_error("assignees", "Choose at least one worker.")
+            elif action == bulk.ADD_ASSIGNEES and tasks:
+                self.check_team_members(tasks, assignees)
+        elif action == bulk.PRIORITY and not cleaned_data.get("priority"):
+            self.add_error("priority", "Choose a priority.")
+        return cleaned_data
+
+    def check_team_members(self, tasks, assignees):
+        """Assign only members of each task's project team, as TaskForm."""
+        project_ids = {task.board.project_id for task in tasks}
+        members = set(
+            get_user_model()
+            .objects.filter(
+                teams__project__in=project_ids,
+                pk__in=[worker.pk for worker in assignees],
+            )
+            .values_list("pk", "teams__project")
+        )
+        if any(
+            (worker.pk, project_id) not in members
+            for worker in assignees
+            for project_id in project_ids
+        ):
+            self.add_error(
+                "assignees",
+                "Only members of the project's team can be assigned.",
+            )
+
+
+class TaskReorderForm(forms.Form):
+    after = forms.ModelChoiceField(queryset=Task.objects.all(), required=False)
+    before = forms.ModelChoiceField(
+        queryset=Task.objects.all(), required=False
+    )
+
+    def __init__(self, *args, task, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.task = task
+        project_tasks = Task.objects.filter(
+            board__project_id=task.board.project_id
+        ).exclude(pk=task.pk)
+        self.fields["after"].queryset = project_tasks
+        self.fields["before"].queryset = project_tasks
+
+    def clean(self):
+        cleaned_data = super().clean()
+        after = cleaned_data.get("after")
+        before = cleaned_data.get("before")
+        if self.errors:
+            return cleaned_data
+        if not after and not before:
+            raise forms.ValidationError(
+                "Specify the task to place this one after or before."
+            )
+        if after and before:
+            if after.board_id != before.board_id:
+                raise forms.ValidationError(
+                    "Neighbour tasks must be on the same board."
+                )
+            if (after.position, after.id) >= (before.position, before.id):
+                raise forms.ValidationError(
+                    "The 'after' task must come before the 'before' task."
+                )
+        return cleaned_data
+
+
 class TeamForm(forms.ModelForm):
     members = forms.ModelMultipleChoiceField(
         queryset=get_user_model().objects.all(),
-        widget=forms.CheckboxSelectMultiple,
+        widget=AutocompleteSelectMultiple(
+            url=reverse_lazy("board:worker-autocomplete")
+        ),
     )
 
     class Meta:
@@ -0,0 +1,127 @@
+import random
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Min, Q
+
+from board.counters import with_progress
+from board.models import Board, Project, Task, TaskType
+from board.pagination import cursor_page, encode_cursor
+
+PAGE_SIZE = 25
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Time a page of the project list with its progress figures on "
+        "synthetic projects. They are created in a transaction that is "
+        "rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--projects", type=int, default=10_000)
+        parser.add_argument("--boards", type=int, default=3)
+        parser.add_argument("--max-tasks", type=int, default=8)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                rng = random.Random(options["seed"])
+                self.populate(rng, **options)
+                self.run(options["repeat"])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def populate(self, rng, projects, boards, max_tasks, **options):
+        started = time.perf_counter()
+        today = date.today()
+        projects = Project.objects.bulk_create(
+            Project(
+                name=f"Benchmark {index}",
+                description="Project list benchmark",
+                deadline=today + timedelta(days=rng.randint(0, 90)),
+            )
+            for index in range(projects)
+        )
+        boards = Board.objects.bulk_create(
+            Board(name=f"Column {index}", project=project)
+            for project in projects
+            for index in range(boards)
+        )
+        task_type = TaskType.objects.create(name="Benchmark")
+        tasks = Task.objects.bulk_create(
+            (
+                Task(
+                    name="Task",
+                    description="",
+                    deadline=today + timedelta(days=rng.randint(-30, 60)),
+                    is_completed=rng.random() < 0.4,
+                    board=board,
+                    task_type=task_type,
+                    position=position * Task.POSITION_GAP,
+                )
+                for board in boards
+                for position in range(rng.randint(0, max_tasks))
+            ),
+            batch_size=5000,
+        )
+        self.stdout.write(
+            f"Created {len(projects)} projects and {len(tasks)} tasks "
+            f"in {time.perf_counter() - started:.1f}s"
+        )
+
+    def run(self, repeat):
+        middle = Project.objects.order_by("-id")[
+            Project.objects.count() // 2
+        ].pk
+        cursors = {
+            "first page": None,
+            "middle page": encode_cursor([">", middle]),
+        }
+        variants = {
+            "subqueries": lambda: with_progress(Project.objects.all()),
+            "join + group": self.grouped,
+        }
+        for label, cursor in cursors.items():
+            for name, build in variants.items():
+                timing = self.best_of(
+                    repeat,
+                    lambda: list(
+                        cursor_page(build(), ("-id",), PAGE_SIZE, cursor)
+                    ),
+                )
+                self.stdout.write(
+                    f"{label:12} {name:13} {timing * 1000:8.1f}ms"
+                )
+
+    def grouped(self):
+        """The same figures from one join over every task, for comparison."""
+        today = date.today()
+        open_tasks = Q(boards__tasks__is_completed=False)
+        return Project.objects.annotate(
+            overdue_count=Count(
+                "boards__tasks",
+                filter=open_tasks & Q(boards__tasks__deadline__lt=today),
+            ),
+            next_deadline=Min(
+                "boards__tasks__deadline",
+                filter=open_tasks & Q(boards__tasks__deadline__gte=today),
+            ),
+        )
+
+    def best_of(self, repeat, run):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - started)
+        return min(timings)
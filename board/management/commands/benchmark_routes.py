@@ -0,0 +1,126 @@
+import json
+from dataclasses import asdict
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test.utils import override_settings
+
+from board import benchmarks, search
+from board.synthetic import Generator, Sizes
+
+DEFAULTS = Sizes()
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Time a request to every named route of the board app on a "
+        "synthetic dataset, created in a transaction that is rolled back. "
+        "Records wall time, query count, SQL time and response size per "
+        "route, optionally as JSON, and fails on regressions against a "
+        "baseline saved by an earlier run. Run with DJANGO_DEBUG=False."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=DEFAULTS.workers)
+        parser.add_argument("--teams", type=int, default=DEFAULTS.teams)
+        parser.add_argument("--projects", type=int, default=DEFAULTS.projects)
+        parser.add_argument("--boards", type=float, default=DEFAULTS.boards)
+        parser.add_argument("--tasks", type=float, default=DEFAULTS.tasks)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument(
+            "--route",
+            action="append",
+            dest="routes",
+            help="Only this route, e.g. 'project-detail' or "
+            "'task-create POST'. Repeatable.",
+        )
+        parser.add_argument("--output", help="Write the results here.")
+        parser.add_argument(
+            "--baseline", help="Results of an earlier run to compare with."
+        )
+        parser.add_argument(
+            "--max-slowdown",
+            type=float,
+            default=1.25,
+            help="Fail when a route gets this many times slower.",
+        )
+        parser.add_argument(
+            "--min-difference",
+            type=float,
+            default=1.0,
+            help="Ignore slowdowns smaller than this many milliseconds.",
+        )
+        parser.add_argument(
+            "--max-extra-queries",
+            type=int,
+            default=0,
+            help="Fail when a route runs more queries than this many extra.",
+        )
+
+    def handle(self, *args, **options):
+        sizes = Sizes(
+            workers=options["workers"],
+            teams=options["teams"],
+            projects=options["projects"],
+            boards=options["boards"],
+            tasks=options["tasks"],
+        )
+        dataset = {**asdict(sizes), "seed": options["seed"]}
+        baseline = None
+        if options["baseline"]:
+            with open(options["baseline"]) as file:
+                baseline = json.load(file)
+            if baseline["dataset"] != dataset:
+                raise CommandError(
+                    "The baseline was measured on a different dataset: "
+                    f"{baseline['dataset']}."
+                )
+
+        try:
+            with override_settings(ALLOWED_HOSTS=["testserver"]):
+                with transaction.atomic():
+                    generator = Generator(sizes, options["seed"], "benchmark")
+                    generator.run()
+                    search.index_new(generator.pks)
+                    results = benchmarks.run(
+                        options["repeat"], options["routes"]
+                    )
+                    raise Rollback
+        except Rollback:
+            pass
+
+        self.stdout.write(
+            f"{'route':32} {'status':>6} {'wall ms':>9} {'queries':>7} "
+            f"{'sql ms':>8} {'bytes':>10}"
+        )
+        for label, result in results.items():
+            self.stdout.write(
+                f"{label:32} {result['status']:>6} {result['wall_ms']:>9.1f} "
+                f"{result['queries']:>7} {result['sql_ms']:>8.1f} "
+                f"{result['bytes']:>10}"
+            )
+
+        if options["output"]:
+            with open(options["output"], "w") as file:
+                json.dump({"dataset": dataset, "routes": results}, file)
+                file.write("\n")
+
+        if baseline is not None:
+            regressions = benchmarks.compare(
+                baseline["routes"],
+                results,
+                max_slowdown=options["max_slowdown"],
+                max_extra_queries=options["max_extra_queries"],
+                min_difference_ms=options["min_difference"],
+            )
+            if regressions:
+                raise CommandError(
+                    "Regressions against the baseline:\n"
+                    + "\n".join(regressions)
+                )
+            self.stdout.write("No regressions against the baseline.")
@@ -0,0 +1,110 @@
+import random
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+
+from board import search
+from board.models import Board, Project, SearchEntry, Task, TaskType
+from board.synthetic import vocabulary
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Time indexed search against a substring scan on synthetic tasks. "
+        "The tasks are created in a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tasks", type=int, default=1_000_000)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                rng = random.Random(options["seed"])
+                words, weights = vocabulary(rng)
+                self.populate(options["tasks"], rng, words, weights)
+                self.run(options["repeat"], words)
+                raise Rollback
+        except Rollback:
+            pass
+
+    def populate(self, count, rng, words, weights):
+        started = time.perf_counter()
+        project = Project.objects.create(
+            name=f"search-benchmark-{time.time_ns()}",
+            description="Search benchmark",
+            deadline=date.today() + timedelta(days=30),
+        )
+        board = Board.objects.create(name="Benchmark", project=project)
+        task_type = TaskType.objects.create(name="Benchmark")
+        batch = []
+        for position in range(count):
+            batch.append(
+                Task(
+                    name=" ".join(
+                        rng.choices(words, cum_weights=weights, k=3)
+                    ),
+                    description=" ".join(
+                        rng.choices(words, cum_weights=weights, k=20)
+                    ),
+                    deadline=project.deadline,
+                    is_completed=False,
+                    board=board,
+                    task_type=task_type,
+                    position=position * Task.POSITION_GAP,
+                )
+            )
+            if len(batch) == 10_000:
+                Task.objects.bulk_create(batch)
+                batch = []
+        Task.objects.bulk_create(batch)
+        search.rebuild_index()
+        self.stdout.write(
+            f"Created and indexed {count} tasks "
+            f"in {time.perf_counter() - started:.1f}s"
+        )
+
+    def run(self, repeat, words):
+        queries = {
+            "common word": words[0],
+            "mid word": words[100],
+            "rare word": words[5000],
+            "prefix": words[50][:4],
+            "two words": f"{words[10]} {words[200]}",
+        }
+        for label, query in queries.items():
+            indexed = self.best_of(
+                repeat, lambda: search.search(query, [SearchEntry.TASK])
+            )
+            scan = self.best_of(repeat, lambda: self.scan(query))
+            self.stdout.write(
+                f"{label:12} {query!r:22} index {indexed * 1000:8.1f}ms   "
+                f"icontains {scan * 1000:8.1f}ms"
+            )
+
+    def scan(self, query):
+        """What substring search costs: a count plus the first page."""
+        tasks = Task.objects.all()
+        for term in query.split():
+            tasks = tasks.filter(
+                Q(name__icontains=term) | Q(description__icontains=term)
+            )
+        tasks.count()
+        return list(tasks.order_by("-pk")[:20])
+
+    def best_of(self, repeat, run):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - started)
+        return min(timings)
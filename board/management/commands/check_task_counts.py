@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from board.counters import find_drift, repair
+
+
+class Command(BaseCommand):
+    help = "Compare board and project task counts with the tasks and fix them."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report drift without repairing it.",
+        )
+
+    def handle(self, *args, dry_run, **options):
+        with transaction.atomic():
+            rows = find_drift()
+            for row in rows:
+                self.stdout.write(
+                    f"{row._meta.model_name} {row.pk}: "
+                    f"{row.task_count}/{row.completed_count} stored, "
+                    f"{row.actual_tasks}/{row.actual_completed} counted"
+                )
+            if not dry_run:
+                repair(rows)
+        if not rows:
+            self.stdout.write("Counts are consistent.")
+        elif dry_run:
+            self.stdout.write(f"{len(rows)} rows drifted.")
+        else:
+            self.stdout.write(f"Repaired {len(rows)} rows.")
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from board.models import Project
+from board.transfer import EXPORT_CHUNK_SIZE, FORMATS, JSONL, export_lines
+
+
+class Command(BaseCommand):
+    help = (
+        "Write a project's boards, tasks, assignees and attachment "
+        "metadata as JSONL or CSV."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("project", type=int, help="Project id.")
+        parser.add_argument("--format", choices=FORMATS, default=JSONL)
+        parser.add_argument(
+            "--output", help="File to write to instead of stdout."
+        )
+        parser.add_argument(
+            "--chunk-size", type=int, default=EXPORT_CHUNK_SIZE
+        )
+
+    def handle(self, *args, project, format, output, chunk_size, **options):
+        if not Project.objects.filter(pk=project).exists():
+            raise CommandError(f"Project {project} does not exist.")
+        lines = export_lines(project, format, chunk_size)
+        if output is None:
+            for line in lines:
+                self.stdout.write(line, ending="")
+            return
+        with open(output, "w", newline="", encoding="utf-8") as file:
+            file.writelines(lines)
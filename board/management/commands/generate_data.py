@@ -0,0 +1,93 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError, transaction
+
+from board import search
+from board.synthetic import Generator, Sizes
+
+DEFAULTS = Sizes()
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill the database with skewed synthetic workers, teams, projects, "
+        "boards, tasks, assignees and attachments. Counts per parent are "
+        "means; the same --seed always gives the same data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=DEFAULTS.workers)
+        parser.add_argument("--teams", type=int, default=DEFAULTS.teams)
+        parser.add_argument(
+            "--team-size",
+            type=float,
+            default=DEFAULTS.team_size,
+            help="Mean members per team.",
+        )
+        parser.add_argument("--projects", type=int, default=DEFAULTS.projects)
+        parser.add_argument(
+            "--boards",
+            type=float,
+            default=DEFAULTS.boards,
+            help="Mean boards per project.",
+        )
+        parser.add_argument(
+            "--tasks",
+            type=float,
+            default=DEFAULTS.tasks,
+            help="Mean tasks per board.",
+        )
+        parser.add_argument(
+            "--assignees",
+            type=float,
+            default=DEFAULTS.assignees,
+            help="Mean assignees per task.",
+        )
+        parser.add_argument(
+            "--attachments",
+            type=float,
+            default=DEFAULTS.attachments,
+            help="Mean attachments per task.",
+        )
+        parser.add_argument(
+            "--skew",
+            type=float,
+            default=DEFAULTS.skew,
+            help="0 gives every parent the mean; higher is more lopsided.",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--prefix",
+            default="synthetic",
+            help="Start of every generated name, to tell runs apart.",
+        )
+        parser.add_argument(
+            "--no-search-index",
+            action="store_false",
+            dest="search_index",
+            help="Skip search entries, about half the time of a large run; "
+            "run rebuild_search_index afterwards.",
+        )
+
+    def handle(self, *args, seed, prefix, search_index, **options):
+        sizes = Sizes(
+            **{name: options[name] for name in Sizes.__dataclass_fields__}
+        )
+        started = time.perf_counter()
+        try:
+            with transaction.atomic():
+                generator = Generator(sizes, seed, prefix)
+                created = generator.run()
+                if search_index:
+                    search.index_new(generator.pks)
+        except IntegrityError as error:
+            raise CommandError(
+                f"Could not generate data: {error}. Runs with the same "
+                "--seed and --prefix produce the same names."
+            )
+        if options["verbosity"] > 0:
+            self.stdout.write(
+                ", ".join(f"{count} {name}" for name, count in created.items())
+                + f" in {time.perf_counter() - started:.1f}s"
+            )
@@ -0,0 +1,76 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError, transaction
+
+from board.models import Team
+from board.transfer import (
+    ASSIGNEE,
+    CSV,
+    FORMATS,
+    IMPORT_BATCH_SIZE,
+    JSONL,
+    TASK,
+    TASK_ATTACHMENT,
+    ProjectImporter,
+    read_records,
+)
+
+SKIPPED = [
+    (TASK, "tasks on boards missing from the file"),
+    (ASSIGNEE, "assignees with unknown usernames or tasks"),
+    (TASK_ATTACHMENT, "attachment links to tasks missing from the file"),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Create a project from a file written by export_project. "
+        "Assignees and the owner are matched by username, the team by "
+        "name unless --team is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument(
+            "--format",
+            choices=FORMATS,
+            help="Defaults to csv for .csv files and jsonl otherwise.",
+        )
+        parser.add_argument(
+            "--name", help="Name of the new project, if not the exported one."
+        )
+        parser.add_argument(
+            "--team",
+            type=int,
+            help="Id of the team to give the project, for ambiguous names.",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=IMPORT_BATCH_SIZE
+        )
+
+    def handle(self, *args, path, format, name, team, batch_size, **options):
+        format = format or (CSV if path.endswith(".csv") else JSONL)
+        if team is not None:
+            try:
+                team = Team.objects.get(pk=team)
+            except Team.DoesNotExist:
+                raise CommandError(f"There is no team {team}.")
+        importer = ProjectImporter(name=name, team=team, batch_size=batch_size)
+        try:
+            with open(path, newline="", encoding="utf-8") as file:
+                with transaction.atomic():
+                    for record in read_records(file, format):
+                        importer.add(record)
+                    project = importer.finish()
+        except (IntegrityError, KeyError, ValueError) as error:
+            raise CommandError(f"Could not import {path}: {error!r}")
+
+        created = importer.created
+        self.stdout.write(
+            f"Imported project {project.pk} ({project.name}): "
+            f"{created['board']} boards, {created['task']} tasks, "
+            f"{created['assignee']} assignees, "
+            f"{created['attachment']} attachments"
+        )
+        for kind, reason in SKIPPED:
+            if importer.skipped[kind]:
+                self.stdout.write(f"Skipped {importer.skipped[kind]} {reason}")
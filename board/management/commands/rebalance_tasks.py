@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from board.models import Board
+from board.ordering import rebalance_board
+from board.signals import bump_board_versions
+
+
+class Command(BaseCommand):
+    help = "Respace task positions so every board has room to reorder."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "boards",
+            nargs="*",
+            type=int,
+            help="Board ids to rebalance (default: all boards).",
+        )
+
+    def handle(self, *args, **options):
+        board_ids = options["boards"] or Board.objects.values_list(
+            "pk", flat=True
+        )
+        for board_id in board_ids:
+            with transaction.atomic():
+                count = rebalance_board(board_id)
+                bump_board_versions(pk=board_id)
+            self.stdout.write(f"Board {board_id}: {count} tasks rebalanced")
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from board.models import SiteCounters
+
+
+class Command(BaseCommand):
+    help = "Recount the home page totals from the tables."
+
+    def handle(self, *args, **options):
+        counters = SiteCounters.rebuild()
+        self.stdout.write(
+            f"{counters.projects} projects "
+            f"({counters.active_projects} active), "
+            f"{counters.tasks} tasks, {counters.users} users"
+        )
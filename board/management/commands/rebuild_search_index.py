@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from board.search import REBUILD_BATCH_SIZE, rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search index from the current rows."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=REBUILD_BATCH_SIZE,
+            help="Rows inserted per query.",
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            count = rebuild_index(batch_size=options["batch_size"])
+        self.stdout.write(f"Indexed {count} entries")
@@ -0,0 +1,60 @@
+import os
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from board.seeding import SEED_BATCH_SIZE, seed
+
+
+class Command(BaseCommand):
+    help = (
+        "Load JSON fixtures like loaddata, but in bulk and only the rows "
+        "whose primary keys are not in the database yet. Rerunning it is "
+        "cheap."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("fixtures", nargs="+", metavar="fixture")
+        parser.add_argument("--batch-size", type=int, default=SEED_BATCH_SIZE)
+
+    def handle(self, *args, fixtures, batch_size, **options):
+        files = [
+            open(find_fixture(label), encoding="utf-8") for label in fixtures
+        ]
+        try:
+            created, skipped = seed(files, batch_size)
+        except ValueError as error:
+            raise CommandError(str(error))
+        finally:
+            for file in files:
+                file.close()
+
+        if options["verbosity"] > 1:
+            for model in sorted(created.keys() | skipped.keys(), key=str):
+                self.stdout.write(
+                    f"{model._meta.label}: {created.get(model, 0)} created, "
+                    f"{skipped.get(model, 0)} already there"
+                )
+        if options["verbosity"] > 0:
+            self.stdout.write(
+                f"Created {sum(created.values())} objects, "
+                f"skipped {sum(skipped.values())} that already existed"
+            )
+
+
+def find_fixture(label):
+    """Resolve ``label`` the way loaddata does for plain JSON fixtures."""
+    if os.path.isfile(label):
+        return label
+    if not label.endswith(".json"):
+        label += ".json"
+    dirs = [
+        os.path.join(app_config.path, "fixtures")
+        for app_config in apps.get_app_configs()
+    ]
+    for directory in [*dirs, *settings.FIXTURE_DIRS]:
+        path = os.path.join(directory, label)
+        if os.path.isfile(path):
+            return path
+    raise CommandError(f"No fixture named '{label}' found.")
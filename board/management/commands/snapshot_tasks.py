@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from board.reports import SNAPSHOT_BATCH_SIZE, snapshot_active_projects
+
+
+class Command(BaseCommand):
+    help = (
+        "Record today's task counts per board of every active project. "
+        "Safe to rerun: a second run the same day rewrites its rows."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=SNAPSHOT_BATCH_SIZE
+        )
+
+    def handle(self, *args, batch_size, **options):
+        day = timezone.localdate()
+        projects = boards = 0
+        for batch_projects, batch_boards in snapshot_active_projects(
+            day, batch_size
+        ):
+            projects += batch_projects
+            boards += batch_boards
+            if options["verbosity"] > 1:
+                self.stdout.write(f"{projects} projects so far")
+        if options["verbosity"] > 0:
+            self.stdout.write(
+                f"Snapshot of {day}: {boards} boards in {projects} projects"
+            )
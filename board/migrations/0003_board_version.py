@@ -0,0 +1,26 @@
+# Generated by Django 5.0.3 on 2026-10-18 06:12
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("board", "0002_alter_project_team"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="board",
+            name="version",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AlterField(
+            model_name="task",
+            name="assignees",
+            field=models.ManyToManyField(
+                blank=True, related_name="tasks", to=settings.AUTH_USER_MODEL
+            ),
+        ),
+    ]
@@ -0,0 +1,33 @@
+from django.db import migrations, models
+from django.db.models import F
+
+POSITION_GAP = 2**16
+
+
+def number_existing_tasks(apps, schema_editor):
+    Task = apps.get_model("board", "Task")
+    Task.objects.update(position=F("id") * POSITION_GAP)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("board", "0003_board_version"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="task",
+            name="position",
+            field=models.BigIntegerField(default=0, editable=False),
+            preserve_default=False,
+        ),
+        migrations.RunPython(number_existing_tasks, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["board", "position", "id"],
+                name="task_board_position_idx",
+            ),
+        ),
+    ]
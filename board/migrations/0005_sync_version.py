@@ -0,0 +1,81 @@
+# Generated by Django 5.0.3 on 2026-10-18 06:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("board", "0004_task_position"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Tombstone",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "model",
+                    models.CharField(
+                        choices=[("board", "Board"), ("task", "Task")],
+                        max_length=20,
+                    ),
+                ),
+                ("object_id", models.BigIntegerField()),
+                ("sync_version", models.PositiveBigIntegerField()),
+            ],
+        ),
+        migrations.AddField(
+            model_name="board",
+            name="sync_version",
+            field=models.PositiveBigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="project",
+            name="sync_version",
+            field=models.PositiveBigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="task",
+            name="sync_version",
+            field=models.PositiveBigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name="board",
+            index=models.Index(
+                fields=["project", "sync_version"],
+                name="board_project_sync_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["board", "sync_version"], name="task_board_sync_idx"
+            ),
+        ),
+        migrations.AddField(
+            model_name="tombstone",
+            name="project",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="tombstones",
+                to="board.project",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="tombstone",
+            index=models.Index(
+                fields=["project", "sync_version"],
+                name="tombstone_project_sync_idx",
+            ),
+        ),
+    ]
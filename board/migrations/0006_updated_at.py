@@ -0,0 +1,28 @@
+# Generated by Django 5.0.3 on 2026-10-18 06:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("board", "0005_sync_version"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="board",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name="project",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.AddField(
+            model_name="task",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.0.3 on 2026-10-18 06:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("board", "0006_updated_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SiteCounters",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("projects", models.BigIntegerField(default=0)),
+                ("active_projects", models.BigIntegerField(default=0)),
+                ("tasks", models.BigIntegerField(default=0)),
+                ("users", models.BigIntegerField(default=0)),
+            ],
+            options={
+                "verbose_name_plural": "site counters",
+            },
+        ),
+    ]
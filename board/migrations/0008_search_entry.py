@@ -0,0 +1,154 @@
+# Generated by Django 5.0.3 on 2026-10-18 06:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+POPULATE_SQL = [
+    "INSERT INTO board_searchentry (kind, object_id, project_id, title, body) "
+    "SELECT 'project', id, id, name, description FROM board_project",
+    "INSERT INTO board_searchentry (kind, object_id, project_id, title, body) "
+    "SELECT 'task', t.id, b.project_id, t.name, t.description "
+    "FROM board_task t JOIN board_board b ON b.id = t.board_id",
+    "INSERT INTO board_searchentry (kind, object_id, project_id, title, body) "
+    "SELECT 'worker', id, NULL, "
+    "COALESCE(NULLIF(TRIM(first_name || ' ' || last_name), ''), username), "
+    "username FROM board_worker",
+]
+
+
+# A copy of board.search's backend SQL as it stood for this migration, so
+# later changes to that module cannot alter what the migration does.
+INSTALL_SQL = {
+    "sqlite": [
+        """
+        CREATE VIRTUAL TABLE board_searchentry_fts USING fts5(
+            title, body,
+            content='board_searchentry', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+        )
+        """,
+        """
+        CREATE TRIGGER board_searchentry_fts_insert
+        AFTER INSERT ON board_searchentry
+        BEGIN
+            INSERT INTO board_searchentry_fts(rowid, title, body)
+            VALUES (new.id, new.title, new.body);
+        END
+        """,
+        """
+        CREATE TRIGGER board_searchentry_fts_delete
+        AFTER DELETE ON board_searchentry
+        BEGIN
+            INSERT INTO board_searchentry_fts(
+                board_searchentry_fts, rowid, title, body
+            )
+            VALUES ('delete', old.id, old.title, old.body);
+        END
+        """,
+        """
+        CREATE TRIGGER board_searchentry_fts_update
+        AFTER UPDATE ON board_searchentry
+        BEGIN
+            INSERT INTO board_searchentry_fts(
+                board_searchentry_fts, rowid, title, body
+            )
+            VALUES ('delete', old.id, old.title, old.body);
+            INSERT INTO board_searchentry_fts(rowid, title, body)
+            VALUES (new.id, new.title, new.body);
+        END
+        """,
+        "INSERT INTO board_searchentry_fts(board_searchentry_fts) "
+        "VALUES ('rebuild')",
+    ],
+    "postgresql": [
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+        "CREATE INDEX search_entry_vector_idx ON board_searchentry "
+        "USING gin ((setweight(to_tsvector('simple', title), 'A') || "
+        "setweight(to_tsvector('simple', body), 'B')))",
+        "CREATE INDEX search_entry_title_trgm_idx ON board_searchentry "
+        "USING gin (title gin_trgm_ops)",
+    ],
+}
+
+UNINSTALL_SQL = {
+    "sqlite": [
+        "DROP TRIGGER IF EXISTS board_searchentry_fts_insert",
+        "DROP TRIGGER IF EXISTS board_searchentry_fts_delete",
+        "DROP TRIGGER IF EXISTS board_searchentry_fts_update",
+        "DROP TABLE IF EXISTS board_searchentry_fts",
+    ],
+    "postgresql": [
+        "DROP INDEX IF EXISTS search_entry_vector_idx",
+        "DROP INDEX IF EXISTS search_entry_title_trgm_idx",
+    ],
+}
+
+
+def install_search_index(apps, schema_editor):
+    for sql in INSTALL_SQL.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(sql)
+
+
+def uninstall_search_index(apps, schema_editor):
+    for sql in UNINSTALL_SQL.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("board", "0007_site_counters"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SearchEntry",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("project", "Project"),
+                            ("task", "Task"),
+                            ("worker", "Worker"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("object_id", models.BigIntegerField()),
+                ("title", models.CharField(max_length=255)),
+                ("body", models.TextField(blank=True)),
+                (
+                    "project",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="board.project",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "search entries",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="searchentry",
+            constraint=models.UniqueConstraint(
+                fields=("kind", "object_id"), name="search_entry_object_uniq"
+            ),
+        ),
+        migrations.RunSQL(POPULATE_SQL, migrations.RunSQL.noop),
+        migrations.RunPython(install_search_index, uninstall_search_index),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.0.3 on 2026-10-18 06:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("board", "0009_worker_name_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["deadline", "id"], name="task_deadline_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["board", "deadline", "id"],
+                name="task_board_deadline_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["is_completed", "deadline", "id"],
+                name="task_completed_deadline_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["priority", "deadline", "id"],
+                name="task_priority_deadline_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["task_type", "deadline", "id"],
+                name="task_type_deadline_idx",
+            ),
+        ),
+    ]
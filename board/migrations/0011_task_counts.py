@@ -0,0 +1,68 @@
+# Generated by Django 5.0.3 on 2026-10-18 06:59
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_tasks(tasks, **match):
+    counts = (
+        tasks.filter(**match)
+        .order_by()
+        .values(*match)
+        .annotate(
+            total=Count("pk"), done=Count("pk", filter=Q(is_completed=True))
+        )
+    )
+    return {
+        field: Coalesce(
+            Subquery(counts.values(aggregate)[:1]),
+            0,
+            output_field=IntegerField(),
+        )
+        for field, aggregate in (
+            ("task_count", "total"),
+            ("completed_count", "done"),
+        )
+    }
+
+
+def count_existing_tasks(apps, schema_editor):
+    Task = apps.get_model("board", "Task")
+    apps.get_model("board", "Board").objects.update(
+        **count_tasks(Task.objects, board_id=OuterRef("pk"))
+    )
+    apps.get_model("board", "Project").objects.update(
+        **count_tasks(Task.objects, board__project_id=OuterRef("pk"))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("board", "0010_task_list_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="board",
+            name="completed_count",
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="board",
+            name="task_count",
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="project",
+            name="completed_count",
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="project",
+            name="task_count",
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_existing_tasks, migrations.RunPython.noop),
+    ]
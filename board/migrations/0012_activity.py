@@ -0,0 +1,94 @@
+# Generated by Django 5.0.3 on 2026-10-18 07:11
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("board", "0011_task_counts"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Activity",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "verb",
+                    models.CharField(
+                        choices=[
+                            ("created", "created"),
+                            ("updated", "updated"),
+                            ("moved", "moved"),
+                            ("deleted", "deleted"),
+                            ("joined", "joined"),
+                            ("left", "left"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "model",
+                    models.CharField(
+                        choices=[
+                            ("project", "Project"),
+                            ("board", "Board"),
+                            ("task", "Task"),
+                            ("member", "Team member"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("object_id", models.BigIntegerField()),
+                ("data", models.JSONField(default=dict)),
+                (
+                    "timestamp",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                (
+                    "actor",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "project",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to="board.project",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "activities",
+                "indexes": [
+                    models.Index(
+                        fields=["project", "timestamp", "id"],
+                        name="activity_project_time_idx",
+                    ),
+                    models.Index(
+                        fields=["actor", "timestamp", "id"],
+                        name="activity_actor_time_idx",
+                    ),
+                ],
+            },
+        ),
+    ]
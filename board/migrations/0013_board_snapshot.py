@@ -0,0 +1,63 @@
+# Generated by Django 5.0.3 on 2026-10-18 07:13
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("board", "0012_activity"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BoardSnapshot",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("open_count", models.PositiveIntegerField(default=0)),
+                ("completed_count", models.PositiveIntegerField(default=0)),
+                ("overdue_count", models.PositiveIntegerField(default=0)),
+                (
+                    "board",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to="board.board",
+                    ),
+                ),
+                (
+                    "project",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="snapshots",
+                        to="board.project",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["project", "date"],
+                        name="snapshot_project_date_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="boardsnapshot",
+            constraint=models.UniqueConstraint(
+                fields=("board", "date"), name="snapshot_board_date_unique"
+            ),
+        ),
+    ]
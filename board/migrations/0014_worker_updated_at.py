@@ -0,0 +1,18 @@
+# Generated by Django 5.0.3 on 2026-10-18 08:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("board", "0013_board_snapshot"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="worker",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.3 on 2026-10-18 08:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("board", "0014_worker_updated_at"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="worker",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+    ]
@@ -0,0 +1,85 @@
+from django.contrib import messages
+from django.http import Http404
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+from board.pagination import InvalidCursor, cursor_page, estimated_count
+
+
+class ConditionalGetMixin:
+    """Answer ``If-None-Match``/``If-Modified-Since`` before rendering.
+
+    Subclasses return cheap validators from ``get_etag()`` and/or
+    ``get_last_modified()``; returning ``None`` from both skips the check.
+    """
+
+    def get_etag(self):
+        return None
+
+    def get_last_modified(self):
+        return None
+
+    def has_pending_notices(self):
+        return bool(len(messages.get_messages(self.request)))
+
+    def get(self, request, *args, **kwargs):
+        if self.has_pending_notices():
+            return super().get(request, *args, **kwargs)
+
+        etag = self.get_etag()
+        etag = quote_etag(str(etag)) if etag is not None else None
+        last_modified = self.get_last_modified()
+        last_modified = (
+            int(last_modified.timestamp()) if last_modified else None
+        )
+
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+        if etag:
+            response.headers.setdefault("ETag", etag)
+        if last_modified:
+            response.headers.setdefault(
+                "Last-Modified", http_date(last_modified)
+            )
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+
+class CachedObjectMixin:
+    """Fetch the view's object once, however often it is asked for."""
+
+    def get_object(self, queryset=None):
+        if queryset is not None:
+            return super().get_object(queryset)
+        if not hasattr(self, "_cached_object"):
+            self._cached_object = super().get_object()
+        return self._cached_object
+
+
+class CursorPaginationMixin:
+    """Keyset pagination for list views, without an exact ``COUNT(*)``.
+
+    ``ordering`` must end with a unique field. Pages are addressed by an
+    opaque ``?cursor=`` and ``page_obj`` becomes a ``CursorPage``.
+    """
+
+    def paginate_queryset(self, queryset, page_size):
+        try:
+            page = cursor_page(
+                queryset,
+                self.get_ordering(),
+                page_size,
+                cursor=self.request.GET.get("cursor"),
+            )
+        except InvalidCursor:
+            raise Http404("Invalid cursor.")
+        return None, page, page.object_list, page.has_other_pages()
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["cursor_pagination"] = True
+        context["estimated_count"] = estimated_count(self.object_list)
+        return context
@@ -1,8 +1,31 @@
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
+from django.db.models.functions import Lower
+from django.utils import timezone
 from django.contrib.auth.models import AbstractUser
 
 
+def next_sync_version(**project_lookup):
+    """Allocate the next change number of the matching project.
+
+    Call it inside the transaction that writes the change: the UPDATE keeps
+    the project row locked until commit, so no client can see a number
+    before the rows stamped with it are visible.
+    """
+    projects = Project.objects.filter(**project_lookup)
+    projects.update(sync_version=F("sync_version") + 1)
+    return projects.values_list("sync_version", flat=True).get()
+
+
+def with_update_fields(kwargs, *names):
+    # auto_now only fires for fields being saved, so partial saves must
+    # carry updated_at along or validators built on it go stale.
+    if kwargs.get("update_fields") is not None:
+        kwargs["update_fields"] = {*kwargs["update_fields"], *names}
+    return kwargs
+
+
 class Position(models.Model):
     name = models.CharField(max_length=255, unique=True)
 
@@ -23,6 +46,21 @@ class TaskType(models.Model):
 class Worker(AbstractUser):
     position = models.ForeignKey(Position, on_delete=models.CASCADE, null=True)
     avatar = models.ImageField(upload_to="avatars/", null=True, blank=True)
+    # Also touched when the worker's assignments or position change, which
+    # project pages show next to each team member.
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta(AbstractUser.Meta):
+        # Case-insensitive prefix lookups for autocomplete.
+        indexes = [
+            models.Index(Lower("username"), name="worker_username_lower_idx"),
+            models.Index(
+                Lower("first_name"), name="worker_first_name_lower_idx"
+            ),
+            models.Index(
+                Lower("last_name"), name="worker_last_name_lower_idx"
+            ),
+        ]
 
 
 class Task(models.Model):
@@ -31,6 +69,9 @@ class Task(models.Model):
 
     PRIORITY_CHOICES = [(URGENT, "Urgent"), (HIGH, "High")]
 
+    POSITION_GAP = 2**16
+    COLUMN_ORDERING = ("position", "id")
+
     name = models.CharField(max_length=255)
     board = models.ForeignKey(
         "Board", on_delete=models.CASCADE, related_name="tasks"
@@ -54,10 +95,60 @@ class Task(models.Model):
     attachments = models.ManyToManyField(
         "Attachment", related_name="tasks", blank=True
     )
+    position = models.BigIntegerField(editable=False)
+    sync_version = models.PositiveBigIntegerField(default=0, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["board", "position", "id"],
+                name="task_board_position_idx",
+            ),
+            models.Index(
+                fields=["board", "sync_version"],
+                name="task_board_sync_idx",
+            ),
+            # Task list filters, each ending in its (deadline, id) order.
+            models.Index(fields=["deadline", "id"], name="task_deadline_idx"),
+            models.Index(
+                fields=["board", "deadline", "id"],
+                name="task_board_deadline_idx",
+            ),
+            models.Index(
+                fields=["is_completed", "deadline", "id"],
+                name="task_completed_deadline_idx",
+            ),
+            models.Index(
+                fields=["priority", "deadline", "id"],
+                name="task_priority_deadline_idx",
+            ),
+            models.Index(
+                fields=["task_type", "deadline", "id"],
+                name="task_type_deadline_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        if self.position is None:
+            self.position = Task.end_position(self.board_id)
+        with transaction.atomic():
+            self.sync_version = next_sync_version(boards=self.board_id)
+            super().save(
+                *args,
+                **with_update_fields(kwargs, "sync_version", "updated_at"),
+            )
+
+    @classmethod
+    def end_position(cls, board_id):
+        last = cls.objects.filter(board_id=board_id).aggregate(
+            last=models.Max("position")
+        )["last"]
+        return (last or 0) + cls.POSITION_GAP
+
 
 class Team(models.Model):
     name = models.CharField(max_length=255)
@@ -73,10 +164,31 @@ class Board(models.Model):
         "Project", on_delete=models.CASCADE, related_name="boards"
     )
     color = models.CharField(max_length=7, null=True, blank=True)
+    version = models.PositiveIntegerField(default=0, editable=False)
+    task_count = models.IntegerField(default=0, editable=False)
+    completed_count = models.IntegerField(default=0, editable=False)
+    sync_version = models.PositiveBigIntegerField(default=0, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["project", "sync_version"],
+                name="board_project_sync_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            self.sync_version = next_sync_version(pk=self.project_id)
+            super().save(
+                *args,
+                **with_update_fields(kwargs, "sync_version", "updated_at"),
+            )
+
 
 class Project(models.Model):
     name = models.CharField(max_length=255, unique=True)
@@ -93,14 +205,237 @@ class Project(models.Model):
         default=None,
         null=True,
     )
+    sync_version = models.PositiveBigIntegerField(default=0, editable=False)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+    task_count = models.IntegerField(default=0, editable=False)
+    completed_count = models.IntegerField(default=0, editable=False)
 
     def __str__(self):
         return self.name
 
 
+class Tombstone(models.Model):
+    """Marks a board or task deleted at a project's ``sync_version``."""
+
+    BOARD = "board"
+    TASK = "task"
+
+    MODEL_CHOICES = [(BOARD, "Board"), (TASK, "Task")]
+
+    project = models.ForeignKey(
+        Project, on_delete=models.CASCADE, related_name="tombstones"
+    )
+    model = models.CharField(max_length=20, choices=MODEL_CHOICES)
+    object_id = models.BigIntegerField()
+    sync_version = models.PositiveBigIntegerField()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["project", "sync_version"],
+                name="tombstone_project_sync_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.model} {self.object_id}"
+
+
+class Activity(models.Model):
+    """One change to a project, its boards, tasks or team. Append-only.
+
+    The log outlives what it describes, so its foreign keys have neither
+    database constraints nor cascades.
+    """
+
+    CREATED = "created"
+    UPDATED = "updated"
+    MOVED = "moved"
+    DELETED = "deleted"
+    JOINED = "joined"
+    LEFT = "left"
+
+    VERB_CHOICES = [
+        (CREATED, "created"),
+        (UPDATED, "updated"),
+        (MOVED, "moved"),
+        (DELETED, "deleted"),
+        (JOINED, "joined"),
+        (LEFT, "left"),
+    ]
+
+    PROJECT = "project"
+    BOARD = "board"
+    TASK = "task"
+    MEMBER = "member"
+
+    MODEL_CHOICES = [
+        (PROJECT, "Project"),
+        (BOARD, "Board"),
+        (TASK, "Task"),
+        (MEMBER, "Team member"),
+    ]
+
+    project = models.ForeignKey(
+        Project,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="+",
+    )
+    actor = models.ForeignKey(
+        get_user_model(),
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        null=True,
+        related_name="+",
+    )
+    verb = models.CharField(max_length=20, choices=VERB_CHOICES)
+    model = models.CharField(max_length=20, choices=MODEL_CHOICES)
+    object_id = models.BigIntegerField()
+    data = models.JSONField(default=dict)
+    timestamp = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name_plural = "activities"
+        indexes = [
+            models.Index(
+                fields=["project", "timestamp", "id"],
+                name="activity_project_time_idx",
+            ),
+            models.Index(
+                fields=["actor", "timestamp", "id"],
+                name="activity_actor_time_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.verb} {self.model} {self.object_id}"
+
+
+class BoardSnapshot(models.Model):
+    """A board's task counts at the end of one day, for project reports."""
+
+    date = models.DateField()
+    project = models.ForeignKey(
+        Project, on_delete=models.CASCADE, related_name="snapshots"
+    )
+    # Boards can be deleted; their history stays in the reports.
+    board = models.ForeignKey(
+        Board,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="+",
+    )
+    open_count = models.PositiveIntegerField(default=0)
+    completed_count = models.PositiveIntegerField(default=0)
+    overdue_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["board", "date"], name="snapshot_board_date_unique"
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["project", "date"], name="snapshot_project_date_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"board {self.board_id} on {self.date}"
+
+
 class Attachment(models.Model):
     name = models.CharField(max_length=255)
     file = models.FileField(upload_to="attachments/")
 
     def __str__(self):
         return self.name
+
+
+class SearchEntry(models.Model):
+    """Searchable text of one project, task or worker.
+
+    Signals keep the rows current; ``board.search`` maintains the
+    database-specific full-text index over them.
+    """
+
+    PROJECT = "project"
+    TASK = "task"
+    WORKER = "worker"
+
+    KIND_CHOICES = [(PROJECT, "Project"), (TASK, "Task"), (WORKER, "Worker")]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    project = models.ForeignKey(
+        Project,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    title = models.CharField(max_length=255)
+    body = models.TextField(blank=True)
+
+    class Meta:
+        verbose_name_plural = "search entries"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["kind", "object_id"], name="search_entry_object_uniq"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.object_id}: {self.title}"
+
+
+class SiteCounters(models.Model):
+    """Totals for the home page, kept in a single row.
+
+    Signals adjust the row as projects, tasks and workers come and go;
+    writes that skip signals (``bulk_create``, ``QuerySet.update``) leave it
+    stale until ``manage.py rebuild_counters`` runs.
+    """
+
+    SINGLETON_ID = 1
+
+    projects = models.BigIntegerField(default=0)
+    active_projects = models.BigIntegerField(default=0)
+    tasks = models.BigIntegerField(default=0)
+    users = models.BigIntegerField(default=0)
+
+    class Meta:
+        verbose_name_plural = "site counters"
+
+    @classmethod
+    def load(cls):
+        try:
+            return cls.objects.get(pk=cls.SINGLETON_ID)
+        except cls.DoesNotExist:
+            return cls.rebuild()
+
+    @classmethod
+    def rebuild(cls):
+        counters, _ = cls.objects.update_or_create(
+            pk=cls.SINGLETON_ID,
+            defaults={
+                "projects": Project.objects.count(),
+                "active_projects": Project.objects.filter(
+                    is_completed=False
+                ).count(),
+                "tasks": Task.objects.count(),
+                "users": get_user_model().objects.count(),
+            },
+        )
+        return counters
+
+    @classmethod
+    def add(cls, **deltas):
+        """Atomically shift counters, e.g. ``add(tasks=1)``."""
+        deltas = {
+            name: F(name) + delta for name, delta in deltas.items() if delta
+        }
+        if deltas:
+            cls.objects.filter(pk=cls.SINGLETON_ID).update(**deltas)
@@ -0,0 +1,117 @@
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from board.models import Task, next_sync_version
+
+
+def rebalance_board(board_id):
+    """Spread the board's positions ``Task.POSITION_GAP`` apart again.
+
+    Moved tasks get a fresh delta-sync version, like any other change to
+    a task, so clients see the new order.
+    """
+    tasks = list(
+        Task.objects.filter(board_id=board_id)
+        .order_by(*Task.COLUMN_ORDERING)
+        .only("id", "position")
+    )
+    moved = []
+    for index, task in enumerate(tasks, start=1):
+        if task.position != index * Task.POSITION_GAP:
+            task.position = index * Task.POSITION_GAP
+            moved.append(task)
+    if moved:
+        sync_version = next_sync_version(boards=board_id)
+        now = timezone.now()
+        for task in moved:
+            task.sync_version = sync_version
+            task.updated_at = now
+        Task.objects.bulk_update(
+            moved, ["position", "sync_version", "updated_at"], batch_size=500
+        )
+    return len(tasks)
+
+
+def append_tasks(tasks):
+    """Give unsaved tasks without a position the next ones on their boards.
+
+    Costs one query for all the boards, for inserts that skip
+    ``Task.save()``.
+    """
+    unplaced = [task for task in tasks if task.position is None]
+    if not unplaced:
+        return
+    last = dict(
+        Task.objects.filter(board_id__in={task.board_id for task in unplaced})
+        .values("board_id")
+        .annotate(last=Max("position"))
+        .values_list("board_id", "last")
+    )
+    for task in tasks:
+        if task.position is not None:
+            last[task.board_id] = max(
+                last.get(task.board_id, 0), task.position
+            )
+    for task in unplaced:
+        last[task.board_id] = last.get(task.board_id, 0) + Task.POSITION_GAP
+        task.position = last[task.board_id]
+
+
+def neighbour_positions(task, after, before):
+    """Return the positions the moved ``task`` has to fit between."""
+    siblings = Task.objects.filter(
+        board_id=(after or before).board_id
+    ).exclude(pk=task.pk)
+    if after and not before:
+        before = (
+            siblings.filter(position__gt=after.position)
+            .order_by(*Task.COLUMN_ORDERING)
+            .first()
+        )
+    elif before and not after:
+        after = (
+            siblings.filter(position__lt=before.position)
+            .order_by("-position", "-id")
+            .first()
+        )
+    return (
+        after.position if after else None,
+        before.position if before else None,
+    )
+
+
+def free_position(lower, upper):
+    if lower is None and upper is None:
+        return Task.POSITION_GAP
+    if lower is None:
+        return upper - Task.POSITION_GAP
+    if upper is None:
+        return lower + Task.POSITION_GAP
+    if upper - lower > 1:
+        return (lower + upper) // 2
+    return None
+
+
+@transaction.atomic
+def place_task(task, after=None, before=None):
+    """Move ``task`` right after ``after`` and/or right before ``before``.
+
+    The common case rewrites only the moved row. When two neighbours have
+    run out of room between them, their board is renumbered first.
+    """
+    board_id = (after or before).board_id
+    lower, upper = neighbour_positions(task, after, before)
+    position = free_position(lower, upper)
+    if position is None:
+        rebalance_board(board_id)
+        for neighbour in (after, before):
+            if neighbour:
+                neighbour.refresh_from_db(fields=["position"])
+        lower, upper = neighbour_positions(task, after, before)
+        position = free_position(lower, upper)
+
+    task.board_id = board_id
+    task.position = position
+    task.save(update_fields=["board", "position"])
+    return task
@@ -0,0 +1,129 @@
+"""Daily board snapshots and the chart series built from them.
+
+``manage.py snapshot_tasks`` records every active project's boards once a
+day. Reports read only those rows, so they cost the same however many
+tasks a project has and show the past as it was, not as it is now.
+"""
+
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+
+from board.models import Board, BoardSnapshot, Project
+
+SNAPSHOT_BATCH_SIZE = 500
+
+
+def take_snapshots(day, project_ids):
+    """Upsert ``day``'s snapshot of every board of ``project_ids``."""
+    open_tasks = Q(tasks__is_completed=False)
+    boards = (
+        Board.objects.filter(project_id__in=project_ids)
+        .annotate(
+            open=Count("tasks", filter=open_tasks),
+            completed=Count("tasks", filter=Q(tasks__is_completed=True)),
+            overdue=Count(
+                "tasks", filter=open_tasks & Q(tasks__deadline__lt=day)
+            ),
+        )
+        .values_list("pk", "project_id", "open", "completed", "overdue")
+    )
+    snapshots = [
+        BoardSnapshot(
+            date=day,
+            board_id=board_id,
+            project_id=project_id,
+            open_count=open_count,
+            completed_count=completed,
+            overdue_count=overdue,
+        )
+        for board_id, project_id, open_count, completed, overdue in boards
+    ]
+    # Running twice on one day, or concurrently, just rewrites the rows.
+    BoardSnapshot.objects.bulk_create(
+        snapshots,
+        update_conflicts=True,
+        unique_fields=["board", "date"],
+        update_fields=["open_count", "completed_count", "overdue_count"],
+    )
+    return len(snapshots)
+
+
+def snapshot_active_projects(day, batch_size=SNAPSHOT_BATCH_SIZE):
+    """Snapshot active projects a batch at a time, one transaction each.
+
+    Yields ``(projects, boards)`` written per batch.
+    """
+    last_id = 0
+    while True:
+        project_ids = list(
+            Project.objects.filter(is_completed=False, pk__gt=last_id)
+            .order_by("pk")
+            .values_list("pk", flat=True)[:batch_size]
+        )
+        if not project_ids:
+            return
+        with transaction.atomic():
+            boards = take_snapshots(day, project_ids)
+        yield len(project_ids), boards
+        last_id = project_ids[-1]
+
+
+def snapshots(project_id, start, end):
+    return BoardSnapshot.objects.filter(
+        project_id=project_id, date__range=(start, end)
+    )
+
+
+def burndown(project_id, start, end):
+    """Open, completed and overdue tasks of the whole project per day."""
+    days = (
+        snapshots(project_id, start, end)
+        .values("date")
+        .annotate(
+            open=Sum("open_count"),
+            completed=Sum("completed_count"),
+            overdue=Sum("overdue_count"),
+        )
+        .order_by("date")
+    )
+    series = {"dates": [], "open": [], "completed": [], "overdue": []}
+    for day in days:
+        series["dates"].append(day["date"])
+        for name in ("open", "completed", "overdue"):
+            series[name].append(day[name])
+    return series
+
+
+def cumulative_flow(project_id, start, end):
+    """Tasks in each board per day, plus the project's completed tasks.
+
+    Every board gets a value for every day, zero before it existed or
+    after it was deleted, so the series stack.
+    """
+    rows = snapshots(project_id, start, end).values_list(
+        "date", "board_id", "open_count", "completed_count"
+    )
+    dates = []
+    counts = defaultdict(dict)
+    completed = defaultdict(int)
+    for day, board_id, open_count, completed_count in rows.order_by("date"):
+        if not dates or dates[-1] != day:
+            dates.append(day)
+        counts[board_id][day] = open_count + completed_count
+        completed[day] += completed_count
+
+    names = dict(Board.objects.filter(pk__in=counts).values_list("pk", "name"))
+    return {
+        "dates": dates,
+        "boards": [
+            {
+                "id": board_id,
+                "name": names.get(board_id, f"Deleted board {board_id}"),
+                "counts": [by_day.get(day, 0) for day in dates],
+            }
+            for board_id, by_day in sorted(counts.items())
+        ],
+        "completed": [completed[day] for day in dates],
+    }
@@ -0,0 +1,385 @@
+"""Full-text search over projects, tasks and workers.
+
+``SearchEntry`` rows hold the searchable text and signals keep them in step
+with the models. Each database indexes those rows its own way: an FTS5
+table on SQLite, GIN tsvector and trigram indexes on PostgreSQL. Other
+databases fall back to ``icontains`` scans.
+"""
+
+import re
+
+from django.contrib.auth import get_user_model
+from django.db import connections, router
+from django.db.models import Q, Value
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Lower
+
+from board.models import Project, SearchEntry, Task
+from board.sql import insert_rows
+
+MAX_TERMS = 8
+RANKED_MATCHES = 10_000
+REBUILD_BATCH_SIZE = 2000
+ENTRY_FIELDS = ("kind", "object_id", "project", "title", "body")
+
+WORD = re.compile(r"\w+")
+
+
+def parse_terms(query):
+    """Split free text into at most ``MAX_TERMS`` lowercase words."""
+    return WORD.findall(query.lower())[:MAX_TERMS]
+
+
+class BasicSearch:
+    """Unindexed substring matching, for databases without a backend."""
+
+    install_sql = []
+    uninstall_sql = []
+
+    def install(self, schema_editor):
+        for sql in self.install_sql:
+            schema_editor.execute(sql)
+
+    def uninstall(self, schema_editor):
+        for sql in self.uninstall_sql:
+            schema_editor.execute(sql)
+
+    def matching_ids(self, terms, kind):
+        """Ids of ``kind`` objects whose title holds every term."""
+        entries = SearchEntry.objects.filter(kind=kind)
+        for term in terms:
+            entries = entries.filter(title__icontains=term)
+        return entries.values("object_id")
+
+    def search(self, terms, kinds, limit, offset):
+        entries = SearchEntry.objects.filter(kind__in=kinds)
+        for term in terms:
+            entries = entries.filter(
+                Q(title__icontains=term) | Q(body__icontains=term)
+            )
+        entries = entries.annotate(rank=Value(0.0)).order_by("-pk")
+        return list(entries[offset : offset + limit])
+
+
+class SQLiteSearch(BasicSearch):
+    """FTS5 table over ``board_searchentry``, synced by triggers.
+
+    Only the newest ``RANKED_MATCHES`` matches are ranked, which keeps
+    queries for very common words bounded; older ones follow unranked.
+    """
+
+    table = "board_searchentry_fts"
+
+    install_sql = [
+        f"""
+        CREATE VIRTUAL TABLE {table} USING fts5(
+            title, body,
+            content='board_searchentry', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+        )
+        """,
+        f"""
+        CREATE TRIGGER {table}_insert AFTER INSERT ON board_searchentry
+        BEGIN
+            INSERT INTO {table}(rowid, title, body)
+            VALUES (new.id, new.title, new.body);
+        END
+        """,
+        f"""
+        CREATE TRIGGER {table}_delete AFTER DELETE ON board_searchentry
+        BEGIN
+            INSERT INTO {table}({table}, rowid, title, body)
+            VALUES ('delete', old.id, old.title, old.body);
+        END
+        """,
+        f"""
+        CREATE TRIGGER {table}_update AFTER UPDATE ON board_searchentry
+        BEGIN
+            INSERT INTO {table}({table}, rowid, title, body)
+            VALUES ('delete', old.id, old.title, old.body);
+            INSERT INTO {table}(rowid, title, body)
+            VALUES (new.id, new.title, new.body);
+        END
+        """,
+        f"INSERT INTO {table}({table}) VALUES ('rebuild')",
+    ]
+    uninstall_sql = [
+        f"DROP TRIGGER IF EXISTS {table}_insert",
+        f"DROP TRIGGER IF EXISTS {table}_delete",
+        f"DROP TRIGGER IF EXISTS {table}_update",
+        f"DROP TABLE IF EXISTS {table}",
+    ]
+
+    def match_expression(self, terms):
+        # Quoting keeps FTS5 syntax in user input from being interpreted.
+        return " ".join(f'"{term}"*' for term in terms)
+
+    def matching_ids(self, terms, kind):
+        return RawSQL(
+            f"SELECT e.object_id FROM {self.table} "
+            f"JOIN board_searchentry e ON e.id = {self.table}.rowid "
+            f"WHERE {self.table} MATCH %s AND e.kind = %s",
+            [f"title : ({self.match_expression(terms)})", kind],
+        )
+
+    def search(self, terms, kinds, limit, offset):
+        match = self.match_expression(terms)
+        cutoff = self.ranking_cutoff(match)
+        kind_sql = ", ".join(["%s"] * len(kinds))
+        # bm25() is lower for better matches; titles weigh four times more.
+        entries = self.entries(
+            f"-bm25({self.table}, 4.0, 1.0) AS rank",
+            f"{self.table}.rowid >= %s AND e.kind IN ({kind_sql}) "
+            "ORDER BY rank DESC, e.id LIMIT %s OFFSET %s",
+            [match, cutoff, *kinds, limit, offset],
+        )
+        if len(entries) == limit or not cutoff:
+            return entries
+        # Older matches follow the ranked ones, newest first.
+        skip = 0 if entries else offset - self.count(match, cutoff, kinds)
+        return entries + self.entries(
+            "0.0 AS rank",
+            f"{self.table}.rowid < %s AND e.kind IN ({kind_sql}) "
+            f"ORDER BY {self.table}.rowid DESC LIMIT %s OFFSET %s",
+            [match, cutoff, *kinds, limit - len(entries), skip],
+        )
+
+    def entries(self, rank, where, params):
+        return list(
+            SearchEntry.objects.raw(
+                f"SELECT e.*, {rank} FROM {self.table} "
+                f"JOIN board_searchentry e ON e.id = {self.table}.rowid "
+                f"WHERE {self.table} MATCH %s AND {where}",
+                params,
+            )
+        )
+
+    def count(self, match, cutoff, kinds):
+        """How many of the ranked matches are of ``kinds``."""
+        with connections[router.db_for_read(SearchEntry)].cursor() as cursor:
+            cursor.execute(
+                f"SELECT COUNT(*) FROM {self.table} "
+                f"JOIN board_searchentry e ON e.id = {self.table}.rowid "
+                f"WHERE {self.table} MATCH %s AND {self.table}.rowid >= %s "
+                f"AND e.kind IN ({', '.join(['%s'] * len(kinds))})",
+                [match, cutoff, *kinds],
+            )
+            return cursor.fetchone()[0]
+
+    def ranking_cutoff(self, match):
+        """Lowest rowid among the newest ``RANKED_MATCHES`` matches.
+
+        Scoring costs one bm25() call per match, so a word found in most
+        rows would rank the whole table; walking rowids is far cheaper.
+        Older matches are still returned, unranked, after the ranked ones.
+        """
+        with connections[router.db_for_read(SearchEntry)].cursor() as cursor:
+            cursor.execute(
+                f"SELECT rowid FROM {self.table} WHERE {self.table} MATCH %s "
+                "ORDER BY rowid DESC LIMIT 1 OFFSET %s",
+                [match, RANKED_MATCHES - 1],
+            )
+            row = cursor.fetchone()
+        return row[0] if row else 0
+
+
+class PostgresSearch(BasicSearch):
+    """Weighted tsvector index plus trigrams on titles for typos."""
+
+    vector = (
+        "(setweight(to_tsvector('simple', title), 'A') || "
+        "setweight(to_tsvector('simple', body), 'B'))"
+    )
+
+    install_sql = [
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+        "CREATE INDEX search_entry_vector_idx ON board_searchentry "
+        f"USING gin ({vector})",
+        "CREATE INDEX search_entry_title_trgm_idx ON board_searchentry "
+        "USING gin (title gin_trgm_ops)",
+    ]
+    uninstall_sql = [
+        "DROP INDEX IF EXISTS search_entry_vector_idx",
+        "DROP INDEX IF EXISTS search_entry_title_trgm_idx",
+    ]
+
+    def ts_query(self, terms, weights=""):
+        return " & ".join(f"{term}:*{weights}" for term in terms)
+
+    def matching_ids(self, terms, kind):
+        # Weight A restricts the indexed vector to the title's words.
+        return RawSQL(
+            "SELECT object_id FROM board_searchentry "
+            f"WHERE kind = %s AND ({self.vector} @@ "
+            "to_tsquery('simple', %s) OR title %% %s)",
+            [kind, self.ts_query(terms, weights="A"), " ".join(terms)],
+        )
+
+    def search(self, terms, kinds, limit, offset):
+        text = " ".join(terms)
+        return list(
+            SearchEntry.objects.raw(
+                "SELECT board_searchentry.*, "
+                f"ts_rank_cd({self.vector}, query) "
+                "+ similarity(title, %s) AS rank "
+                "FROM board_searchentry, to_tsquery('simple', %s) query "
+                f"WHERE ({self.vector} @@ query OR title %% %s) "
+                "AND kind = ANY(%s) "
+                "ORDER BY rank DESC, id LIMIT %s OFFSET %s",
+                [text, self.ts_query(terms), text, kinds, limit, offset],
+            )
+        )
+
+
+BACKENDS = {"sqlite": SQLiteSearch, "postgresql": PostgresSearch}
+
+
+def get_backend(vendor=None):
+    if vendor is None:
+        vendor = connections[router.db_for_read(SearchEntry)].vendor
+    return BACKENDS.get(vendor, BasicSearch)()
+
+
+def search(query, kinds=None, page=1, per_page=20):
+    """Return one page of ranked entries and whether another page follows."""
+    terms = parse_terms(query)
+    if not terms:
+        return [], False
+    kinds = list(kinds or [kind for kind, _ in SearchEntry.KIND_CHOICES])
+    entries = get_backend().search(
+        terms, kinds, limit=per_page + 1, offset=(page - 1) * per_page
+    )
+    return entries[:per_page], len(entries) > per_page
+
+
+def filter_matching(queryset, query, kind):
+    """Narrow ``queryset`` to objects of ``kind`` whose title matches.
+
+    Every word of ``query`` must start a word of the title: "kan" finds
+    "Kanban board" but "anban" does not, except on databases without a
+    search backend, which match substrings.
+    """
+    terms = parse_terms(query)
+    if not terms:
+        return queryset
+    return queryset.filter(pk__in=get_backend().matching_ids(terms, kind))
+
+
+def prefix_bounds(prefix):
+    """``[low, high)`` range holding every lowercase string with ``prefix``."""
+    low = prefix.lower()
+    return low, low[:-1] + chr(ord(low[-1]) + 1)
+
+
+def match_prefixes(queryset, query, fields):
+    """Keep rows where every word of ``query`` starts one of ``fields``.
+
+    Matching runs as range conditions on ``Lower(field)``, which an
+    expression index on that field answers without a scan.
+    """
+    terms = query.split()[:MAX_TERMS]
+    if not terms:
+        return queryset.none()
+    queryset = queryset.alias(
+        **{f"{field}_lower": Lower(field) for field in fields}
+    )
+    for term in terms:
+        low, high = prefix_bounds(term)
+        condition = Q()
+        for field in fields:
+            condition |= Q(
+                **{f"{field}_lower__gte": low, f"{field}_lower__lt": high}
+            )
+        queryset = queryset.filter(condition)
+    return queryset
+
+
+# Entries are tuples of ENTRY_FIELDS values, cheap to build by the million.
+
+
+def project_entry(pk, name, description):
+    return (SearchEntry.PROJECT, pk, pk, name, description)
+
+
+def task_entry(pk, project_id, name, description):
+    return (SearchEntry.TASK, pk, project_id, name, description)
+
+
+def worker_entry(pk, username, first_name, last_name):
+    title = f"{first_name} {last_name}".strip() or username
+    return (SearchEntry.WORKER, pk, None, title, username)
+
+
+def index_entry(entry):
+    kind, object_id, project_id, title, body = entry
+    SearchEntry.objects.update_or_create(
+        kind=kind,
+        object_id=object_id,
+        defaults={"project_id": project_id, "title": title, "body": body},
+    )
+
+
+def unindex(kind, object_id):
+    SearchEntry.objects.filter(kind=kind, object_id=object_id).delete()
+
+
+def entry_sources():
+    """``(model, build, rows)`` for every kind of entry."""
+    return [
+        (
+            Project,
+            project_entry,
+            Project.objects.values_list("pk", "name", "description"),
+        ),
+        (
+            Task,
+            task_entry,
+            Task.objects.values_list(
+                "pk", "board__project_id", "name", "description"
+            ),
+        ),
+        (
+            get_user_model(),
+            worker_entry,
+            get_user_model().objects.values_list(
+                "pk", "username", "first_name", "last_name"
+            ),
+        ),
+    ]
+
+
+def insert_entries(build, rows, batch_size):
+    total = 0
+    batch = []
+    for row in rows.iterator(chunk_size=batch_size):
+        batch.append(build(*row))
+        if len(batch) == batch_size:
+            total += len(insert_rows(SearchEntry, ENTRY_FIELDS, batch))
+            batch = []
+    return total + len(insert_rows(SearchEntry, ENTRY_FIELDS, batch))
+
+
+def rebuild_index(batch_size=REBUILD_BATCH_SIZE):
+    """Replace every entry with one built from the current rows."""
+    SearchEntry.objects.all().delete()
+    return sum(
+        insert_entries(build, rows, batch_size)
+        for _, build, rows in entry_sources()
+    )
+
+
+def index_new(pks_by_model, batch_size=REBUILD_BATCH_SIZE):
+    """Add entries for rows saved without signals, e.g. ``{Task: [1, 2]}``.
+
+    The rows must not have entries yet.
+    """
+    total = 0
+    for model, build, rows in entry_sources():
+        pks = list(pks_by_model.get(model, ()))
+        for start in range(0, len(pks), batch_size):
+            total += insert_entries(
+                build,
+                rows.filter(pk__in=pks[start : start + batch_size]),
+                batch_size,
+            )
+    return total
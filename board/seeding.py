@@ -0,0 +1,176 @@
+"""Load fixtures a model at a time with ``bulk_create``.
+
+``loaddata`` saves objects one by one and sends signals for each. This
+reads the same JSON format as a stream, groups the objects by model,
+inserts only those whose primary keys are missing, in dependency order,
+then brings the counters and search index up to date for what it added.
+"""
+
+import json
+from collections import defaultdict
+from functools import partial
+
+from django.core import serializers
+from django.core.management.color import no_style
+from django.db import connections, router, transaction
+
+from board import search
+from board.counters import drifted, repair
+from board.models import Board, Project, SiteCounters, Task
+from board.ordering import append_tasks
+
+SEED_BATCH_SIZE = 500
+
+# Fill in what the models' save() would have before the rows go in.
+PREPARE = {Task: append_tasks}
+
+
+def iter_json_array(file, chunk_size=64 * 1024):
+    """Yield the items of the top-level JSON array in ``file``."""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    started = False
+    for chunk in iter(partial(file.read, chunk_size), ""):
+        buffer += chunk
+        while True:
+            buffer = buffer.lstrip()
+            if not buffer:
+                break
+            if not started:
+                if buffer[0] != "[":
+                    raise ValueError("A fixture must be a JSON array.")
+                buffer = buffer[1:]
+                started = True
+            elif buffer[0] == ",":
+                buffer = buffer[1:]
+            elif buffer[0] == "]":
+                return
+            else:
+                try:
+                    item, end = decoder.raw_decode(buffer)
+                except json.JSONDecodeError:
+                    # The item goes on in the next chunk.
+                    break
+                yield item
+                buffer = buffer[end:]
+    raise ValueError("The fixture ends before its array does.")
+
+
+def dependency_order(models):
+    """Sort ``models`` so each comes after the models it refers to."""
+    ordered = []
+    visiting = set()
+
+    def visit(model):
+        if model in ordered or model in visiting:
+            return
+        visiting.add(model)
+        for field in [*model._meta.fields, *model._meta.many_to_many]:
+            target = field.related_model
+            if target in models and target is not model:
+                visit(target)
+        ordered.append(model)
+
+    for model in models:
+        visit(model)
+    return ordered
+
+
+def missing(model, objects, batch_size):
+    """The deserialized ``objects`` whose primary keys are not taken."""
+    new = []
+    for start in range(0, len(objects), batch_size):
+        batch = objects[start : start + batch_size]
+        taken = set(
+            model._base_manager.filter(
+                pk__in=[obj.object.pk for obj in batch]
+            ).values_list("pk", flat=True)
+        )
+        new.extend(obj for obj in batch if obj.object.pk not in taken)
+    return new
+
+
+def insert(model, objects, batch_size):
+    instances = [obj.object for obj in objects]
+    if model in PREPARE:
+        PREPARE[model](instances)
+    model._base_manager.bulk_create(instances, batch_size=batch_size)
+    for field in model._meta.many_to_many:
+        through = field.remote_field.through
+        source = f"{field.m2m_field_name()}_id"
+        target = f"{field.m2m_reverse_field_name()}_id"
+        through._base_manager.bulk_create(
+            [
+                through(**{source: obj.object.pk, target: pk})
+                for obj in objects
+                for pk in obj.m2m_data.get(field.name, ())
+            ],
+            batch_size=batch_size,
+            ignore_conflicts=True,
+        )
+    return instances
+
+
+def catch_up(created):
+    """Do for ``created`` rows what the save signals would have done."""
+    SiteCounters.rebuild()
+    board_ids = {board.pk for board in created.get(Board, ())}
+    board_ids |= {task.board_id for task in created.get(Task, ())}
+    project_ids = {project.pk for project in created.get(Project, ())}
+    project_ids |= set(
+        Board.objects.filter(pk__in=board_ids).values_list(
+            "project_id", flat=True
+        )
+    )
+    repair(
+        [
+            *drifted(Board, "tasks").filter(pk__in=board_ids),
+            *drifted(Project, "boards__tasks").filter(pk__in=project_ids),
+        ]
+    )
+    search.index_new(
+        {model: [obj.pk for obj in objs] for model, objs in created.items()}
+    )
+
+
+def seed(files, batch_size=SEED_BATCH_SIZE):
+    """Insert the objects of the fixture ``files`` that are not there yet.
+
+    Returns ``(created, skipped)``, counts keyed by model.
+    """
+    groups = defaultdict(list)
+    for file in files:
+        for obj in serializers.deserialize(
+            "python", iter_json_array(file), ignorenonexistent=True
+        ):
+            groups[type(obj.object)].append(obj)
+
+    created = {}
+    skipped = {}
+    with transaction.atomic():
+        for model in dependency_order(list(groups)):
+            new = missing(model, groups[model], batch_size)
+            skipped[model] = len(groups[model]) - len(new)
+            if new:
+                created[model] = insert(model, new, batch_size)
+        if created:
+            reset_sequences(list(created))
+            catch_up(created)
+    return (
+        {model: len(objs) for model, objs in created.items()},
+        skipped,
+    )
+
+
+def reset_sequences(models):
+    """Move id sequences past rows inserted with explicit keys."""
+    by_alias = defaultdict(list)
+    for model in models:
+        by_alias[router.db_for_write(model)].append(model)
+    for alias, group in by_alias.items():
+        connection = connections[alias]
+        statements = connection.ops.sequence_reset_sql(no_style(), group)
+        if statements:
+            with connection.cursor() as cursor:
+                for sql in statements:
+                    cursor.execute(sql)
@@ -0,0 +1,512 @@
+from collections import defaultdict
+
+from django.contrib.auth import get_user_model
+from django.db.models import F, Subquery
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_init,
+    post_save,
+    pre_delete,
+)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from board import activity, search
+from board.counters import shift_task_counts, task_count_deltas
+from board.events import publish_on_commit
+from board.models import (
+    Activity,
+    Attachment,
+    Board,
+    Position,
+    Project,
+    SearchEntry,
+    SiteCounters,
+    Task,
+    TaskType,
+    Team,
+    Tombstone,
+    next_sync_version,
+)
+
+
+def bump_board_versions(**filters):
+    """Invalidate cached columns of every board matching ``filters``."""
+    Board.objects.filter(**filters).update(version=F("version") + 1)
+
+
+def touch_workers(**filters):
+    """Mark workers matching ``filters`` as changed for project ETags."""
+    get_user_model().objects.filter(**filters).update(
+        updated_at=timezone.now()
+    )
+
+
+def stamp_tasks(task_ids):
+    """Give tasks whose relations changed a fresh delta-sync version."""
+    by_project = defaultdict(list)
+    rows = Task.objects.filter(pk__in=task_ids).values_list(
+        "pk", "board__project_id"
+    )
+    for task_id, project_id in rows:
+        by_project[project_id].append(task_id)
+    for project_id, task_ids in by_project.items():
+        Task.objects.filter(pk__in=task_ids).update(
+            sync_version=next_sync_version(pk=project_id),
+            updated_at=timezone.now(),
+        )
+
+
+def bury(project_id, model, object_id):
+    Tombstone.objects.create(
+        project_id=project_id,
+        model=model,
+        object_id=object_id,
+        sync_version=next_sync_version(pk=project_id),
+    )
+
+
+def project_id_of(task):
+    if Task.board.is_cached(task):
+        return task.board.project_id
+    return (
+        Board.objects.filter(pk=task.board_id)
+        .values_list("project_id", flat=True)
+        .first()
+    )
+
+
+def announce_task(task, event_type, project_id=None, **data):
+    project_id = project_id or project_id_of(task)
+    if project_id is not None:
+        publish_on_commit(
+            project_id,
+            {"type": event_type, "task": task.pk, "board": task.board_id}
+            | data,
+        )
+
+
+@receiver(post_init, sender=Task)
+def remember_task_board(sender, instance, **kwargs):
+    instance._loaded_board_id = instance.__dict__.get("board_id")
+    instance._loaded_position = instance.__dict__.get("position")
+    instance._loaded_is_completed = instance.__dict__.get("is_completed")
+    instance._loaded_deadline = instance.__dict__.get("deadline")
+
+
+@receiver(post_save, sender=Task)
+def task_saved(sender, instance, created, **kwargs):
+    previous_board_id = instance._loaded_board_id
+    board_ids = {instance.board_id, previous_board_id} - {None}
+    bump_board_versions(pk__in=board_ids)
+    shift_task_counts(task_count_deltas(instance, created))
+    deadline = instance.__dict__.get("deadline")
+    if not created and deadline != instance._loaded_deadline:
+        # The project list shows overdue counts and the next deadline.
+        Project.objects.filter(boards=instance.board_id).update(
+            updated_at=timezone.now()
+        )
+
+    project_id = project_id_of(instance)
+    if created:
+        verb, details = Activity.CREATED, {}
+        announce_task(
+            instance,
+            "task.created",
+            project_id=project_id,
+            position=instance.position,
+        )
+    elif (previous_board_id, instance._loaded_position) != (
+        instance.board_id,
+        instance.position,
+    ):
+        verb = Activity.MOVED
+        details = {"from_board": previous_board_id, "board": instance.board_id}
+        announce_task(
+            instance,
+            "task.moved",
+            project_id=project_id,
+            from_board=previous_board_id,
+            position=instance.position,
+        )
+    else:
+        verb, details = Activity.UPDATED, {}
+        announce_task(instance, "task.updated", project_id=project_id)
+    activity.record(
+        project_id,
+        verb,
+        Activity.TASK,
+        instance.pk,
+        name=instance.name,
+        **details,
+    )
+
+    instance._loaded_board_id = instance.board_id
+    instance._loaded_position = instance.position
+    instance._loaded_is_completed = instance.__dict__.get("is_completed")
+    instance._loaded_deadline = deadline
+
+
+@receiver(post_delete, sender=Task)
+def task_deleted(sender, instance, origin=None, **kwargs):
+    if isinstance(origin, (Board, Project)):
+        # The whole column is going away with its board.
+        return
+    bump_board_versions(pk=instance.board_id)
+    # The stored value, the row is gone so a deferred field cannot load.
+    was_done = bool(instance._loaded_is_completed)
+    shift_task_counts({instance.board_id: (-1, -was_done)})
+    project_id = project_id_of(instance)
+    if project_id is not None:
+        bury(project_id, Tombstone.TASK, instance.pk)
+        announce_task(instance, "task.deleted", project_id=project_id)
+        activity.record(
+            project_id,
+            Activity.DELETED,
+            Activity.TASK,
+            instance.pk,
+            name=instance.name,
+        )
+
+
+@receiver(m2m_changed, sender=Task.assignees.through)
+@receiver(m2m_changed, sender=Task.attachments.through)
+def task_relations_changed(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if action == "pre_clear" and reverse:
+        instance._cleared_task_ids = list(
+            instance.tasks.values_list("pk", flat=True)
+        )
+        return
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    if not reverse:
+        bump_board_versions(pk=instance.board_id)
+        stamp_tasks([instance.pk])
+        announce_task(instance, "task.updated")
+        return
+
+    if action == "post_clear":
+        pk_set = instance.__dict__.pop("_cleared_task_ids", [])
+    if pk_set:
+        bump_board_versions(tasks__in=pk_set)
+        stamp_tasks(pk_set)
+
+
+@receiver(m2m_changed, sender=Task.assignees.through)
+def assignments_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    # Project pages show each team member's task count.
+    if action == "pre_clear" and not reverse:
+        instance._cleared_worker_ids = list(
+            instance.assignees.values_list("pk", flat=True)
+        )
+    elif action in ("post_add", "post_remove", "post_clear"):
+        if reverse:
+            touch_workers(pk=instance.pk)
+            return
+        if action == "post_clear":
+            pk_set = instance.__dict__.pop("_cleared_worker_ids", [])
+        if pk_set:
+            touch_workers(pk__in=pk_set)
+
+
+@receiver(pre_delete, sender=Task)
+def unassign_deleted_task(sender, instance, origin=None, **kwargs):
+    if not isinstance(origin, (Board, Project)):
+        touch_workers(tasks=instance)
+
+
+@receiver(pre_delete, sender=Board)
+@receiver(pre_delete, sender=Project)
+def unassign_cascaded_tasks(sender, instance, origin=None, **kwargs):
+    if origin is not instance:
+        # Each task is handled by unassign_deleted_task.
+        return
+    board = "board" if sender is Board else "board__project"
+    touch_workers(**{f"tasks__{board}": instance})
+
+
+@receiver(post_save, sender=Position)
+def position_saved(sender, instance, created, **kwargs):
+    if not created:
+        touch_workers(position=instance)
+
+
+@receiver(post_save, sender=Board)
+def board_saved(sender, instance, created, **kwargs):
+    if not created:
+        bump_board_versions(pk=instance.pk)
+
+
+@receiver(post_save, sender=Project)
+def project_team_changed(sender, instance, created, **kwargs):
+    team_id = instance.__dict__.get("team_id")
+    if not created and team_id != instance._loaded_team_id:
+        # Cached columns link to the project's team.
+        bump_board_versions(project=instance)
+    instance._loaded_team_id = team_id
+
+
+@receiver(m2m_changed, sender=Team.members.through)
+def team_members_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == "pre_clear" and reverse:
+        instance._cleared_team_ids = list(
+            instance.teams.values_list("pk", flat=True)
+        )
+        return
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    if not reverse:
+        projects = Project.objects.filter(team=instance)
+    elif action == "post_clear":
+        projects = Project.objects.filter(
+            team__in=instance.__dict__.pop("_cleared_team_ids", [])
+        )
+    else:
+        projects = Project.objects.filter(team__in=pk_set)
+    projects.update(updated_at=timezone.now())
+
+
+@receiver(pre_delete, sender=Board)
+def uncount_board(sender, instance, origin=None, **kwargs):
+    if isinstance(origin, Project):
+        return
+    # Read the stored counts, the instance may be stale.
+    board = Board.objects.filter(pk=instance.pk)
+    Project.objects.filter(pk=instance.project_id).update(
+        task_count=F("task_count") - Subquery(board.values("task_count")[:1]),
+        completed_count=F("completed_count")
+        - Subquery(board.values("completed_count")[:1]),
+        updated_at=timezone.now(),
+    )
+
+
+@receiver(post_delete, sender=Board)
+def board_deleted(sender, instance, origin=None, **kwargs):
+    if not isinstance(origin, Project):
+        bury(instance.project_id, Tombstone.BOARD, instance.pk)
+        activity.record(
+            instance.project_id,
+            Activity.DELETED,
+            Activity.BOARD,
+            instance.pk,
+            name=instance.name,
+        )
+
+
+@receiver(post_save, sender=Attachment)
+def attachment_saved(sender, instance, created, **kwargs):
+    if not created:
+        bump_board_versions(tasks__attachments=instance)
+
+
+@receiver(post_save, sender=TaskType)
+def task_type_saved(sender, instance, created, **kwargs):
+    if not created:
+        bump_board_versions(tasks__task_type=instance)
+
+
+@receiver(post_save, sender=get_user_model())
+def worker_saved(sender, instance, created, update_fields, **kwargs):
+    if created or (
+        update_fields and not {"username", "avatar"} & set(update_fields)
+    ):
+        return
+    bump_board_versions(tasks__assignees=instance)
+
+
+COUNTED_MODELS = {Task: "tasks", get_user_model(): "users"}
+
+
+@receiver(post_init, sender=Project)
+def remember_project_state(sender, instance, **kwargs):
+    instance._loaded_is_completed = instance.__dict__.get("is_completed")
+    instance._loaded_team_id = instance.__dict__.get("team_id")
+
+
+@receiver(post_save, sender=Project)
+def count_project_saved(sender, instance, created, **kwargs):
+    is_active = not instance.is_completed
+    if created:
+        was_active = False
+    elif instance._loaded_is_completed is None:
+        # Loaded without the field, so the previous state is unknown.
+        was_active = is_active
+    else:
+        was_active = not instance._loaded_is_completed
+    SiteCounters.add(
+        projects=int(created), active_projects=is_active - was_active
+    )
+    instance._loaded_is_completed = instance.is_completed
+
+
+@receiver(post_delete, sender=Project)
+def count_project_deleted(sender, instance, **kwargs):
+    SiteCounters.add(
+        projects=-1,
+        active_projects=-(instance._loaded_is_completed is False),
+    )
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_save, sender=get_user_model())
+def count_created(sender, instance, created, **kwargs):
+    if created:
+        SiteCounters.add(**{COUNTED_MODELS[sender]: 1})
+
+
+@receiver(post_delete, sender=Task)
+@receiver(post_delete, sender=get_user_model())
+def count_deleted(sender, instance, origin=None, **kwargs):
+    if isinstance(origin, (Board, Project)):
+        # Counted at once by uncount_cascaded_tasks.
+        return
+    SiteCounters.add(**{COUNTED_MODELS[sender]: -1})
+
+
+@receiver(pre_delete, sender=Board)
+@receiver(pre_delete, sender=Project)
+def uncount_cascaded_tasks(sender, instance, origin=None, **kwargs):
+    if origin is not instance:
+        # A board going with its project, or a queryset delete, which
+        # counts its tasks one by one.
+        return
+    board = "board" if sender is Board else "board__project"
+    SiteCounters.add(tasks=-Task.objects.filter(**{board: instance}).count())
+
+
+def saves_any(update_fields, fields):
+    return update_fields is None or bool(fields & set(update_fields))
+
+
+@receiver(post_save, sender=Project)
+def index_project(sender, instance, **kwargs):
+    search.index_entry(
+        search.project_entry(instance.pk, instance.name, instance.description)
+    )
+
+
+@receiver(post_save, sender=Task)
+def index_task(sender, instance, update_fields, **kwargs):
+    if saves_any(update_fields, {"name", "description"}):
+        search.index_entry(
+            search.task_entry(
+                instance.pk,
+                project_id_of(instance),
+                instance.name,
+                instance.description,
+            )
+        )
+
+
+@receiver(post_save, sender=get_user_model())
+def index_worker(sender, instance, update_fields, **kwargs):
+    if saves_any(update_fields, {"username", "first_name", "last_name"}):
+        search.index_entry(
+            search.worker_entry(
+                instance.pk,
+                instance.username,
+                instance.first_name,
+                instance.last_name,
+            )
+        )
+
+
+@receiver(post_delete, sender=Task)
+def unindex_task(sender, instance, origin=None, **kwargs):
+    # A deleted project takes its entries with it, a board's go at once.
+    if not isinstance(origin, (Board, Project)):
+        search.unindex(SearchEntry.TASK, instance.pk)
+
+
+@receiver(pre_delete, sender=Board)
+def unindex_board_tasks(sender, instance, origin=None, **kwargs):
+    if origin is instance:
+        SearchEntry.objects.filter(
+            kind=SearchEntry.TASK, object_id__in=instance.tasks.values("pk")
+        ).delete()
+
+
+@receiver(post_delete, sender=get_user_model())
+def unindex_worker(sender, instance, **kwargs):
+    search.unindex(SearchEntry.WORKER, instance.pk)
+
+
+@receiver(post_save, sender=Project)
+def log_project_saved(sender, instance, created, **kwargs):
+    activity.record(
+        instance.pk,
+        Activity.CREATED if created else Activity.UPDATED,
+        Activity.PROJECT,
+        instance.pk,
+        name=instance.name,
+    )
+
+
+@receiver(post_delete, sender=Project)
+def log_project_deleted(sender, instance, **kwargs):
+    activity.record(
+        instance.pk,
+        Activity.DELETED,
+        Activity.PROJECT,
+        instance.pk,
+        name=instance.name,
+    )
+
+
+@receiver(post_save, sender=Board)
+def log_board_saved(sender, instance, created, **kwargs):
+    activity.record(
+        instance.project_id,
+        Activity.CREATED if created else Activity.UPDATED,
+        Activity.BOARD,
+        instance.pk,
+        name=instance.name,
+    )
+
+
+@receiver(m2m_changed, sender=Team.members.through)
+def log_membership(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == "pre_clear":
+        related = instance.teams if reverse else instance.members
+        instance._cleared_membership_ids = list(
+            related.values_list("pk", flat=True)
+        )
+        return
+    if action == "post_clear":
+        pk_set = instance.__dict__.pop("_cleared_membership_ids", [])
+        action = "post_remove"
+    if action not in ("post_add", "post_remove") or not pk_set:
+        return
+
+    if reverse:
+        pairs = [(team_id, instance.pk) for team_id in pk_set]
+    else:
+        pairs = [(instance.pk, worker_id) for worker_id in pk_set]
+    projects = defaultdict(list)
+    rows = Project.objects.filter(
+        team__in={team_id for team_id, _ in pairs}
+    ).values_list("team_id", "pk")
+    for team_id, project_id in rows:
+        projects[team_id].append(project_id)
+    if not projects:
+        return
+    usernames = dict(
+        get_user_model()
+        .objects.filter(pk__in={worker_id for _, worker_id in pairs})
+        .values_list("pk", "username")
+    )
+    verb = Activity.JOINED if action == "post_add" else Activity.LEFT
+    for team_id, worker_id in pairs:
+        for project_id in projects[team_id]:
+            activity.record(
+                project_id,
+                verb,
+                Activity.MEMBER,
+                worker_id,
+                name=usernames.get(worker_id, ""),
+            )
@@ -0,0 +1,51 @@
+"""Plain SQL for writes the ORM makes slow."""
+
+from contextlib import contextmanager
+
+from django.db import connections, router
+
+
+def insert_rows(model, fields, rows):
+    """Insert tuples of ``fields`` values and return the new primary keys.
+
+    ``bulk_create`` runs every field of every instance through the ORM,
+    which dominates when loading hundreds of thousands of rows. ``rows``
+    must hold values the database driver accepts as they are.
+    """
+    connection = connections[router.db_for_write(model)]
+    quote = connection.ops.quote_name
+    opts = model._meta
+    columns = ", ".join(quote(opts.get_field(name).column) for name in fields)
+    row_sql = "(" + ", ".join(["%s"] * len(fields)) + ")"
+    size = max(connection.ops.bulk_batch_size(fields, rows), 1)
+    pks = []
+    with connection.cursor() as cursor:
+        for start in range(0, len(rows), size):
+            batch = rows[start : start + size]
+            cursor.execute(
+                f"INSERT INTO {quote(opts.db_table)} ({columns}) "
+                f"VALUES {', '.join([row_sql] * len(batch))} "
+                f"RETURNING {quote(opts.pk.column)}",
+                [value for row in batch for value in row],
+            )
+            pks.extend(pk for pk, in cursor.fetchall())
+    return pks
+
+
+@contextmanager
+def indexes_deferred(model):
+    """Drop ``model``'s ``Meta.indexes`` and build them again on exit.
+
+    Building an index once over all rows beats updating it row by row
+    during a large load, but costs a pass over the rows already there.
+    Use inside a transaction, which puts the indexes back on failure.
+    """
+    connection = connections[router.db_for_write(model)]
+    editor = connection.schema_editor()
+    with connection.cursor() as cursor:
+        for index in model._meta.indexes:
+            cursor.execute(str(index.remove_sql(model, editor)))
+    yield
+    with connection.cursor() as cursor:
+        for index in model._meta.indexes:
+            cursor.execute(str(index.create_sql(model, editor)))
@@ -0,0 +1,356 @@
+"""Reproducible, production-shaped fake data for local profiling.
+
+Real data is lopsided: a few workers are on most teams and tasks, a few
+projects hold most boards, a few boards hold most tasks. Counts here are
+drawn from log-normal distributions around configurable means, and
+workers and teams are picked by Zipf weights, with ``skew`` controlling
+how lopsided both are (0 makes every count its mean). One seed always
+produces the same data.
+
+Rows go in with ``bulk_create`` where the ORM needs the new objects and
+``insert_rows`` for the bulk of them, with the task counts, sync versions
+and positions written up front, since no signals run. When the run at
+least doubles the tasks, the task indexes are built after the load.
+"""
+
+import math
+import random
+from collections import defaultdict
+from contextlib import nullcontext
+from dataclasses import dataclass
+from datetime import timedelta
+from itertools import accumulate
+
+from django.contrib.auth import get_user_model
+from django.db import connections, router
+from django.utils import timezone
+
+from board.models import (
+    Attachment,
+    Board,
+    Position,
+    Project,
+    SiteCounters,
+    Task,
+    TaskType,
+    Team,
+)
+from board.sql import indexes_deferred, insert_rows
+from board.transfer import TASK_COLUMNS
+
+SYLLABLES = "ba ce di fo gu ka le mi no pu ra se ti vo zu".split()
+VOCABULARY_SIZE = 20_000
+
+POSITIONS = ["Developer", "Designer", "QA Engineer", "Manager"]
+TASK_TYPES = ["Feature", "Bug", "Chore", "Research"]
+BOARD_NAMES = ["Backlog", "To do", "In progress", "Review", "Done"]
+
+PROJECT_BATCH_SIZE = 50
+TEXT_POOL_SIZE = 5000
+
+# Where ``is_completed`` is in the task rows, which lack the board column.
+DONE = TASK_COLUMNS.index("is_completed") - 1
+
+
+def vocabulary(rng):
+    """Pseudo-words and cumulative Zipf weights, like real task text."""
+    words = sorted(
+        {
+            "".join(rng.choices(SYLLABLES, k=rng.randint(2, 4)))
+            for _ in range(VOCABULARY_SIZE)
+        }
+    )
+    rng.shuffle(words)
+    weights = accumulate(1 / rank for rank in range(1, len(words) + 1))
+    return words, list(weights)
+
+
+def zipf_weights(count, skew):
+    """Cumulative weights favouring the first of ``count`` items."""
+    return list(accumulate(1 / rank**skew for rank in range(1, count + 1)))
+
+
+@dataclass
+class Sizes:
+    workers: int = 200
+    teams: int = 40
+    team_size: float = 6
+    projects: int = 100
+    boards: float = 4
+    tasks: float = 50
+    assignees: float = 1.5
+    attachments: float = 0.1
+    skew: float = 1.0
+
+
+class Generator:
+    def __init__(self, sizes, seed=0, prefix="synthetic"):
+        self.sizes = sizes
+        self.rng = random.Random(seed)
+        self.prefix = f"{prefix}-{seed}"
+        self.words, self.word_weights = vocabulary(self.rng)
+        self.today = timezone.localdate()
+        # Drawing every task's words is the slowest part; reuse a pool.
+        self.task_names = [
+            self.text(self.rng.randint(2, 6)).capitalize()
+            for _ in range(TEXT_POOL_SIZE)
+        ]
+        self.task_descriptions = [
+            self.text(self.rng.randint(5, 40)) for _ in range(TEXT_POOL_SIZE)
+        ]
+        self.deadlines = [
+            self.today + timedelta(days=days) for days in range(-60, 121)
+        ]
+        connection = connections[router.db_for_write(Task)]
+        self.updated_at = connection.ops.adapt_datetimefield_value(
+            timezone.now()
+        )
+        self.created = dict.fromkeys(
+            [
+                "workers",
+                "teams",
+                "projects",
+                "boards",
+                "tasks",
+                "assignees",
+                "attachments",
+                "task attachments",
+            ],
+            0,
+        )
+        self.pks = defaultdict(list)
+
+    def count(self, mean):
+        """A non-negative count around ``mean``, skewed to the right."""
+        if mean <= 0:
+            return 0
+        sigma = self.sizes.skew
+        mu = math.log(mean) - sigma * sigma / 2
+        return int(self.rng.lognormvariate(mu, sigma) + self.rng.random())
+
+    def text(self, words):
+        return " ".join(
+            self.rng.choices(
+                self.words, cum_weights=self.word_weights, k=words
+            )
+        )
+
+    def pick(self, items, weights, k):
+        """Up to ``k`` distinct items, popular ones more often."""
+        if not items or k <= 0:
+            return []
+        return list(
+            dict.fromkeys(self.rng.choices(items, cum_weights=weights, k=k))
+        )
+
+    def run(self):
+        self.create_lookups()
+        self.create_workers()
+        self.create_teams()
+        self.create_attachments()
+        expected = self.sizes.projects * self.sizes.boards * self.sizes.tasks
+        if expected > Task.objects.count():
+            loading = indexes_deferred(Task)
+        else:
+            loading = nullcontext()
+        with loading:
+            for start in range(0, self.sizes.projects, PROJECT_BATCH_SIZE):
+                stop = min(start + PROJECT_BATCH_SIZE, self.sizes.projects)
+                self.create_projects(range(start, stop))
+        SiteCounters.rebuild()
+        return self.created
+
+    def add_created(self, name, count):
+        self.created[name] += count
+
+    def create_lookups(self):
+        self.positions = [
+            Position.objects.get_or_create(name=name)[0].pk
+            for name in POSITIONS
+        ]
+        self.task_types = [
+            TaskType.objects.get_or_create(name=name)[0].pk
+            for name in TASK_TYPES
+        ]
+
+    def create_workers(self):
+        workers = [
+            get_user_model()(
+                username=f"{self.prefix}-worker-{index}",
+                password="!",
+                first_name=self.text(1).title(),
+                last_name=self.text(1).title(),
+                email=f"{self.prefix}-worker-{index}@example.com",
+                position_id=self.rng.choice(self.positions),
+            )
+            for index in range(self.sizes.workers)
+        ]
+        get_user_model().objects.bulk_create(workers, batch_size=500)
+        self.workers = [worker.pk for worker in workers]
+        self.pks[get_user_model()] = self.workers
+        self.worker_weights = zipf_weights(len(workers), self.sizes.skew)
+        self.add_created("workers", len(workers))
+
+    def create_teams(self):
+        teams = Team.objects.bulk_create(
+            Team(name=f"{self.prefix}-team-{index}")
+            for index in range(self.sizes.teams)
+        )
+        self.teams = [team.pk for team in teams]
+        self.team_weights = zipf_weights(len(teams), self.sizes.skew)
+        self.members = {}
+        links = []
+        for team_id in self.teams:
+            members = self.pick(
+                self.workers,
+                self.worker_weights,
+                max(self.count(self.sizes.team_size), 1),
+            )
+            self.members[team_id] = members
+            links.extend((team_id, worker_id) for worker_id in members)
+        insert_rows(Team.members.through, ("team", "worker"), links)
+        self.add_created("teams", len(teams))
+
+    def create_attachments(self):
+        count = math.ceil(
+            self.sizes.projects
+            * self.sizes.boards
+            * self.sizes.tasks
+            * self.sizes.attachments
+        )
+        attachments = Attachment.objects.bulk_create(
+            (
+                Attachment(
+                    name=f"{self.text(2)}.pdf",
+                    file=f"attachments/{self.prefix}-{index}.pdf",
+                )
+                for index in range(count)
+            ),
+            batch_size=500,
+        )
+        self.attachments = [attachment.pk for attachment in attachments]
+        self.attachment_weights = zipf_weights(count, self.sizes.skew)
+        self.add_created("attachments", count)
+
+    def create_projects(self, indexes):
+        """Create projects with all their boards and tasks at once."""
+        plans = [self.plan_project() for _ in indexes]
+        projects = []
+        for index, boards in zip(indexes, plans):
+            team_id = self.pick(self.teams, self.team_weights, 1)
+            members = self.members[team_id[0]] if team_id else []
+            tasks = [task for board in boards for task in board]
+            projects.append(
+                Project(
+                    name=f"{self.prefix}-project-{index}",
+                    description=self.text(12),
+                    deadline=self.today
+                    + timedelta(days=self.rng.randint(-30, 180)),
+                    is_completed=self.rng.random() < 0.1,
+                    team_id=team_id[0] if team_id else None,
+                    owner_id=(
+                        self.rng.choice(members)
+                        if members
+                        else self.pick(self.workers, self.worker_weights, 1)[0]
+                    ),
+                    sync_version=1,
+                    task_count=len(tasks),
+                    completed_count=sum(task[DONE] for task in tasks),
+                )
+            )
+        Project.objects.bulk_create(projects)
+        self.pks[Project].extend(project.pk for project in projects)
+
+        board_rows = []
+        for project, boards in zip(projects, plans):
+            for index, tasks in enumerate(boards):
+                board_rows.append(
+                    (
+                        project.pk,
+                        BOARD_NAMES[index % len(BOARD_NAMES)],
+                        len(tasks),
+                        sum(task[DONE] for task in tasks),
+                        0,
+                        1,
+                        self.updated_at,
+                    )
+                )
+        board_ids = insert_rows(
+            Board,
+            (
+                "project",
+                "name",
+                "task_count",
+                "completed_count",
+                "version",
+                "sync_version",
+                "updated_at",
+            ),
+            board_rows,
+        )
+
+        rows = []
+        for board_id, tasks in zip(
+            board_ids, (board for boards in plans for board in boards)
+        ):
+            rows.extend((board_id, *task) for task in tasks)
+        task_ids = insert_rows(Task, TASK_COLUMNS, rows)
+        self.pks[Task].extend(task_ids)
+        self.link_tasks(task_ids)
+
+        self.add_created("projects", len(projects))
+        self.add_created("boards", len(board_ids))
+        self.add_created("tasks", len(task_ids))
+
+    def plan_project(self):
+        """Task rows, without their board, for each board of a project."""
+        boards = []
+        for _ in range(max(self.count(self.sizes.boards), 1)):
+            tasks = []
+            for position in range(1, self.count(self.sizes.tasks) + 1):
+                deadline = self.rng.choice(self.deadlines)
+                done = self.rng.random() < (
+                    0.7 if deadline < self.today else 0.2
+                )
+                tasks.append(
+                    (
+                        self.rng.choice(self.task_names),
+                        self.rng.choice(self.task_descriptions),
+                        deadline,
+                        done,
+                        Task.URGENT if self.rng.random() < 0.2 else Task.HIGH,
+                        self.rng.choice(self.task_types),
+                        position * Task.POSITION_GAP,
+                        1,
+                        self.updated_at,
+                    )
+                )
+            boards.append(tasks)
+        return boards
+
+    def link_tasks(self, task_ids):
+        assignees = []
+        attachments = []
+        for task_id in task_ids:
+            assignees.extend(
+                (task_id, worker_id)
+                for worker_id in self.pick(
+                    self.workers,
+                    self.worker_weights,
+                    self.count(self.sizes.assignees),
+                )
+            )
+            attachments.extend(
+                (task_id, attachment_id)
+                for attachment_id in self.pick(
+                    self.attachments,
+                    self.attachment_weights,
+                    self.count(self.sizes.attachments),
+                )
+            )
+        insert_rows(Task.assignees.through, ("task", "worker"), assignees)
+        insert_rows(
+            Task.attachments.through, ("task", "attachment"), attachments
+        )
+        self.add_created("assignees", len(assignees))
+        self.add_created("task attachments", len(attachments))
@@ -0,0 +1,441 @@
+"""Stream a project out as JSONL or CSV and load it back in.
+
+An export is a sequence of flat records, each tagged with its ``type`` and
+written in dependency order: the project, its boards, the attachments its
+tasks use, the tasks, then the task/assignee and task/attachment links.
+Rows are read with ``iterator()`` so memory stays flat however big the
+project is. Workers, task types and teams are referred to by name, so an
+export loads into another installation.
+
+Importing creates a new project and maps every exported id to the new row.
+Rows go in a batch at a time without the model signals, so the importer
+keeps the task counts, site counters, search index and the assigned
+workers' timestamps itself.
+"""
+
+import csv
+import json
+from collections import defaultdict
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections, router
+from django.db.models import Subquery
+from django.utils import timezone
+
+from board.counters import shift_task_counts
+from board.models import (
+    Attachment,
+    Board,
+    Project,
+    SearchEntry,
+    SiteCounters,
+    Task,
+    TaskType,
+    Team,
+    next_sync_version,
+)
+from board.search import ENTRY_FIELDS, task_entry
+from board.signals import touch_workers
+from board.sql import insert_rows
+
+EXPORT_CHUNK_SIZE = 2000
+IMPORT_BATCH_SIZE = 2000
+
+JSONL = "jsonl"
+CSV = "csv"
+FORMATS = {JSONL: "application/x-ndjson", CSV: "text/csv"}
+
+PROJECT = "project"
+BOARD = "board"
+ATTACHMENT = "attachment"
+TASK = "task"
+ASSIGNEE = "assignee"
+TASK_ATTACHMENT = "task_attachment"
+
+RECORD_FIELDS = {
+    PROJECT: (
+        "name",
+        "description",
+        "deadline",
+        "is_completed",
+        "owner",
+        "team",
+    ),
+    BOARD: ("id", "name", "color"),
+    ATTACHMENT: ("id", "name", "file"),
+    TASK: (
+        "id",
+        "board",
+        "name",
+        "description",
+        "deadline",
+        "is_completed",
+        "priority",
+        "task_type",
+        "position",
+    ),
+    ASSIGNEE: ("task", "worker"),
+    TASK_ATTACHMENT: ("task", "attachment"),
+}
+
+TASK_COLUMNS = (
+    "board",
+    "name",
+    "description",
+    "deadline",
+    "is_completed",
+    "priority",
+    "task_type",
+    "position",
+    "sync_version",
+    "updated_at",
+)
+
+CSV_COLUMNS = ["type"] + list(
+    dict.fromkeys(
+        field for fields in RECORD_FIELDS.values() for field in fields
+    )
+)
+
+
+def last_pk(queryset):
+    return Subquery(queryset.order_by("-pk").values("pk")[:1])
+
+
+def export_records(project_id, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield the project's records as dicts, in dependency order.
+
+    The export reads one table after another while the project may be
+    changing. Only rows that existed when it started are included, so
+    nothing refers to a board, task or attachment created after that
+    row's own section was written.
+    """
+    boards = Board.objects.filter(project_id=project_id)
+    tasks = Task.objects.filter(board__project_id=project_id)
+    through = {
+        ASSIGNEE: Task.assignees.through.objects.filter(
+            task__board__project_id=project_id
+        ),
+        TASK_ATTACHMENT: Task.attachments.through.objects.filter(
+            task__board__project_id=project_id
+        ),
+    }
+    *project, last_board, last_task, last_assignee, last_attachment = (
+        Project.objects.filter(pk=project_id)
+        .values_list(
+            "name",
+            "description",
+            "deadline",
+            "is_completed",
+            "owner__username",
+            "team__name",
+            last_pk(boards),
+            last_pk(tasks),
+            last_pk(through[ASSIGNEE]),
+            last_pk(through[TASK_ATTACHMENT]),
+        )
+        .get()
+    )
+    yield {"type": PROJECT, **dict(zip(RECORD_FIELDS[PROJECT], project))}
+
+    boards = boards.filter(pk__lte=last_board or 0)
+    tasks = tasks.filter(pk__lte=last_task or 0, board_id__lte=last_board or 0)
+    task_bounds = {
+        "task_id__lte": last_task or 0,
+        "task__board_id__lte": last_board or 0,
+    }
+    through[ASSIGNEE] = through[ASSIGNEE].filter(
+        pk__lte=last_assignee or 0, **task_bounds
+    )
+    through[TASK_ATTACHMENT] = through[TASK_ATTACHMENT].filter(
+        pk__lte=last_attachment or 0, **task_bounds
+    )
+    sources = [
+        (BOARD, boards.values_list("pk", "name", "color")),
+        (
+            ATTACHMENT,
+            Attachment.objects.filter(
+                pk__in=through[TASK_ATTACHMENT].values("attachment_id")
+            ).values_list("pk", "name", "file"),
+        ),
+        (
+            TASK,
+            tasks.values_list(
+                "pk",
+                "board_id",
+                "name",
+                "description",
+                "deadline",
+                "is_completed",
+                "priority",
+                "task_type__name",
+                "position",
+            ),
+        ),
+        (
+            ASSIGNEE,
+            through[ASSIGNEE].values_list("task_id", "worker__username"),
+        ),
+        (
+            TASK_ATTACHMENT,
+            through[TASK_ATTACHMENT].values_list("task_id", "attachment_id"),
+        ),
+    ]
+    for kind, rows in sources:
+        fields = RECORD_FIELDS[kind]
+        for row in rows.order_by("pk").iterator(chunk_size=chunk_size):
+            yield {"type": kind, **dict(zip(fields, row))}
+
+
+class Echo:
+    """A file-like object that hands back what is written to it."""
+
+    def write(self, value):
+        return value
+
+
+def export_lines(project_id, format=JSONL, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield the project's export as lines of text in ``format``."""
+    records = export_records(project_id, chunk_size)
+    if format == JSONL:
+        encoder = DjangoJSONEncoder(separators=(",", ":"))
+        for record in records:
+            yield encoder.encode(record) + "\n"
+        return
+    writer = csv.DictWriter(Echo(), CSV_COLUMNS)
+    yield writer.writeheader()
+    for record in records:
+        yield writer.writerow(record)
+
+
+def read_records(lines, format=JSONL):
+    """Parse exported lines back into record dicts.
+
+    CSV cells come back as strings, and each row keeps only its record
+    type's columns, so a blank cell is an empty string rather than a
+    missing key.
+    """
+    if format == JSONL:
+        for line in lines:
+            if line.strip():
+                yield json.loads(line)
+        return
+    for row in csv.DictReader(lines):
+        kind = row["type"]
+        fields = RECORD_FIELDS.get(kind, ())
+        yield {"type": kind, **{field: row[field] for field in fields}}
+
+
+def as_bool(value):
+    return value in (True, "True", "true", "1")
+
+
+def as_date(value):
+    return value if isinstance(value, date) else date.fromisoformat(value)
+
+
+class ProjectImporter:
+    """Load one exported project, ``batch_size`` rows per insert.
+
+    Feed it records with ``add()`` in the order they were exported, then
+    call ``finish()``. Run it inside a transaction.
+    """
+
+    def __init__(self, name=None, team=None, batch_size=IMPORT_BATCH_SIZE):
+        self.name = name
+        self.team = team
+        self.batch_size = batch_size
+        self.project = None
+        self.sync_version = 0
+        self.updated_at = None
+        self.ids = defaultdict(dict)
+        self.task_types = {}
+        self.workers = {}
+        self.pending = []
+        self.pending_type = None
+        self.deltas = defaultdict(lambda: [0, 0])
+        self.created = defaultdict(int)
+        self.skipped = defaultdict(int)
+
+    def add(self, record):
+        kind = record["type"]
+        if kind not in RECORD_FIELDS:
+            raise ValueError(f"Unknown record type: {kind}")
+        if kind == PROJECT:
+            self.create_project(record)
+            return
+        if self.project is None:
+            raise ValueError("The export must start with its project.")
+        if kind != self.pending_type:
+            self.flush()
+            self.pending_type = kind
+        self.pending.append(record)
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def finish(self):
+        self.flush()
+        shift_task_counts(self.deltas)
+        SiteCounters.add(tasks=self.created[TASK])
+        return self.project
+
+    def create_project(self, record):
+        if self.project is not None:
+            raise ValueError("An export holds a single project.")
+        owner = record.get("owner")
+        self.project = Project.objects.create(
+            name=self.name or record["name"],
+            description=record.get("description", ""),
+            deadline=as_date(record["deadline"]),
+            is_completed=as_bool(record.get("is_completed")),
+            owner=(
+                get_user_model().objects.filter(username=owner).first()
+                if owner
+                else None
+            ),
+            team=self.team or self.find_team(record.get("team")),
+        )
+        self.sync_version = next_sync_version(pk=self.project.pk)
+        connection = connections[router.db_for_write(Task)]
+        self.updated_at = connection.ops.adapt_datetimefield_value(
+            timezone.now()
+        )
+
+    def find_team(self, name):
+        """The one team called ``name``; several of them is an error."""
+        if not name:
+            return None
+        teams = list(Team.objects.filter(name=name)[:2])
+        if len(teams) > 1:
+            raise ValueError(
+                f"More than one team is named {name!r}; choose one."
+            )
+        return teams[0] if teams else None
+
+    def flush(self):
+        if self.pending:
+            getattr(self, f"insert_{self.pending_type}s")(self.pending)
+            self.pending = []
+
+    def insert(self, model, kind, records, objs):
+        """``bulk_create`` ``objs`` and map each record's id to its row."""
+        model.objects.bulk_create(objs)
+        ids = self.ids[kind]
+        for record, obj in zip(records, objs):
+            ids[int(record["id"])] = obj.pk
+        self.created[kind] += len(objs)
+
+    def insert_boards(self, records):
+        boards = [
+            Board(
+                project=self.project,
+                name=record["name"],
+                color=record.get("color") or None,
+                sync_version=self.sync_version,
+            )
+            for record in records
+        ]
+        self.insert(Board, BOARD, records, boards)
+
+    def insert_attachments(self, records):
+        attachments = [
+            Attachment(name=record["name"], file=record["file"])
+            for record in records
+        ]
+        self.insert(Attachment, ATTACHMENT, records, attachments)
+
+    def task_type_id(self, name):
+        if name not in self.task_types:
+            self.task_types[name] = TaskType.objects.get_or_create(name=name)[
+                0
+            ].pk
+        return self.task_types[name]
+
+    def new_id(self, kind, record, field):
+        """The imported id of the ``kind`` row ``record[field]`` refers to.
+
+        ``None`` when that row is not in the export; the record is then
+        skipped and counted rather than failing the whole import.
+        """
+        return self.ids[kind].get(int(record[field]))
+
+    def insert_tasks(self, records):
+        rows = []
+        kept = []
+        for record in records:
+            board_id = self.new_id(BOARD, record, "board")
+            if board_id is None:
+                self.skipped[TASK] += 1
+                continue
+            kept.append(record)
+            is_completed = as_bool(record.get("is_completed"))
+            rows.append(
+                (
+                    board_id,
+                    record["name"],
+                    record.get("description", ""),
+                    as_date(record["deadline"]),
+                    is_completed,
+                    record.get("priority") or Task.HIGH,
+                    self.task_type_id(record["task_type"]),
+                    int(record["position"]),
+                    self.sync_version,
+                    self.updated_at,
+                )
+            )
+            self.deltas[board_id][0] += 1
+            self.deltas[board_id][1] += is_completed
+        pks = insert_rows(Task, TASK_COLUMNS, rows)
+
+        ids = self.ids[TASK]
+        for record, pk in zip(kept, pks):
+            ids[int(record["id"])] = pk
+        self.created[TASK] += len(pks)
+        insert_rows(
+            SearchEntry,
+            ENTRY_FIELDS,
+            [
+                task_entry(pk, self.project.pk, row[1], row[2])
+                for pk, row in zip(pks, rows)
+            ],
+        )
+
+    def worker_ids(self, usernames):
+        missing = set(usernames) - self.workers.keys()
+        if missing:
+            found = dict(
+                get_user_model()
+                .objects.filter(username__in=missing)
+                .values_list("username", "pk")
+            )
+            for username in missing:
+                self.workers[username] = found.get(username)
+        return self.workers
+
+    def insert_assignees(self, records):
+        workers = self.worker_ids(record["worker"] for record in records)
+        links = []
+        for record in records:
+            task_id = self.new_id(TASK, record, "task")
+            worker_id = workers[record["worker"]]
+            if task_id is None or worker_id is None:
+                self.skipped[ASSIGNEE] += 1
+                continue
+            links.append((task_id, worker_id))
+        insert_rows(Task.assignees.through, ("task", "worker"), links)
+        touch_workers(pk__in={worker_id for _, worker_id in links})
+        self.created[ASSIGNEE] += len(links)
+
+    def insert_task_attachments(self, records):
+        links = []
+        for record in records:
+            task_id = self.new_id(TASK, record, "task")
+            attachment_id = self.new_id(ATTACHMENT, record, "attachment")
+            if task_id is None or attachment_id is None:
+                self.skipped[TASK_ATTACHMENT] += 1
+                continue
+            links.append((task_id, attachment_id))
+        insert_rows(Task.attachments.through, ("task", "attachment"), links)
+        self.created[TASK_ATTACHMENT] += len(links)
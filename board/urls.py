@@ -10,9 +10,12 @@ from .views import (
     TaskCreateView,
     TaskListView,
     TaskDetailView,
+    TaskDetailsView,
     TaskUpdateView,
     TaskDeleteView,
     TaskChangeBoardView,
+    TaskReorderView,
+    TaskBulkView,
     TaskTypeListView,
     TaskTypeCreateView,
     TaskTypeUpdateView,
@@ -21,22 +24,33 @@ from .views import (
     BoardCreateView,
     BoardDeleteView,
     BoardUpdateView,
+    BoardTasksView,
+    WorkerAutocompleteView,
     WorkerCreateView,
     WorkerListView,
     WorkerDetailView,
     TeamCreateView,
     TeamUpdateView,
     toggle_assign_to_team,
+    project_events,
+    ProjectChangesView,
+    ProjectActivityView,
+    ProjectBurndownView,
+    ProjectCumulativeFlowView,
+    ProjectExportView,
+    WorkerActivityView,
     PositionCreateView,
     PositionListView,
     PositionDetailView,
     PositionDeleteView,
     PositionUpdateView,
     RegisterView,
+    SearchView,
 )
 
 urlpatterns = [
     path("", index, name="index"),
+    path("search/", SearchView.as_view(), name="search"),
     path(
         "projects/",
         ProjectListView.as_view(),
@@ -62,7 +76,39 @@ urlpatterns = [
         ProjectDetailView.as_view(),
         name="project-detail",
     ),
+    path(
+        "projects/<int:pk>/events/",
+        project_events,
+        name="project-events",
+    ),
+    path(
+        "projects/<int:pk>/changes/",
+        ProjectChangesView.as_view(),
+        name="project-changes",
+    ),
+    path(
+        "projects/<int:pk>/activity/",
+        ProjectActivityView.as_view(),
+        name="project-activity",
+    ),
+    path(
+        "projects/<int:pk>/export/",
+        ProjectExportView.as_view(),
+        name="project-export",
+    ),
+    path(
+        "projects/<int:pk>/reports/burndown/",
+        ProjectBurndownView.as_view(),
+        name="project-burndown",
+    ),
+    path(
+        "projects/<int:pk>/reports/cumulative-flow/",
+        ProjectCumulativeFlowView.as_view(),
+        name="project-cumulative-flow",
+    ),
     path("tasks/", TaskListView.as_view(), name="task-list"),
+    path("tasks/details/", TaskDetailsView.as_view(), name="task-details"),
+    path("tasks/bulk/", TaskBulkView.as_view(), name="task-bulk"),
     path("tasks/<int:pk>/", TaskDetailView.as_view(), name="task-detail"),
     path(
         "tasks/<int:pk>/update", TaskUpdateView.as_view(), name="task-update"
@@ -77,6 +123,11 @@ urlpatterns = [
         TaskChangeBoardView.as_view(),
         name="task-change-board",
     ),
+    path(
+        "tasks/<int:pk>/reorder/",
+        TaskReorderView.as_view(),
+        name="task-reorder",
+    ),
     path(
         "boards/create/<int:project_id>/",
         BoardCreateView.as_view(),
@@ -92,6 +143,11 @@ urlpatterns = [
         BoardUpdateView.as_view(),
         name="board-update",
     ),
+    path(
+        "boards/<int:pk>/tasks/",
+        BoardTasksView.as_view(),
+        name="board-tasks",
+    ),
     path(
         "tasks/<int:pk>/delete/", TaskDeleteView.as_view(), name="task-delete"
     ),
@@ -99,7 +155,17 @@ urlpatterns = [
     path(
         "workers/<int:pk>/", WorkerDetailView.as_view(), name="worker-detail"
     ),
+    path(
+        "workers/<int:pk>/activity/",
+        WorkerActivityView.as_view(),
+        name="worker-activity",
+    ),
     path("workers/create/", WorkerCreateView.as_view(), name="worker-create"),
+    path(
+        "workers/autocomplete/",
+        WorkerAutocompleteView.as_view(),
+        name="worker-autocomplete",
+    ),
     path("teams/create/", TeamCreateView.as_view(), name="team-create"),
     path(
         "teams/<int:pk>/update/", TeamUpdateView.as_view(), name="team-update"
@@ -1,53 +1,154 @@
+import json
+from collections import defaultdict
+
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
+from django.contrib.auth.views import redirect_to_login
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
-from django.http import HttpResponseRedirect, JsonResponse
+from django.db.models import (
+    Count,
+    Max,
+    OuterRef,
+    Prefetch,
+    Subquery,
+    Sum,
+    prefetch_related_objects,
+)
+from django.db.models.functions import Coalesce
+from django.http import (
+    Http404,
+    HttpResponse,
+    HttpResponseBadRequest,
+    HttpResponseRedirect,
+    JsonResponse,
+    StreamingHttpResponse,
+)
 from django.shortcuts import render, redirect, get_object_or_404
+from django.template.loader import render_to_string
 from django.urls import reverse_lazy, reverse
+from django.utils import timezone
+from django.utils.functional import cached_property
+from django.utils.text import Truncator
+from django.utils.safestring import mark_safe
 from django.views import generic
 
 from board.forms import (
     ProjectSearchForm,
+    ReportRangeForm,
+    TaskBulkForm,
     ProjectCreationForm,
     TaskForm,
     TaskTypeForm,
     TaskChangeBoardForm,
+    TaskReorderForm,
     BoardCreationForm,
     WorkerSearchForm,
     WorkerForm,
     TeamForm,
     PositionForm,
     RegisterForm,
+    SearchForm,
+    TaskFilterForm,
+)
+from board.cache import column_cache_key, fragment_cache
+from board.counters import with_progress
+from board import bulk, reports, search, transfer
+from board.access import ProjectEditorRequiredMixin, can_edit_project
+from board.events import get_broker
+from board.mixins import (
+    CachedObjectMixin,
+    ConditionalGetMixin,
+    CursorPaginationMixin,
 )
-from board.models import Project, Board, Task, Team, TaskType, Position
+from board.models import (
+    Activity,
+    Project,
+    Board,
+    Task,
+    Team,
+    TaskType,
+    Position,
+    SearchEntry,
+    SiteCounters,
+    Tombstone,
+)
+from board.ordering import place_task
+from board.pagination import InvalidCursor, keyset_page, split_page
+
+TASKS_PER_COLUMN = 20
+
+
+def column_tasks_queryset():
+    return Task.objects.select_related("task_type").prefetch_related(
+        "assignees", "attachments"
+    )
+
+
+def latest(queryset, field):
+    """The highest ``field`` of ``queryset``, as a subquery."""
+    return Subquery(queryset.order_by(f"-{field}").values(field)[:1])
 
 
 def index(request):
     """View function for the home page of the site."""
 
-    count_of_projects = Project.objects.count()
-    count_of_tasks = Task.objects.count()
-    count_of_users = get_user_model().objects.count()
-    count_of_active_projects = Project.objects.filter(
-        is_completed=False
-    ).count()
+    counters = SiteCounters.load()
 
     return render(
         request,
         "pages/index.html",
         context={
-            "count_of_projects": count_of_projects,
-            "count_of_tasks": count_of_tasks,
-            "count_of_users": count_of_users,
-            "count_of_active_projects": count_of_active_projects,
+            "count_of_projects": counters.projects,
+            "count_of_tasks": counters.tasks,
+            "count_of_users": counters.users,
+            "count_of_active_projects": counters.active_projects,
         },
     )
 
 
-class ProjectListView(LoginRequiredMixin, generic.ListView):
+class ProjectListView(
+    LoginRequiredMixin,
+    ConditionalGetMixin,
+    CursorPaginationMixin,
+    generic.ListView,
+):
     model = Project
     paginate_by = 3
+    ordering = ("-id",)
+
+    def has_pending_notices(self):
+        return "error" in self.request.session or super().has_pending_notices()
+
+    def get_etag(self):
+        # Index seeks and the counter row, never a scan of the projects.
+        # The count catches deletes; owners and members are workers.
+        state = (
+            SiteCounters.objects.filter(pk=SiteCounters.SINGLETON_ID)
+            .values_list(
+                "projects",
+                latest(Project.objects, "updated_at"),
+                latest(get_user_model().objects, "updated_at"),
+            )
+            .first()
+        )
+        if state is None:
+            SiteCounters.load()
+            return self.get_etag()
+        count, projects_updated_at, workers_updated_at = state
+        return ":".join(
+            [
+                "projects",
+                str(projects_updated_at and projects_updated_at.timestamp()),
+                str(workers_updated_at and workers_updated_at.timestamp()),
+                str(count),
+                # Overdue counts change when the day does.
+                str(timezone.localdate()),
+                str(self.request.user.pk),
+                self.request.GET.urlencode(),
+            ]
+        )
 
     def get_context_data(self, *, object_list=None, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -59,10 +160,36 @@ class ProjectListView(LoginRequiredMixin, generic.ListView):
         return context
 
     def get_queryset(self):
-        queryset = Project.objects.order_by("-pk")
+        queryset = with_progress(
+            Project.objects.select_related("owner", "team")
+            # Only the columns project_list.html reads.
+            .only(
+                "id",
+                "name",
+                "description",
+                "deadline",
+                "is_completed",
+                "task_count",
+                "completed_count",
+                "owner__id",
+                "owner__username",
+                "owner__email",
+                "owner__avatar",
+                "team__id",
+            ).prefetch_related(
+                Prefetch(
+                    "team__members",
+                    queryset=get_user_model().objects.only(
+                        "id", "username", "avatar"
+                    ),
+                )
+            )
+        )
         form = ProjectSearchForm(self.request.GET)
         if form.is_valid():
-            return queryset.filter(name__icontains=form.cleaned_data["name"])
+            return search.filter_matching(
+                queryset, form.cleaned_data["name"], SearchEntry.PROJECT
+            )
         return queryset
 
 
@@ -89,7 +216,10 @@ class ProjectCreateView(LoginRequiredMixin, generic.CreateView):
 
 
 class ProjectUpdateView(
-    LoginRequiredMixin, UserPassesTestMixin, generic.UpdateView
+    LoginRequiredMixin,
+    UserPassesTestMixin,
+    CachedObjectMixin,
+    generic.UpdateView,
 ):
     model = Project
     fields = "__all__"
@@ -102,8 +232,7 @@ class ProjectUpdateView(
     )
 
     def test_func(self):
-        project = self.get_object()
-        return project.owner == self.request.user
+        return self.get_object().owner_id == self.request.user.pk
 
     def handle_no_permission(self):
         messages.error(self.request, self.error_message)
@@ -124,7 +253,10 @@ class ProjectUpdateView(
 
 
 class ProjectDeleteView(
-    LoginRequiredMixin, UserPassesTestMixin, generic.DeleteView
+    LoginRequiredMixin,
+    UserPassesTestMixin,
+    CachedObjectMixin,
+    generic.DeleteView,
 ):
 
     model = Project
@@ -136,8 +268,7 @@ class ProjectDeleteView(
     )
 
     def test_func(self):
-        project = self.get_object()
-        return project.owner == self.request.user
+        return self.get_object().owner_id == self.request.user.pk
 
     def handle_no_permission(self):
         messages.error(self.request, self.error_message)
@@ -148,18 +279,153 @@ class ProjectDeleteView(
         return redirect(reverse("board:project-list"))
 
 
-class ProjectDetailView(LoginRequiredMixin, generic.DetailView):
+class ProjectDetailView(
+    LoginRequiredMixin, ConditionalGetMixin, generic.DetailView
+):
     model = Project
     fields = "__all__"
 
+    def get_etag(self):
+        # Subqueries, so joining the members does not multiply the sum.
+        members = (
+            get_user_model()
+            .objects.filter(teams=OuterRef("team"))
+            .values("teams")
+        )
+        state = (
+            Project.objects.filter(pk=self.kwargs["pk"])
+            .annotate(
+                boards_version=Sum("boards__version"),
+                members_updated_at=Subquery(
+                    members.annotate(latest=Max("updated_at")).values("latest")
+                ),
+                member_count=Subquery(
+                    members.annotate(count=Count("pk")).values("count")
+                ),
+            )
+            .values_list(
+                "updated_at",
+                "sync_version",
+                "boards_version",
+                "members_updated_at",
+                "member_count",
+            )
+            .first()
+        )
+        if state is None:
+            return None
+        (
+            updated_at,
+            sync_version,
+            boards_version,
+            members_updated_at,
+            member_count,
+        ) = state
+        return ":".join(
+            [
+                "project",
+                str(self.kwargs["pk"]),
+                str(updated_at.timestamp()),
+                str(sync_version),
+                str(boards_version or 0),
+                str(members_updated_at and members_updated_at.timestamp()),
+                str(member_count or 0),
+                str(self.request.user.pk),
+            ]
+        )
+
+    def get_queryset(self):
+        members = (
+            get_user_model()
+            .objects.select_related("position")
+            .annotate(task_count=Count("tasks"))
+        )
+        return Project.objects.select_related(
+            "owner", "team"
+        ).prefetch_related(
+            "boards",
+            Prefetch("team__members", queryset=members),
+        )
+
+    def render_columns(self, boards):
+        """Attach cached card-list HTML to every board.
+
+        Only boards whose version has no cached fragment load their tasks,
+        all of them together in a single prefetch.
+        """
+        cache = fragment_cache()
+        keys = {board.pk: column_cache_key(board) for board in boards}
+        cached = cache.get_many(keys.values())
+        missing = [board for board in boards if keys[board.pk] not in cached]
+
+        prefetch_related_objects(
+            missing,
+            Prefetch(
+                "tasks",
+                queryset=column_tasks_queryset().order_by(
+                    *Task.COLUMN_ORDERING
+                )[: TASKS_PER_COLUMN + 1],
+                to_attr="column_tasks",
+            ),
+        )
+        rendered = {}
+        for board in missing:
+            tasks, next_cursor = split_page(
+                board.column_tasks, Task.COLUMN_ORDERING, TASKS_PER_COLUMN
+            )
+            rendered[keys[board.pk]] = render_to_string(
+                "board/board_tasks.html",
+                {
+                    "board": board,
+                    "project": self.object,
+                    "tasks": tasks,
+                    "next_cursor": next_cursor,
+                },
+            )
+        cache.set_many(rendered)
+        cached.update(rendered)
+
+        for board in boards:
+            board.column_html = mark_safe(cached[keys[board.pk]])
+
     def get_context_data(self, *, object_list=None, **kwargs):
         context = super().get_context_data(**kwargs)
+        self.render_columns(self.object.boards.all())
         context["task_form"] = TaskForm()
         return context
 
 
+class BoardTasksView(LoginRequiredMixin, generic.View):
+    """Render one page of a board's cards as an HTML fragment."""
+
+    def get(self, request, *args, **kwargs):
+        board = get_object_or_404(
+            Board.objects.select_related("project"), pk=kwargs["pk"]
+        )
+        try:
+            tasks, next_cursor = keyset_page(
+                column_tasks_queryset().filter(board=board),
+                Task.COLUMN_ORDERING,
+                TASKS_PER_COLUMN,
+                cursor=request.GET.get("cursor"),
+            )
+        except InvalidCursor:
+            raise Http404("Invalid cursor.")
+
+        return render(
+            request,
+            "board/board_tasks.html",
+            context={
+                "board": board,
+                "project": board.project,
+                "tasks": tasks,
+                "next_cursor": next_cursor,
+            },
+        )
+
+
 class TaskCreateView(
-    LoginRequiredMixin, UserPassesTestMixin, generic.CreateView
+    LoginRequiredMixin, ProjectEditorRequiredMixin, generic.CreateView
 ):
     model = Task
     form_class = TaskForm
@@ -170,14 +436,21 @@ class TaskCreateView(
         "edit it."
     )
 
+    @cached_property
+    def board(self):
+        return get_object_or_404(Board, pk=self.kwargs["board_id"])
+
+    def get_project_id(self):
+        return self.board.project_id
+
     def form_valid(self, form):
-        board = get_object_or_404(Board, pk=self.kwargs["board_id"])
-        form.instance.board = board
+        form.instance.board = self.board
         return super().form_valid(form)
 
     def get_success_url(self):
-        projects_id = self.object.board.project.id
-        return reverse_lazy("board:project-detail", kwargs={"pk": projects_id})
+        return reverse_lazy(
+            "board:project-detail", kwargs={"pk": self.board.project_id}
+        )
 
     def get_initial(self):
         initial = super().get_initial()
@@ -186,14 +459,6 @@ class TaskCreateView(
             initial["board"] = board_id
         return initial
 
-    def test_func(self):
-        user = self.request.user
-        self.board = get_object_or_404(Board, pk=self.kwargs["board_id"])
-        return (
-            user in self.board.project.team.members.all()
-            or user == self.board.project.owner
-        )
-
     def handle_no_permission(self):
         messages.add_message(self.request, messages.ERROR, self.error_message)
 
@@ -205,16 +470,17 @@ class TaskCreateView(
             return redirect(
                 reverse(
                     "board:project-detail",
-                    kwargs={"pk": self.board.project.id},
+                    kwargs={"pk": self.board.project_id},
                 )
             )
 
 
 class BoardCreateView(
-    LoginRequiredMixin, UserPassesTestMixin, generic.CreateView
+    LoginRequiredMixin, ProjectEditorRequiredMixin, generic.CreateView
 ):
     model = Board
     form_class = BoardCreationForm
+    project_url_kwarg = "project_id"
 
     error_message = (
         "You are not allowed to edit this project. "
@@ -231,23 +497,21 @@ class BoardCreateView(
             "board:project-detail", kwargs={"pk": self.kwargs["project_id"]}
         )
 
-    def test_func(self):
-        user = self.request.user
-        project = get_object_or_404(Project, pk=self.kwargs["project_id"])
-        return user in project.team.members.all() or user == project.owner
-
     def handle_no_permission(self):
         messages.add_message(self.request, messages.ERROR, self.error_message)
         return redirect(
             reverse(
                 "board:project-detail",
-                kwargs={"pk": self.get_object().board.project.id},
+                kwargs={"pk": self.kwargs["project_id"]},
             )
         )
 
 
 class BoardDeleteView(
-    LoginRequiredMixin, UserPassesTestMixin, generic.DeleteView
+    LoginRequiredMixin,
+    UserPassesTestMixin,
+    CachedObjectMixin,
+    generic.DeleteView,
 ):
     model = Board
 
@@ -261,10 +525,12 @@ class BoardDeleteView(
         project = self.object.project_id
         return reverse_lazy("board:project-detail", kwargs={"pk": project})
 
+    def get_queryset(self):
+        return Board.objects.select_related("project")
+
     def test_func(self):
-        user = self.request.user
         self.object = self.get_object()
-        return user == self.object.project.owner
+        return self.object.project.owner_id == self.request.user.pk
 
     def handle_no_permission(self):
         messages.error(self.request, self.error_message)
@@ -275,13 +541,16 @@ class BoardDeleteView(
         return redirect(
             reverse(
                 "board:project-detail",
-                kwargs={"pk": self.get_object().project.id},
+                kwargs={"pk": self.get_object().project_id},
             )
         )
 
 
 class BoardUpdateView(
-    LoginRequiredMixin, UserPassesTestMixin, generic.UpdateView
+    LoginRequiredMixin,
+    UserPassesTestMixin,
+    CachedObjectMixin,
+    generic.UpdateView,
 ):
     model = Board
     fields = "__all__"
@@ -291,9 +560,16 @@ class BoardUpdateView(
         "Only the owner of the project can delete it."
     )
 
+    def get_success_url(self):
+        project = self.object.project_id
+        return reverse_lazy("board:project-detail", kwargs={"pk": project})
+
+    def get_queryset(self):
+        return Board.objects.select_related("project")
+
     def test_func(self):
         project = self.get_object().project
-        return project.owner == self.request.user
+        return project.owner_id == self.request.user.pk
 
     def handle_no_permission(self):
         messages.error(self.request, self.error_message)
@@ -304,7 +580,7 @@ class BoardUpdateView(
         return redirect(
             reverse(
                 "board:project-detail",
-                kwargs={"pk": self.get_object().project.id},
+                kwargs={"pk": self.get_object().project_id},
             )
         )
 
@@ -314,9 +590,12 @@ class BoardUpdateView(
         )
 
 
-class WorkerListView(LoginRequiredMixin, generic.ListView):
+class WorkerListView(
+    LoginRequiredMixin, CursorPaginationMixin, generic.ListView
+):
     model = get_user_model()
     paginate_by = 5
+    ordering = ("username",)
 
     def get_context_data(self, *, object_list=None, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -327,7 +606,19 @@ class WorkerListView(LoginRequiredMixin, generic.ListView):
         return context
 
     def get_queryset(self):
-        queryset = get_user_model().objects.all()
+        # A correlated count runs only for the workers on the page.
+        assigned = (
+            Task.assignees.through.objects.filter(worker=OuterRef("pk"))
+            .order_by()
+            .values("worker")
+            .annotate(count=Count("pk"))
+            .values("count")
+        )
+        queryset = (
+            get_user_model()
+            .objects.select_related("position")
+            .annotate(task_count=Coalesce(Subquery(assigned), 0))
+        )
         form = WorkerSearchForm(self.request.GET)
         if form.is_valid():
             return queryset.filter(
@@ -357,6 +648,51 @@ class WorkerDetailView(LoginRequiredMixin, generic.DetailView):
         return context
 
 
+class WorkerAutocompleteView(LoginRequiredMixin, generic.View):
+    """Workers whose names start with ``?q=``.
+
+    ``?board=`` or ``?project=`` narrows the matches to that project's team.
+    """
+
+    fields = ("username", "first_name", "last_name")
+    limit = 10
+
+    def get(self, request, *args, **kwargs):
+        workers = search.match_prefixes(
+            get_user_model().objects.all(),
+            request.GET.get("q", ""),
+            self.fields,
+        )
+        try:
+            if request.GET.get("board"):
+                workers = workers.filter(
+                    teams__project__boards=int(request.GET["board"])
+                )
+            if request.GET.get("project"):
+                workers = workers.filter(
+                    teams__project=int(request.GET["project"])
+                )
+        except ValueError:
+            return HttpResponseBadRequest("Invalid board or project.")
+
+        workers = workers.only(
+            "id", "username", "first_name", "last_name", "avatar"
+        ).order_by("username")[: self.limit]
+        return JsonResponse(
+            {
+                "results": [
+                    {
+                        "id": worker.id,
+                        "username": worker.username,
+                        "full_name": worker.get_full_name(),
+                        "avatar": worker.avatar.url if worker.avatar else None,
+                    }
+                    for worker in workers
+                ]
+            }
+        )
+
+
 class WorkerCreateView(LoginRequiredMixin, generic.CreateView):
     model = get_user_model()
     form_class = WorkerForm
@@ -384,17 +720,421 @@ def toggle_assign_to_team(request, pk):
     )
 
 
-class TaskDetailView(LoginRequiredMixin, generic.DetailView):
+class ProjectChangesView(LoginRequiredMixin, generic.View):
+    """Return the boards and tasks changed after ``?since=<version>``.
+
+    ``since=0`` (or no ``since``) is a full snapshot, including rows that
+    were never stamped, e.g. seeded or created before delta sync. An
+    unchanged project costs one primary key lookup and answers with an
+    empty 204 response.
+    """
+
+    board_fields = ("id", "name", "color", "sync_version")
+    task_fields = (
+        "id",
+        "board_id",
+        "name",
+        "description",
+        "deadline",
+        "is_completed",
+        "priority",
+        "task_type_id",
+        "position",
+        "sync_version",
+    )
+
+    def get(self, request, *args, **kwargs):
+        try:
+            since = int(request.GET.get("since", 0))
+        except ValueError:
+            return HttpResponseBadRequest("Invalid version.")
+
+        version = (
+            Project.objects.filter(pk=kwargs["pk"])
+            .values_list("sync_version", flat=True)
+            .first()
+        )
+        if version is None:
+            raise Http404("No project found matching the query")
+        if since > 0 and version <= since:
+            return HttpResponse(status=204)
+
+        changed = {"sync_version__lte": version}
+        if since > 0:
+            changed["sync_version__gt"] = since
+        boards = Board.objects.filter(project_id=kwargs["pk"], **changed)
+        tasks = list(
+            Task.objects.filter(
+                board__project_id=kwargs["pk"], **changed
+            ).values(*self.task_fields)
+        )
+        assignees = defaultdict(list)
+        for task_id, worker_id in Task.assignees.through.objects.filter(
+            task_id__in=[task["id"] for task in tasks]
+        ).values_list("task_id", "worker_id"):
+            assignees[task_id].append(worker_id)
+        for task in tasks:
+            task["assignees"] = assignees[task["id"]]
+
+        # A snapshot has nothing to delete on the client.
+        deleted = Tombstone.objects.filter(
+            project_id=kwargs["pk"], **changed
+        ).values("model", "object_id", "sync_version")
+        if since <= 0:
+            deleted = deleted.none()
+
+        return JsonResponse(
+            {
+                "version": version,
+                "boards": list(boards.values(*self.board_fields)),
+                "tasks": tasks,
+                "deleted": list(deleted),
+            }
+        )
+
+
+class ProjectExportView(
+    LoginRequiredMixin, ProjectEditorRequiredMixin, generic.View
+):
+    """Stream the project as ``?format=jsonl`` (the default) or ``csv``."""
+
+    def get(self, request, *args, **kwargs):
+        format = request.GET.get("format", transfer.JSONL)
+        if format not in transfer.FORMATS:
+            return HttpResponseBadRequest("Unknown export format.")
+        response = StreamingHttpResponse(
+            transfer.export_lines(kwargs["pk"], format),
+            content_type=transfer.FORMATS[format],
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="project-{kwargs["pk"]}.{format}"'
+        )
+        return response
+
+
+class ProjectReportView(LoginRequiredMixin, generic.View):
+    """Chart series for ``?start=`` to ``?end=``, from daily snapshots.
+
+    Both dates are optional and default to the last 30 days.
+    """
+
+    report = None
+
+    def get(self, request, *args, **kwargs):
+        form = ReportRangeForm(request.GET)
+        if not form.is_valid():
+            return JsonResponse({"errors": form.errors}, status=400)
+        get_object_or_404(Project.objects.only("id"), pk=kwargs["pk"])
+        start, end = form.cleaned_data["start"], form.cleaned_data["end"]
+        return JsonResponse(
+            {
+                "project": kwargs["pk"],
+                "start": start,
+                "end": end,
+                **self.report(kwargs["pk"], start, end),
+            }
+        )
+
+
+class ProjectBurndownView(ProjectReportView):
+    report = staticmethod(reports.burndown)
+
+
+class ProjectCumulativeFlowView(ProjectReportView):
+    report = staticmethod(reports.cumulative_flow)
+
+
+class ActivityListView(
+    LoginRequiredMixin, CursorPaginationMixin, generic.ListView
+):
+    """Newest entries first; each page is one range scan of an index.
+
+    Entries are those whose ``filter_field`` equals the ``filter_kwarg``
+    URL argument.
+    """
+
+    model = Activity
+    paginate_by = 50
+    ordering = ("-timestamp", "-id")
+    template_name = "board/activity_list.html"
+    filter_kwarg = "pk"
+    filter_field = None
+
+    def get_queryset(self):
+        return (
+            Activity.objects.filter(
+                **{self.filter_field: self.kwargs[self.filter_kwarg]}
+            )
+            .select_related("actor")
+            .only(
+                "id",
+                "project_id",
+                "actor__id",
+                "actor__username",
+                "verb",
+                "model",
+                "object_id",
+                "data",
+                "timestamp",
+            )
+            # Deleted projects keep their entries, which a join would drop.
+            .prefetch_related(
+                Prefetch("project", queryset=Project.objects.only("name"))
+            )
+        )
+
+
+class ProjectActivityView(ActivityListView):
+    filter_field = "project_id"
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["project"] = get_object_or_404(
+            Project.objects.only("name"), pk=self.kwargs["pk"]
+        )
+        return context
+
+
+class WorkerActivityView(ActivityListView):
+    filter_field = "actor_id"
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["worker"] = get_object_or_404(
+            get_user_model().objects.only("username"), pk=self.kwargs["pk"]
+        )
+        return context
+
+
+EVENTS_KEEPALIVE = 15
+
+
+async def project_events(request, pk):
+    """Stream a project's task changes as Server-Sent Events.
+
+    Needs an ASGI server (see ``core/asgi.py``) so an idle stream does not
+    hold a worker thread.
+    """
+    user = await request.auser()
+    if not user.is_authenticated:
+        return redirect_to_login(request.get_full_path(), settings.LOGIN_URL)
+    if not await Project.objects.filter(pk=pk).aexists():
+        raise Http404("No project found matching the query")
+
+    subscription = get_broker().subscribe(pk)
+
+    async def stream():
+        try:
+            yield "retry: 3000\n\n"
+            while True:
+                event = await subscription.get(timeout=EVENTS_KEEPALIVE)
+                if event is None:
+                    yield ": keepalive\n\n"
+                    continue
+                yield (
+                    f"event: {event['type']}\n"
+                    f"data: {json.dumps(event, separators=(',', ':'))}\n\n"
+                )
+        finally:
+            subscription.close()
+
+    response = StreamingHttpResponse(
+        stream(), content_type="text/event-stream"
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+class TaskDetailView(
+    LoginRequiredMixin, ConditionalGetMixin, generic.DetailView
+):
     model = Task
 
+    def get_validators(self):
+        if not hasattr(self, "_validators"):
+            self._validators = (
+                Task.objects.filter(pk=self.kwargs["pk"])
+                .values_list("updated_at", "sync_version", "board__updated_at")
+                .first()
+            )
+        return self._validators
+
+    def get_etag(self):
+        if self.get_validators() is None:
+            return None
+        updated_at, sync_version, board_updated_at = self.get_validators()
+        return ":".join(
+            [
+                "task",
+                str(self.kwargs["pk"]),
+                str(updated_at.timestamp()),
+                str(sync_version),
+                str(board_updated_at.timestamp()),
+            ]
+        )
+
+    def get_last_modified(self):
+        if self.get_validators() is None:
+            return None
+        updated_at, sync_version, board_updated_at = self.get_validators()
+        return max(updated_at, board_updated_at)
+
+
+class TaskDetailsView(LoginRequiredMixin, generic.View):
+    """Return detail records for ``?ids=1,2,3`` in one round trip."""
+
+    max_ids = 100
+
+    def get(self, request, *args, **kwargs):
+        try:
+            ids = {
+                int(task_id)
+                for task_id in request.GET.get("ids", "").split(",")
+                if task_id
+            }
+        except ValueError:
+            return HttpResponseBadRequest("Invalid task ids.")
+        if len(ids) > self.max_ids:
+            return HttpResponseBadRequest(
+                f"Request at most {self.max_ids} tasks at once."
+            )
+
+        tasks = (
+            Task.objects.filter(pk__in=ids)
+            .select_related("board", "task_type")
+            .prefetch_related(
+                Prefetch(
+                    "assignees",
+                    queryset=get_user_model().objects.only(
+                        "id", "username", "avatar"
+                    ),
+                ),
+                "attachments",
+            )
+        )
+        return JsonResponse(
+            {"tasks": [self.serialize(task) for task in tasks]}
+        )
+
+    @staticmethod
+    def serialize(task):
+        return {
+            "id": task.id,
+            "name": task.name,
+            "description": task.description,
+            "deadline": task.deadline,
+            "is_completed": task.is_completed,
+            "priority": task.priority,
+            "task_type": task.task_type.name,
+            "board": {"id": task.board.id, "name": task.board.name},
+            "assignees": [
+                {
+                    "id": worker.id,
+                    "username": worker.username,
+                    "avatar": worker.avatar.url if worker.avatar else None,
+                }
+                for worker in task.assignees.all()
+            ],
+            "attachments": [
+                {"name": attachment.name, "url": attachment.file.url}
+                for attachment in task.attachments.all()
+            ],
+        }
+
+
+class SearchView(LoginRequiredMixin, generic.View):
+    """Ranked matches across projects, tasks and workers.
+
+    ``?q=`` is required; ``kind`` (repeatable) narrows the result types and
+    ``page`` walks the ranking.
+    """
+
+    per_page = 20
+
+    def get(self, request, *args, **kwargs):
+        form = SearchForm(request.GET)
+        if not form.is_valid():
+            return JsonResponse({"errors": form.errors}, status=400)
+
+        page = form.cleaned_data["page"]
+        entries, has_next = search.search(
+            form.cleaned_data["q"],
+            kinds=form.cleaned_data["kind"],
+            page=page,
+            per_page=self.per_page,
+        )
+        return JsonResponse(
+            {
+                "page": page,
+                "next_page": page + 1 if has_next else None,
+                "results": [self.serialize(entry) for entry in entries],
+            }
+        )
+
+    @staticmethod
+    def serialize(entry):
+        if entry.kind == SearchEntry.WORKER:
+            url = reverse("board:worker-detail", args=[entry.object_id])
+        elif entry.project_id:
+            url = reverse("board:project-detail", args=[entry.project_id])
+        else:
+            url = None
+        return {
+            "kind": entry.kind,
+            "id": entry.object_id,
+            "title": entry.title,
+            "snippet": Truncator(entry.body).chars(200),
+            "rank": entry.rank,
+            "url": url,
+        }
+
+
+class TaskListView(
+    LoginRequiredMixin, CursorPaginationMixin, generic.ListView
+):
+    """Tasks across every project, filtered and ordered by deadline.
+
+    Pages are keyset-paginated on ``(deadline, id)`` with an opaque
+    ``?cursor=``, so a deep page costs the same as the first one.
+    """
 
-class TaskListView(LoginRequiredMixin, generic.DetailView):
     model = Task
-    paginate_by = 10
+    paginate_by = 25
+    ordering = ("deadline", "id")
+
+    @cached_property
+    def filter_form(self):
+        return TaskFilterForm(self.request.GET or None)
+
+    def get_queryset(self):
+        tasks = Task.objects.select_related(
+            "board__project", "task_type"
+        ).prefetch_related(
+            Prefetch(
+                "assignees",
+                queryset=get_user_model().objects.only(
+                    "id", "username", "avatar"
+                ),
+            )
+        )
+        if not self.filter_form.is_bound:
+            return tasks
+        if not self.filter_form.is_valid():
+            return tasks.none()
+        return self.filter_form.filter_queryset(tasks)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["filter_form"] = self.filter_form
+        return context
 
 
 class TaskDeleteView(
-    LoginRequiredMixin, UserPassesTestMixin, generic.DeleteView
+    LoginRequiredMixin,
+    ProjectEditorRequiredMixin,
+    CachedObjectMixin,
+    generic.DeleteView,
 ):
     model = Task
 
@@ -403,16 +1143,14 @@ class TaskDeleteView(
         "Only the team members of the project can delete it."
     )
 
-    def test_func(self):
-        user = self.request.user
-        task = self.get_object()
-        return (
-            user in task.board.project.team.members.all()
-            or user == task.board.project.owner
-        )
+    def get_queryset(self):
+        return Task.objects.select_related("board")
+
+    def get_project_id(self):
+        return self.get_object().board.project_id
 
     def get_success_url(self):
-        project_id = self.object.board.project.id
+        project_id = self.object.board.project_id
         return reverse_lazy("board:project-detail", kwargs={"pk": project_id})
 
     def handle_no_permission(self):
@@ -421,7 +1159,10 @@ class TaskDeleteView(
 
 
 class TaskUpdateView(
-    LoginRequiredMixin, UserPassesTestMixin, generic.UpdateView
+    LoginRequiredMixin,
+    ProjectEditorRequiredMixin,
+    CachedObjectMixin,
+    generic.UpdateView,
 ):
     model = Task
     form_class = TaskForm
@@ -431,16 +1172,14 @@ class TaskUpdateView(
         "Only the team members of the project can edit it."
     )
 
-    def test_func(self):
-        user = self.request.user
-        task = self.get_object()
-        return (
-            user in task.board.project.team.members.all()
-            or user == task.board.project.owner
-        )
+    def get_queryset(self):
+        return Task.objects.select_related("board")
+
+    def get_project_id(self):
+        return self.get_object().board.project_id
 
     def get_success_url(self):
-        project_id = self.object.board.project.id
+        project_id = self.object.board.project_id
         return reverse_lazy("board:project-detail", kwargs={"pk": project_id})
 
     def handle_no_permission(self):
@@ -448,7 +1187,7 @@ class TaskUpdateView(
         return redirect(
             reverse(
                 "board:project-detail",
-                kwargs={"pk": self.get_object().board.project.id},
+                kwargs={"pk": self.get_object().board.project_id},
             )
         )
 
@@ -459,13 +1198,16 @@ class TaskUpdateView(
             initial["board"] = board_id
 
         if self.object:
-            initial["board"] = self.object.board.id
+            initial["board"] = self.object.board_id
 
         return initial
 
 
 class TaskChangeBoardView(
-    LoginRequiredMixin, UserPassesTestMixin, generic.UpdateView
+    LoginRequiredMixin,
+    ProjectEditorRequiredMixin,
+    CachedObjectMixin,
+    generic.UpdateView,
 ):
     model = Task
     form_class = TaskChangeBoardForm
@@ -475,16 +1217,14 @@ class TaskChangeBoardView(
         "Only the team members of the project can edit it."
     )
 
-    def test_func(self):
-        user = self.request.user
-        task = self.get_object()
-        return (
-            user in task.board.project.team.members.all()
-            or user == task.board.project.owner
-        )
+    def get_queryset(self):
+        return Task.objects.select_related("board")
+
+    def get_project_id(self):
+        return self.get_object().board.project_id
 
     def get_success_url(self):
-        project_id = self.object.board.project.id
+        project_id = self.object.board.project_id
         return reverse_lazy("board:project-detail", kwargs={"pk": project_id})
 
     def handle_no_permission(self):
@@ -492,18 +1232,102 @@ class TaskChangeBoardView(
         return redirect(
             reverse(
                 "board:project-detail",
-                kwargs={"pk": self.get_object().board.project.id},
+                kwargs={"pk": self.get_object().board.project_id},
             )
         )
 
+    def form_valid(self, form):
+        if "board" in form.changed_data:
+            form.instance.position = Task.end_position(form.instance.board_id)
+        return super().form_valid(form)
+
     def get_initial(self):
         initial = super().get_initial()
-        task_id = self.kwargs.get("pk")
-        if task_id:
-            initial["project"] = Task.objects.get(pk=task_id).board.project.id
+        initial["project"] = self.object.board.project_id
         return initial
 
 
+class TaskReorderView(
+    LoginRequiredMixin, ProjectEditorRequiredMixin, generic.View
+):
+    http_method_names = ["post"]
+
+    error_message = (
+        "You are not allowed to edit this task. "
+        "Only the team members of the project can edit it."
+    )
+
+    @cached_property
+    def task(self):
+        return get_object_or_404(
+            Task.objects.select_related("board"), pk=self.kwargs["pk"]
+        )
+
+    def get_project_id(self):
+        return self.task.board.project_id
+
+    def handle_no_permission(self):
+        if not self.request.user.is_authenticated:
+            return super().handle_no_permission()
+        return JsonResponse({"error_message": self.error_message}, status=403)
+
+    def post(self, request, *args, **kwargs):
+        form = TaskReorderForm(request.POST, task=self.task)
+        if not form.is_valid():
+            return JsonResponse({"errors": form.errors}, status=400)
+
+        task = place_task(
+            self.task,
+            after=form.cleaned_data["after"],
+            before=form.cleaned_data["before"],
+        )
+        return JsonResponse(
+            {"board": task.board_id, "position": task.position}
+        )
+
+
+class TaskBulkView(LoginRequiredMixin, generic.View):
+    """Apply one action to up to ``bulk.MAX_TASKS`` tasks at once.
+
+    POST ``tasks`` (repeated), ``action`` and the action's argument:
+    ``board``, ``assignees`` (repeated) or ``priority``. The user must be
+    able to edit every project involved; nothing changes otherwise.
+    """
+
+    http_method_names = ["post"]
+
+    error_message = (
+        "You are not allowed to edit these tasks. "
+        "Only the team members of their projects can edit them."
+    )
+
+    def post(self, request, *args, **kwargs):
+        form = TaskBulkForm(request.POST)
+        if not form.is_valid():
+            return JsonResponse({"errors": form.errors}, status=400)
+
+        tasks = form.cleaned_data["tasks"]
+        project_ids = sorted({task.board.project_id for task in tasks})
+        if not all(can_edit_project(request, pk) for pk in project_ids):
+            return JsonResponse(
+                {"error_message": self.error_message}, status=403
+            )
+
+        changed = bulk.apply(
+            form.cleaned_data["action"],
+            tasks,
+            board=form.cleaned_data["board"],
+            assignees=form.cleaned_data["assignees"],
+            priority=form.cleaned_data["priority"],
+        )
+        return JsonResponse(
+            {
+                "action": form.cleaned_data["action"],
+                "changed": [task.pk for task in changed],
+            }
+        )
+
+
 class TeamCreateView(LoginRequiredMixin, generic.CreateView):
     model = Team
     form_class = TeamForm
@@ -535,7 +1359,7 @@ class TaskTypeUpdateView(LoginRequiredMixin, generic.UpdateView):
 
     def get_success_url(self):
         return reverse_lazy(
-            "board:task-type-detail", kwargs={"pk": self.object}
+            "board:task-type-detail", kwargs={"pk": self.object.pk}
         )
 
 
@@ -544,9 +1368,12 @@ class TaskTypeDeleteView(LoginRequiredMixin, generic.DeleteView):
     success_url = reverse_lazy("board:task-type-list")
 
 
-class TaskTypeListView(LoginRequiredMixin, generic.ListView):
+class TaskTypeListView(
+    LoginRequiredMixin, CursorPaginationMixin, generic.ListView
+):
     model = TaskType
     paginate_by = 10
+    ordering = ("id",)
 
 
 class PositionCreateView(LoginRequiredMixin, generic.CreateView):
@@ -570,6 +1397,9 @@ class PositionDeleteView(LoginRequiredMixin, generic.DeleteView):
     success_url = reverse_lazy("board:position-list")
 
 
-class PositionListView(LoginRequiredMixin, generic.ListView):
+class PositionListView(
+    LoginRequiredMixin, CursorPaginationMixin, generic.ListView
+):
     model = Position
     paginate_by = 10
+    ordering = ("name",)
@@ -11,5 +11,5 @@ python manage.py collectstatic --no-input
 # Apply any outstanding database migrations
 python manage.py migrate
 
-# Load initial data
-python manage.py loaddata initial_data.json
+# Load initial data, skipping rows that are already there
+python manage.py seed initial_data.json
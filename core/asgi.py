@@ -3,6 +3,10 @@ ASGI config for core project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Serve it with an ASGI server, e.g. ``uvicorn core.asgi:application``, so
+that the project event streams (``board:project-events``) run on the event
+loop instead of tying up a worker thread per open board.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.0/howto/deployment/asgi/
 """
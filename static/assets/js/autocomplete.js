@@ -0,0 +1,119 @@
+/*
+ * Autocomplete for <select multiple data-autocomplete-url>.
+ *
+ * The select only holds the chosen options and stays hidden; chips show
+ * them and a search box fetches candidates from the endpoint as you type.
+ */
+(function () {
+  "use strict";
+
+  function withQuery(url, query) {
+    const separator = url.indexOf("?") === -1 ? "?" : "&";
+    return url + separator + "q=" + encodeURIComponent(query);
+  }
+
+  function setup(select) {
+    const wrapper = document.createElement("div");
+    const chips = document.createElement("div");
+    const input = document.createElement("input");
+    const results = document.createElement("div");
+
+    wrapper.className = "autocomplete position-relative";
+    chips.className = "d-flex flex-wrap gap-2 mb-2";
+    input.type = "search";
+    input.className = "form-control";
+    input.placeholder = "Start typing a name";
+    input.autocomplete = "off";
+    results.className = "list-group position-absolute w-100 shadow";
+    results.style.zIndex = 1000;
+
+    select.style.display = "none";
+    select.parentNode.insertBefore(wrapper, select);
+    wrapper.append(chips, input, results, select);
+
+    function addChip(option) {
+      const chip = document.createElement("span");
+      const remove = document.createElement("button");
+      chip.className = "badge bg-gray-200 text-dark d-inline-flex align-items-center";
+      chip.textContent = option.textContent;
+      remove.type = "button";
+      remove.className = "btn-close ms-2";
+      remove.setAttribute("aria-label", "Remove");
+      remove.addEventListener("click", function () {
+        option.remove();
+        chip.remove();
+      });
+      chip.append(remove);
+      chips.append(chip);
+    }
+
+    function choose(worker) {
+      const value = String(worker.id);
+      const exists = Array.from(select.options).some(function (option) {
+        return option.value === value;
+      });
+      if (!exists) {
+        const option = new Option(worker.username, value, true, true);
+        select.append(option);
+        addChip(option);
+      }
+      input.value = "";
+      results.replaceChildren();
+    }
+
+    function show(workers) {
+      results.replaceChildren();
+      workers.forEach(function (worker) {
+        const item = document.createElement("button");
+        item.type = "button";
+        item.className = "list-group-item list-group-item-action";
+        item.textContent = worker.full_name
+          ? worker.full_name + " (" + worker.username + ")"
+          : worker.username;
+        item.addEventListener("click", function () {
+          choose(worker);
+        });
+        results.append(item);
+      });
+    }
+
+    let timer = null;
+    let latest = null;
+    input.addEventListener("input", function () {
+      clearTimeout(timer);
+      const query = input.value.trim();
+      if (!query) {
+        results.replaceChildren();
+        return;
+      }
+      timer = setTimeout(function () {
+        latest = query;
+        fetch(withQuery(select.dataset.autocompleteUrl, query), {
+          headers: { "X-Requested-With": "XMLHttpRequest" },
+        })
+          .then(function (response) {
+            return response.json();
+          })
+          .then(function (data) {
+            if (latest === query) {
+              show(data.results);
+            }
+          });
+      }, 200);
+    });
+
+    document.addEventListener("click", function (event) {
+      if (!wrapper.contains(event.target)) {
+        results.replaceChildren();
+      }
+    });
+
+    Array.from(select.selectedOptions).forEach(addChip);
+  }
+
+  document.addEventListener("DOMContentLoaded", function () {
+    document
+      .querySelectorAll("select[data-autocomplete-url]")
+      .forEach(setup);
+  });
+})();
@@ -0,0 +1,20 @@
+from datetime import date, timedelta
+
+from board.models import Project, Task
+
+
+def create_project(name, owner, days=7, **fields):
+    """A project due in ``days``; ``fields`` override the rest."""
+    fields.setdefault("description", "Description")
+    fields.setdefault("deadline", date.today() + timedelta(days=days))
+    return Project.objects.create(name=name, owner=owner, **fields)
+
+
+def create_task(name, board, task_type, days=1, **fields):
+    """An open task due in ``days``; ``fields`` override the rest."""
+    fields.setdefault("description", "Description")
+    fields.setdefault("deadline", date.today() + timedelta(days=days))
+    fields.setdefault("is_completed", False)
+    return Task.objects.create(
+        name=name, board=board, task_type=task_type, **fields
+    )
@@ -0,0 +1,81 @@
+from datetime import date, timedelta
+
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+
+from board.access import can_edit_project
+from board.models import Board, Project, Task, TaskType, Team, Worker
+
+
+class ProjectAccessTestCase(TestCase):
+    def setUp(self):
+        self.owner = Worker.objects.create(username="owner")
+        self.member = Worker.objects.create(username="member")
+        self.outsider = Worker.objects.create(username="outsider")
+        team = Team.objects.create(name="Development Team")
+        team.members.add(self.member)
+        self.project = Project.objects.create(
+            name="Test Project",
+            team=team,
+            description="Test description",
+            deadline=date.today() + timedelta(days=1),
+            owner=self.owner,
+        )
+        self.board = Board.objects.create(name="Board", project=self.project)
+        self.task = Task.objects.create(
+            name="Task",
+            board=self.board,
+            description="Description",
+            deadline=date.today() + timedelta(days=1),
+            is_completed=False,
+            task_type=TaskType.objects.create(name="Bug"),
+        )
+
+    def request_for(self, user):
+        request = RequestFactory().get("/")
+        request.user = user
+        return request
+
+    def test_owner_and_members_can_edit(self):
+        for user in (self.owner, self.member):
+            request = self.request_for(user)
+            self.assertTrue(can_edit_project(request, self.project.pk))
+        request = self.request_for(self.outsider)
+        self.assertFalse(can_edit_project(request, self.project.pk))
+
+    def test_answer_is_memoized_per_request(self):
+        request = self.request_for(self.member)
+        with self.assertNumQueries(1):
+            can_edit_project(request, self.project.pk)
+            can_edit_project(request, self.project.pk)
+        with self.assertNumQueries(1):
+            can_edit_project(self.request_for(self.member), self.project.pk)
+
+    def test_protected_writes_check_access_once(self):
+        self.client.force_login(self.member)
+        # Session, user, the task with its board, the access check, then
+        # the form's assignees and task type choices.
+        with self.assertNumQueries(6):
+            response = self.client.get(
+                reverse("board:task-update", args=[self.task.pk])
+            )
+        self.assertEqual(response.status_code, 200)
+
+    def test_outsider_is_turned_away(self):
+        self.client.force_login(self.outsider)
+        response = self.client.post(
+            reverse("board:task-delete", args=[self.task.pk])
+        )
+        self.assertEqual(response.status_code, 403)
+        self.assertTrue(Task.objects.filter(pk=self.task.pk).exists())
+
+        response = self.client.post(
+            reverse("board:board-create", args=[self.project.pk]),
+            {"name": "Sneaky"},
+        )
+        self.assertRedirects(
+            response,
+            reverse("board:project-detail", args=[self.project.pk]),
+            fetch_redirect_response=False,
+        )
+        self.assertFalse(self.project.boards.filter(name="Sneaky").exists())
@@ -0,0 +1,245 @@
+from datetime import date, timedelta
+
+from asgiref.sync import sync_to_async
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from board import activity
+from board.models import Activity, Board, Project, Task, TaskType, Team, Worker
+from board.ordering import place_task
+from tests.factories import create_project, create_task
+
+
+class ActivityRecordingTestCase(TestCase):
+    def setUp(self):
+        self.owner = Worker.objects.create(username="owner")
+        self.task_type = TaskType.objects.create(name="Bug")
+
+    def log(self):
+        return list(
+            Activity.objects.order_by("id").values_list("verb", "model")
+        )
+
+    def test_changes_are_logged_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            project = create_project("Project", self.owner)
+            todo = Board.objects.create(name="Todo", project=project)
+            done = Board.objects.create(name="Done", project=project)
+            task = create_task("Task", todo, self.task_type)
+            todo_id, done_id = todo.pk, done.pk
+            self.assertFalse(Activity.objects.exists())
+        with self.captureOnCommitCallbacks(execute=True):
+            place_task(task, after=create_task("Other", done, self.task_type))
+            task.delete()
+            todo.delete()
+
+        self.assertEqual(
+            self.log(),
+            [
+                ("created", "project"),
+                ("created", "board"),
+                ("created", "board"),
+                ("created", "task"),
+                ("created", "task"),
+                ("moved", "task"),
+                ("deleted", "task"),
+                ("deleted", "board"),
+            ],
+        )
+        move = Activity.objects.get(verb=Activity.MOVED)
+        self.assertEqual(move.project_id, project.pk)
+        self.assertEqual(
+            move.data,
+            {"name": "Task", "from_board": todo_id, "board": done_id},
+        )
+
+    def test_project_delete_logs_only_the_project(self):
+        project = create_project("Project", self.owner)
+        board = Board.objects.create(name="Todo", project=project)
+        create_task("Task", board, self.task_type)
+        with self.captureOnCommitCallbacks(execute=True):
+            project.delete()
+        self.assertEqual(self.log(), [("deleted", "project")])
+
+    def test_membership(self):
+        team = Team.objects.create(name="Team")
+        first = create_project("First", self.owner, team=team)
+        second = create_project("Second", self.owner, team=team)
+        worker = Worker.objects.create(username="worker")
+        with self.captureOnCommitCallbacks(execute=True):
+            team.members.add(worker)
+            worker.teams.clear()
+
+        entries = Activity.objects.filter(model=Activity.MEMBER)
+        self.assertEqual(
+            sorted(entries.values_list("project_id", "verb", "object_id")),
+            [
+                (first.pk, "joined", worker.pk),
+                (first.pk, "left", worker.pk),
+                (second.pk, "joined", worker.pk),
+                (second.pk, "left", worker.pk),
+            ],
+        )
+        self.assertEqual(entries.first().data, {"name": "worker"})
+
+    def test_deferred_attributes_and_writes_once(self):
+        request = type("Request", (), {"user": self.owner})()
+        with CaptureQueriesContext(connection) as queries:
+            with activity.deferred(request):
+                with self.captureOnCommitCallbacks(execute=True):
+                    create_project("One", self.owner)
+                    create_project("Two", self.owner)
+                self.assertFalse(Activity.objects.exists())
+        inserts = [
+            query
+            for query in queries
+            if query["sql"].startswith('INSERT INTO "board_activity"')
+        ]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(
+            set(Activity.objects.values_list("actor_id", flat=True)),
+            {self.owner.pk},
+        )
+
+
+class ActivityTransactionTestCase(TransactionTestCase):
+    def test_rolled_back_changes_leave_no_entries(self):
+        owner = Worker.objects.create(username="owner")
+        try:
+            with transaction.atomic():
+                create_project("Project", owner)
+                raise ValueError
+        except ValueError:
+            pass
+        self.assertFalse(Activity.objects.exists())
+
+        create_project("Kept", owner)
+        self.assertEqual(Activity.objects.count(), 1)
+
+    def test_transaction_writes_its_entries_in_one_insert(self):
+        owner = Worker.objects.create(username="owner")
+        with CaptureQueriesContext(connection) as queries:
+            with transaction.atomic():
+                create_project("One", owner)
+                try:
+                    with transaction.atomic():
+                        create_project("Undone", owner)
+                        raise ValueError
+                except ValueError:
+                    pass
+                create_project("Two", owner)
+                self.assertFalse(Activity.objects.exists())
+        inserts = [
+            query
+            for query in queries
+            if query["sql"].startswith('INSERT INTO "board_activity"')
+        ]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(
+            sorted(entry.data["name"] for entry in Activity.objects.all()),
+            ["One", "Two"],
+        )
+
+    def create_team(self):
+        owner = Worker.objects.create(username="owner")
+        team = Team.objects.create(name="Team")
+        project = create_project("Project", owner, team=team)
+        members = [Worker.objects.create(username=f"m{i}") for i in range(3)]
+        Activity.objects.all().delete()
+        return owner, team, project, members
+
+    def logged(self, project):
+        return list(
+            Activity.objects.filter(project=project)
+            .order_by("object_id")
+            .values_list("verb", "object_id", "actor_id")
+        )
+
+    def test_request_writes_its_entries_in_one_insert(self):
+        owner, team, project, members = self.create_team()
+
+        self.client.force_login(owner)
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(
+                reverse("board:team-update", args=[team.pk]),
+                {"name": "Team", "members": [worker.pk for worker in members]},
+            )
+        inserts = [
+            query
+            for query in queries
+            if query["sql"].startswith('INSERT INTO "board_activity"')
+        ]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(
+            self.logged(project),
+            [("joined", worker.pk, owner.pk) for worker in members],
+        )
+
+    async def test_asgi_request_attributes_its_entries(self):
+        owner, team, project, members = await sync_to_async(self.create_team)()
+
+        await self.async_client.aforce_login(owner)
+        await self.async_client.post(
+            reverse("board:team-update", args=[team.pk]),
+            {"name": "Team", "members": [worker.pk for worker in members]},
+        )
+        self.assertEqual(
+            await sync_to_async(self.logged)(project),
+            [("joined", worker.pk, owner.pk) for worker in members],
+        )
+
+
+class ActivityFeedTestCase(TestCase):
+    def setUp(self):
+        self.owner = Worker.objects.create(username="owner")
+        self.project = create_project("Project", self.owner)
+        self.client.force_login(self.owner)
+
+    def add_entries(self, count, project_id=None):
+        Activity.objects.bulk_create(
+            Activity(
+                project_id=project_id or self.project.pk,
+                actor=self.owner,
+                verb=Activity.UPDATED,
+                model=Activity.TASK,
+                object_id=i,
+                data={"name": f"Task {i}"},
+            )
+            for i in range(count)
+        )
+
+    def test_project_feed_pages_newest_first(self):
+        self.add_entries(60)
+        url = reverse("board:project-activity", args=[self.project.pk])
+        response = self.client.get(url)
+        entries = list(response.context["activity_list"])
+        self.assertEqual(len(entries), 50)
+        self.assertEqual(entries[0].object_id, 59)
+        self.assertContains(response, "Task 59")
+
+        cursor = response.context["page_obj"].next_cursor
+        response = self.client.get(url, {"cursor": cursor})
+        self.assertEqual(
+            [entry.object_id for entry in response.context["activity_list"]],
+            list(range(9, -1, -1)),
+        )
+
+    def test_worker_feed_keeps_deleted_projects(self):
+        self.add_entries(2)
+        self.add_entries(1, project_id=self.project.pk + 1000)
+        url = reverse("board:worker-activity", args=[self.owner.pk])
+        # Session, user, the page, its projects, the worker.
+        with self.assertNumQueries(5):
+            response = self.client.get(url)
+        self.assertEqual(len(response.context["activity_list"]), 3)
+        self.assertContains(
+            response,
+            reverse("board:project-detail", args=[self.project.pk]),
+            count=2,
+        )
+
+    def test_unknown_project(self):
+        url = reverse("board:project-activity", args=[self.project.pk + 1])
+        self.assertEqual(self.client.get(url).status_code, 404)
@@ -0,0 +1,80 @@
+from datetime import date, timedelta
+
+from django.test import TestCase
+from django.urls import reverse
+
+from board.forms import TaskForm, TeamForm
+from board.models import Board, Project, Team, Worker
+
+
+class WorkerAutocompleteTestCase(TestCase):
+    def setUp(self):
+        self.jane = Worker.objects.create(
+            username="jdoe", first_name="Jane", last_name="Doe"
+        )
+        self.john = Worker.objects.create(
+            username="jsmith", first_name="John", last_name="Smith"
+        )
+        self.ann = Worker.objects.create(
+            username="ann", first_name="Ann", last_name="Jones"
+        )
+        team = Team.objects.create(name="Team")
+        team.members.add(self.jane, self.ann)
+        self.project = Project.objects.create(
+            name="Project",
+            team=team,
+            description="Description",
+            deadline=date.today() + timedelta(days=1),
+            owner=self.jane,
+        )
+        self.board = Board.objects.create(name="Board", project=self.project)
+        self.client.force_login(self.jane)
+
+    def usernames(self, **params):
+        response = self.client.get(
+            reverse("board:worker-autocomplete"), params
+        )
+        return [worker["username"] for worker in response.json()["results"]]
+
+    def test_matches_any_name_by_prefix(self):
+        self.assertEqual(self.usernames(q="J"), ["ann", "jdoe", "jsmith"])
+        self.assertEqual(self.usernames(q="smi"), ["jsmith"])
+        self.assertEqual(self.usernames(q="jane d"), ["jdoe"])
+        self.assertEqual(self.usernames(q=""), [])
+
+    def test_limits_to_the_project_team(self):
+        self.assertEqual(
+            self.usernames(q="j", board=self.board.pk), ["ann", "jdoe"]
+        )
+        self.assertEqual(
+            self.usernames(q="j", project=self.project.pk), ["ann", "jdoe"]
+        )
+        response = self.client.get(
+            reverse("board:worker-autocomplete"), {"q": "j", "board": "x"}
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_widgets_render_only_chosen_workers(self):
+        Worker.objects.bulk_create(
+            [Worker(username=f"worker-{i}") for i in range(50)]
+        )
+        form = TeamForm(initial={"members": [self.john.pk]})
+        with self.assertNumQueries(1):
+            html = str(form["members"])
+        self.assertIn("jsmith", html)
+        self.assertNotIn("worker-", html)
+        self.assertIn(reverse("board:worker-autocomplete"), html)
+
+    def test_task_form_searches_the_board_team(self):
+        form = TaskForm(initial={"board": self.board.pk})
+        self.assertIn(f"board={self.board.pk}", str(form["assignees"]))
+        self.assertEqual(
+            set(form.fields["assignees"].queryset),
+            {self.jane, self.ann},
+        )
+
+    def test_submitted_ids_are_validated(self):
+        form = TeamForm({"name": "Team 2", "members": [self.john.pk, 0]})
+        self.assertFalse(form.is_valid())
+        self.assertIn("members", form.errors)
+        self.assertIn("jsmith", str(form["members"]))
@@ -0,0 +1,128 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from board import benchmarks
+from board.counters import find_drift
+from board.models import Project, Task, TaskType
+from board.synthetic import Generator, Sizes
+
+
+class BenchmarksTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Generator(
+            Sizes(workers=10, teams=3, projects=3, boards=2, tasks=6, skew=0)
+        ).run()
+
+    def test_every_route_is_covered(self):
+        self.assertEqual(benchmarks.uncovered(), [])
+
+    def test_run_leaves_the_data_alone(self):
+        before = list(
+            Project.objects.order_by("pk").values_list("name", "task_count")
+        )
+        tasks = Task.objects.count()
+
+        results = benchmarks.run(repeat=1)
+
+        self.assertEqual(
+            list(results),
+            [scenario.label for scenario in benchmarks.SCENARIOS],
+        )
+        self.assertEqual(
+            {
+                label: result["status"]
+                for label, result in results.items()
+                if result["status"] >= 400
+            },
+            {},
+        )
+        self.assertEqual(results["project-detail"]["status"], 200)
+        self.assertEqual(results["task-create POST"]["status"], 302)
+        self.assertEqual(results["task-bulk POST"]["status"], 200)
+        self.assertGreater(results["project-export"]["bytes"], 0)
+        self.assertGreater(results["project-detail"]["queries"], 0)
+        self.assertEqual(
+            list(
+                Project.objects.order_by("pk").values_list(
+                    "name", "task_count"
+                )
+            ),
+            before,
+        )
+        self.assertEqual(Task.objects.count(), tasks)
+        self.assertFalse(TaskType.objects.filter(name="Spare").exists())
+        self.assertEqual(find_drift(), [])
+
+    def test_compare(self):
+        baseline = {
+            "fast": {"status": 200, "wall_ms": 1.0, "queries": 3},
+            "slow": {"status": 200, "wall_ms": 100.0, "queries": 3},
+            "gone": {"status": 200, "wall_ms": 1.0, "queries": 3},
+        }
+        results = {
+            "fast": {"status": 200, "wall_ms": 1.5, "queries": 3},
+            "slow": {"status": 500, "wall_ms": 130.0, "queries": 5},
+        }
+        self.assertEqual(
+            benchmarks.compare(baseline, results),
+            [
+                "slow: status 200 -> 500",
+                "slow: 3 -> 5 queries",
+                "slow: 100.0 -> 130.0ms",
+            ],
+        )
+        self.assertEqual(
+            benchmarks.compare(
+                baseline, results, max_slowdown=2, max_extra_queries=2
+            ),
+            ["slow: status 200 -> 500"],
+        )
+
+
+class BenchmarkRoutesCommandTestCase(TestCase):
+    def call(self, *args):
+        out = StringIO()
+        call_command(
+            "benchmark_routes",
+            "--workers=5",
+            "--projects=2",
+            "--tasks=4",
+            "--repeat=1",
+            "--route=project-detail",
+            *args,
+            stdout=out,
+        )
+        return out.getvalue()
+
+    def test_results_and_baseline(self):
+        with tempfile.NamedTemporaryFile("r", suffix=".json") as file:
+            self.assertIn("project-detail", self.call(f"--output={file.name}"))
+            saved = json.load(file)
+        self.assertEqual(saved["dataset"]["projects"], 2)
+        self.assertEqual(
+            set(saved["routes"]["project-detail"]),
+            {"status", "wall_ms", "queries", "sql_ms", "bytes"},
+        )
+        self.assertFalse(Project.objects.exists(), "the dataset is dropped")
+
+        saved["routes"]["project-detail"]["queries"] = 1
+        saved["routes"]["project-detail"]["wall_ms"] = 10_000
+        with tempfile.NamedTemporaryFile(
+            "w", suffix=".json", delete=False
+        ) as file:
+            json.dump(saved, file)
+        self.addCleanup(os.remove, file.name)
+        with self.assertRaisesMessage(CommandError, "project-detail: 1 ->"):
+            self.call(f"--baseline={file.name}")
+
+        saved["dataset"]["projects"] = 3
+        with open(file.name, "w") as baseline:
+            json.dump(saved, baseline)
+        with self.assertRaisesMessage(CommandError, "different dataset"):
+            self.call(f"--baseline={file.name}")
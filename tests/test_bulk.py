@@ -0,0 +1,183 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from board.counters import find_drift
+from board.models import (
+    Activity,
+    Board,
+    SearchEntry,
+    SiteCounters,
+    Task,
+    TaskType,
+    Team,
+    Tombstone,
+    Worker,
+)
+from tests.factories import create_project, create_task
+
+
+class TaskBulkViewTestCase(TestCase):
+    url = reverse("board:task-bulk")
+
+    def setUp(self):
+        SiteCounters.rebuild()
+        self.owner = Worker.objects.create(username="owner")
+        self.worker = Worker.objects.create(username="worker")
+        self.project = self.create_project("Project", self.owner)
+        self.todo = Board.objects.create(name="Todo", project=self.project)
+        self.done = Board.objects.create(name="Done", project=self.project)
+        self.task_type = TaskType.objects.create(name="Bug")
+        self.tasks = [self.create_task(f"Task {i}") for i in range(3)]
+        self.client.force_login(self.owner)
+
+    def create_project(self, name, owner):
+        team = Team.objects.create(name=f"{name} team")
+        return create_project(name, owner, team=team)
+
+    def create_task(self, name, board=None, **fields):
+        return create_task(name, board or self.todo, self.task_type, **fields)
+
+    def post(self, action, tasks=None, **data):
+        tasks = self.tasks if tasks is None else tasks
+        return self.client.post(
+            self.url,
+            {"action": action, "tasks": [task.pk for task in tasks], **data},
+        )
+
+    def version(self):
+        self.project.refresh_from_db(fields=["sync_version"])
+        return self.project.sync_version
+
+    def test_move_appends_to_the_board(self):
+        last = self.create_task("Last", board=self.done)
+        version = self.version()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.post("move", board=self.done.pk)
+
+        self.assertEqual(
+            response.json(),
+            {"action": "move", "changed": [task.pk for task in self.tasks]},
+        )
+        self.assertEqual(
+            list(
+                self.done.tasks.order_by(*Task.COLUMN_ORDERING).values_list(
+                    "pk", flat=True
+                )
+            ),
+            [last.pk, *(task.pk for task in self.tasks)],
+        )
+        self.assertEqual(find_drift(), [])
+        self.assertGreater(self.version(), version)
+        self.assertEqual(
+            Activity.objects.filter(verb=Activity.MOVED).count(), 3
+        )
+
+    def test_complete_and_incomplete(self):
+        self.tasks[0].is_completed = True
+        self.tasks[0].save()
+
+        response = self.post("complete")
+        self.assertEqual(
+            response.json()["changed"], [self.tasks[1].pk, self.tasks[2].pk]
+        )
+        self.assertEqual(Task.objects.filter(is_completed=True).count(), 3)
+        self.assertEqual(find_drift(), [])
+
+        self.post("incomplete", tasks=self.tasks[:1])
+        self.assertEqual(Task.objects.filter(is_completed=True).count(), 2)
+        self.assertEqual(find_drift(), [])
+
+    def test_priority(self):
+        version = self.version()
+        self.post("priority", priority=Task.URGENT)
+        self.assertEqual(Task.objects.filter(priority=Task.URGENT).count(), 3)
+        self.assertGreater(self.version(), version)
+
+    def test_add_and_remove_assignees(self):
+        self.project.team.members.add(self.worker, self.owner)
+        self.tasks[0].assignees.add(self.worker)
+        self.post("add_assignees", assignees=[self.worker.pk, self.owner.pk])
+        for task in self.tasks:
+            self.assertEqual(
+                set(task.assignees.all()), {self.worker, self.owner}
+            )
+
+        self.post("remove_assignees", assignees=[self.worker.pk])
+        for task in self.tasks:
+            self.assertEqual(list(task.assignees.all()), [self.owner])
+
+    def test_delete(self):
+        self.tasks[0].assignees.add(self.worker)
+        task_ids = [task.pk for task in self.tasks]
+        kept = self.create_task("Kept", is_completed=True)
+
+        self.post("delete")
+
+        self.assertEqual(list(Task.objects.all()), [kept])
+        self.assertEqual(find_drift(), [])
+        self.assertEqual(SiteCounters.load().tasks, 1)
+        self.assertEqual(
+            sorted(
+                Tombstone.objects.filter(model=Tombstone.TASK).values_list(
+                    "object_id", flat=True
+                )
+            ),
+            task_ids,
+        )
+        self.assertFalse(
+            SearchEntry.objects.filter(
+                kind=SearchEntry.TASK, object_id__in=task_ids
+            ).exists()
+        )
+        self.assertFalse(self.worker.tasks.exists())
+
+    def test_queries_do_not_grow_with_tasks(self):
+        def count_queries(tasks):
+            with CaptureQueriesContext(connection) as context:
+                self.post("priority", tasks=tasks, priority=Task.URGENT)
+            Task.objects.update(priority=Task.HIGH)
+            return len(context)
+
+        few = count_queries(self.tasks[:1])
+        many = count_queries(
+            self.tasks + [self.create_task(f"More {i}") for i in range(20)]
+        )
+        self.assertEqual(few, many)
+
+    def test_requires_edit_rights_on_every_project(self):
+        other = self.create_project("Other", self.worker)
+        board = Board.objects.create(name="Todo", project=other)
+        foreign = self.create_task("Foreign", board=board)
+
+        response = self.post("complete", tasks=[*self.tasks, foreign])
+
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(Task.objects.filter(is_completed=True).exists())
+
+    def test_validation(self):
+        other = self.create_project("Other", self.owner)
+        foreign = Board.objects.create(name="Todo", project=other)
+        for data, field in [
+            ({"action": "move"}, "board"),
+            ({"action": "move", "board": foreign.pk}, "board"),
+            ({"action": "add_assignees"}, "assignees"),
+            (
+                {"action": "add_assignees", "assignees": [self.worker.pk]},
+                "assignees",
+            ),
+            ({"action": "priority"}, "priority"),
+            ({"action": "archive"}, "action"),
+        ]:
+            with self.subTest(**data):
+                response = self.post(**data)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn(field, response.json()["errors"])
+
+        response = self.client.post(self.url, {"action": "complete"})
+        self.assertIn("tasks", response.json()["errors"])
+
+    def test_only_post(self):
+        self.assertEqual(self.client.get(self.url).status_code, 405)
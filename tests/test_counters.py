@@ -0,0 +1,112 @@
+from datetime import date, timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from board.models import (
+    Board,
+    Project,
+    SiteCounters,
+    Task,
+    TaskType,
+    Worker,
+)
+from tests.factories import create_project
+
+
+class SiteCountersTestCase(TestCase):
+    def setUp(self):
+        SiteCounters.rebuild()
+        self.owner = Worker.objects.create(username="owner")
+
+    def create_project(self, name, **fields):
+        return create_project(name, self.owner, days=1, **fields)
+
+    def totals(self):
+        counters = SiteCounters.load()
+        return (
+            counters.projects,
+            counters.active_projects,
+            counters.tasks,
+            counters.users,
+        )
+
+    def assertMatchesTables(self):
+        expected = (
+            Project.objects.count(),
+            Project.objects.filter(is_completed=False).count(),
+            Task.objects.count(),
+            Worker.objects.count(),
+        )
+        self.assertEqual(self.totals(), expected)
+
+    def test_signals_follow_creates_updates_and_deletes(self):
+        project = self.create_project("Active")
+        self.create_project("Done", is_completed=True)
+        board = Board.objects.create(name="Board", project=project)
+        task_type = TaskType.objects.create(name="Bug")
+        for name in ("A", "B"):
+            Task.objects.create(
+                name=name,
+                board=board,
+                description="Description",
+                deadline=date.today() + timedelta(days=1),
+                is_completed=False,
+                task_type=task_type,
+            )
+        self.assertEqual(self.totals(), (2, 1, 2, 1))
+
+        project.is_completed = True
+        project.save()
+        self.assertEqual(self.totals(), (2, 0, 2, 1))
+
+        Project.objects.get(name="Done").delete()
+        project.delete()
+        self.assertMatchesTables()
+
+        self.owner.delete()
+        self.assertEqual(self.totals(), (0, 0, 0, 0))
+
+    def test_cascaded_deletes_count_tasks_at_once(self):
+        project = self.create_project("Active")
+        task_type = TaskType.objects.create(name="Bug")
+        boards = []
+        for board_name in ("Todo", "Done"):
+            board = Board.objects.create(name=board_name, project=project)
+            for name in ("A", "B", "C"):
+                Task.objects.create(
+                    name=name,
+                    board=board,
+                    description="Description",
+                    deadline=date.today() + timedelta(days=1),
+                    is_completed=False,
+                    task_type=task_type,
+                )
+            boards.append(board)
+
+        boards[0].delete()
+        self.assertMatchesTables()
+        project.delete()
+        self.assertMatchesTables()
+
+    def test_rebuild_repairs_writes_that_skip_signals(self):
+        Worker.objects.bulk_create(
+            [Worker(username=f"bulk-{i}") for i in range(3)]
+        )
+        self.assertEqual(self.totals()[3], 1)
+        call_command("rebuild_counters", stdout=StringIO())
+        self.assertMatchesTables()
+
+    def test_missing_row_is_rebuilt_on_read(self):
+        SiteCounters.objects.all().delete()
+        self.create_project("Active")
+        self.assertMatchesTables()
+
+    def test_index_reads_one_row(self):
+        self.create_project("Active")
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("board:index"))
+        self.assertEqual(response.context["count_of_projects"], 1)
+        self.assertEqual(response.context["count_of_users"], 1)
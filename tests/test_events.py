@@ -0,0 +1,134 @@
+import asyncio
+import json
+
+from django.test import RequestFactory, TestCase
+
+from board.events import LocalBroker, get_broker
+from board.models import Board, TaskType, Team, Worker
+from board.views import project_events
+from tests.factories import create_project, create_task
+
+
+class LocalBrokerTestCase(TestCase):
+    def test_delivers_only_to_project_subscribers(self):
+        broker = LocalBroker()
+
+        async def scenario():
+            subscription = broker.subscribe(1)
+            other = broker.subscribe(2)
+            broker.publish(1, {"type": "task.created", "task": 7})
+            event = await subscription.get(timeout=1)
+            missed = await other.get(timeout=0.01)
+            subscription.close()
+            other.close()
+            return event, missed
+
+        event, missed = asyncio.run(scenario())
+        self.assertEqual(event, {"type": "task.created", "task": 7})
+        self.assertIsNone(missed)
+        self.assertEqual(broker._subscriptions, {})
+
+    def test_overflow_turns_into_resync(self):
+        broker = LocalBroker()
+
+        async def scenario():
+            subscription = broker.subscribe(1)
+            for task in range(subscription.max_pending + 1):
+                broker.publish(1, {"type": "task.updated", "task": task})
+            await asyncio.sleep(0)
+            return await subscription.get(timeout=1)
+
+        self.assertEqual(asyncio.run(scenario()), {"type": "resync"})
+
+
+class TaskEventsTestCase(TestCase):
+    def setUp(self):
+        self.user = Worker.objects.create(username="owner")
+        self.project = create_project(
+            "Test Project",
+            self.user,
+            days=1,
+            team=Team.objects.create(name="Development Team"),
+        )
+        self.board = Board.objects.create(name="Board", project=self.project)
+        self.other_board = Board.objects.create(
+            name="Other", project=self.project
+        )
+        self.task_type = TaskType.objects.create(name="Bug")
+        self.loop = asyncio.new_event_loop()
+        self.subscription = self.loop.run_until_complete(self.subscribe())
+
+    def tearDown(self):
+        self.subscription.close()
+        self.loop.close()
+
+    async def subscribe(self):
+        return get_broker().subscribe(self.project.pk)
+
+    def next_event(self):
+        return self.loop.run_until_complete(self.subscription.get(timeout=1))
+
+    def create_task(self):
+        return create_task("Task", self.board, self.task_type)
+
+    def test_task_lifecycle_events(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            task = self.create_task()
+        created = self.next_event()
+        self.assertEqual(created["type"], "task.created")
+        self.assertEqual(created["board"], self.board.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            task.name = "Renamed"
+            task.save()
+        self.assertEqual(self.next_event()["type"], "task.updated")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            task.board = self.other_board
+            task.save()
+        moved = self.next_event()
+        self.assertEqual(moved["type"], "task.moved")
+        self.assertEqual(moved["from_board"], self.board.pk)
+        self.assertEqual(moved["board"], self.other_board.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            task.delete()
+        self.assertEqual(self.next_event()["type"], "task.deleted")
+
+    def test_nothing_is_published_before_commit(self):
+        with self.captureOnCommitCallbacks(execute=False):
+            self.create_task()
+        self.assertIsNone(
+            self.loop.run_until_complete(self.subscription.get(timeout=0.01))
+        )
+
+
+class ProjectEventsViewTestCase(TestCase):
+    def setUp(self):
+        self.user = Worker.objects.create(username="owner")
+        self.project = create_project("Test Project", self.user, days=1)
+
+    async def test_streams_published_events(self):
+        request = RequestFactory().get("/")
+
+        async def auser():
+            return self.user
+
+        request.auser = auser
+        response = await project_events(request, self.project.pk)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+
+        content = aiter(response.streaming_content)
+        self.assertEqual(await anext(content), b"retry: 3000\n\n")
+        reader = asyncio.ensure_future(anext(content))
+        await asyncio.sleep(0)
+        get_broker().publish(self.project.pk, {"type": "task.deleted"})
+        chunk = await reader
+        await content.aclose()
+
+        event_line, data_line = chunk.decode().strip().split("\n")
+        self.assertEqual(event_line, "event: task.deleted")
+        self.assertEqual(
+            json.loads(data_line.removeprefix("data: ")),
+            {"type": "task.deleted"},
+        )
@@ -0,0 +1,141 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from board.models import Board, Task, TaskType, Team, Worker
+from board.ordering import place_task
+from tests.factories import create_project, create_task
+
+
+class TaskOrderingTestCase(TestCase):
+    def setUp(self):
+        self.user = Worker.objects.create(username="owner")
+        self.team = Team.objects.create(name="Development Team")
+        self.team.members.add(self.user)
+        self.project = create_project(
+            "Test Project", self.user, days=1, team=self.team
+        )
+        self.board = Board.objects.create(name="Board", project=self.project)
+        self.task_type = TaskType.objects.create(name="Bug")
+        self.tasks = [self.create_task(f"Task {i}") for i in range(3)]
+
+    def create_task(self, name, board=None):
+        return create_task(name, board or self.board, self.task_type)
+
+    def column(self, board=None):
+        return list(
+            (board or self.board)
+            .tasks.order_by(*Task.COLUMN_ORDERING)
+            .values_list("name", flat=True)
+        )
+
+    def test_new_tasks_are_appended(self):
+        self.assertEqual(self.column(), ["Task 0", "Task 1", "Task 2"])
+        positions = [task.position for task in self.tasks]
+        self.assertEqual(positions, sorted(positions))
+
+    def test_place_between_neighbours_updates_one_row(self):
+        first, second, third = self.tasks
+        with CaptureQueriesContext(connection) as context:
+            place_task(third, after=first, before=second)
+        task_queries = [
+            query["sql"]
+            for query in context.captured_queries
+            if '"board_task"' in query["sql"]
+        ]
+        self.assertEqual(len(task_queries), 1)
+        self.assertTrue(task_queries[0].startswith("UPDATE"))
+        self.assertEqual(self.column(), ["Task 0", "Task 2", "Task 1"])
+
+    def test_place_after_last_and_before_first(self):
+        first, second, third = self.tasks
+        place_task(first, after=third)
+        self.assertEqual(self.column(), ["Task 1", "Task 2", "Task 0"])
+        place_task(first, before=second)
+        self.assertEqual(self.column(), ["Task 0", "Task 1", "Task 2"])
+
+    def test_rebalances_when_gap_is_exhausted(self):
+        first, second, third = self.tasks
+        Task.objects.filter(pk=second.pk).update(position=first.position + 1)
+        second.refresh_from_db()
+        place_task(third, after=first, before=second)
+        self.assertEqual(self.column(), ["Task 0", "Task 2", "Task 1"])
+        positions = list(
+            self.board.tasks.order_by("position").values_list(
+                "position", flat=True
+            )
+        )
+        self.assertTrue(
+            all(b - a > 1 for a, b in zip(positions, positions[1:]))
+        )
+
+    def test_rebalance_is_visible_to_delta_sync(self):
+        first, second, third = self.tasks
+        Task.objects.filter(pk=second.pk).update(position=first.position + 1)
+        self.project.refresh_from_db()
+        since = self.project.sync_version
+        self.client.force_login(self.user)
+        self.client.post(
+            reverse("board:task-reorder", args=[third.pk]),
+            {"after": first.pk, "before": second.pk},
+        )
+
+        response = self.client.get(
+            reverse("board:project-changes", args=[self.project.pk]),
+            {"since": since},
+        )
+        changed = {
+            task["id"]: task["position"] for task in response.json()["tasks"]
+        }
+        self.assertEqual(
+            changed,
+            dict(
+                self.board.tasks.filter(
+                    pk__in=[second.pk, third.pk]
+                ).values_list("pk", "position")
+            ),
+        )
+        self.assertEqual(changed[second.pk], 2 * Task.POSITION_GAP)
+
+    def test_place_on_another_board(self):
+        other = Board.objects.create(name="Other", project=self.project)
+        target = self.create_task("Other task", board=other)
+        place_task(self.tasks[0], before=target)
+        self.assertEqual(self.column(other), ["Task 0", "Other task"])
+
+    def test_reorder_endpoint(self):
+        self.client.force_login(self.user)
+        first, second, third = self.tasks
+        response = self.client.post(
+            reverse("board:task-reorder", args=[third.pk]),
+            {"after": first.pk, "before": second.pk},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.column(), ["Task 0", "Task 2", "Task 1"])
+
+    def test_reorder_endpoint_rejects_inverted_neighbours(self):
+        self.client.force_login(self.user)
+        first, second, third = self.tasks
+        response = self.client.post(
+            reverse("board:task-reorder", args=[third.pk]),
+            {"after": second.pk, "before": first.pk},
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_rebalance_command(self):
+        Task.objects.filter(pk=self.tasks[1].pk).update(
+            position=self.tasks[0].position + 1
+        )
+        call_command("rebalance_tasks", stdout=StringIO())
+        positions = list(
+            self.board.tasks.order_by("position").values_list(
+                "position", flat=True
+            )
+        )
+        self.assertEqual(
+            positions, [Task.POSITION_GAP * i for i in range(1, 4)]
+        )
@@ -0,0 +1,124 @@
+from datetime import datetime, timezone
+
+from django.test import TestCase
+from django.urls import reverse
+
+from board.models import Position, Worker
+from board.pagination import (
+    InvalidCursor,
+    cursor_page,
+    decode_cursor,
+    encode_cursor,
+)
+
+
+class CursorPageTestCase(TestCase):
+    def setUp(self):
+        Position.objects.bulk_create(
+            [Position(name=f"Position {number:02}") for number in range(7)]
+        )
+        self.queryset = Position.objects.all()
+
+    def names(self, page):
+        return [position.name[-2:] for position in page]
+
+    def test_cursor_keeps_microseconds(self):
+        moment = datetime(2024, 1, 2, 3, 4, 5, 678901, tzinfo=timezone.utc)
+        [value] = decode_cursor(encode_cursor([moment]), 1)
+        self.assertEqual(datetime.fromisoformat(value), moment)
+
+    def test_walks_forward_and_back(self):
+        first = cursor_page(self.queryset, ("name",), 3)
+        self.assertEqual(self.names(first), ["00", "01", "02"])
+        self.assertFalse(first.has_previous())
+
+        second = cursor_page(
+            self.queryset, ("name",), 3, cursor=first.next_cursor
+        )
+        self.assertEqual(self.names(second), ["03", "04", "05"])
+
+        last = cursor_page(
+            self.queryset, ("name",), 3, cursor=second.next_cursor
+        )
+        self.assertEqual(self.names(last), ["06"])
+        self.assertFalse(last.has_next())
+
+        back = cursor_page(
+            self.queryset, ("name",), 3, cursor=last.previous_cursor
+        )
+        self.assertEqual(self.names(back), ["03", "04", "05"])
+        self.assertEqual(back.next_cursor, second.next_cursor)
+
+        start = cursor_page(
+            self.queryset, ("name",), 3, cursor=back.previous_cursor
+        )
+        self.assertEqual(self.names(start), ["00", "01", "02"])
+        self.assertFalse(start.has_previous())
+
+    def test_descending_ordering(self):
+        first = cursor_page(self.queryset, ("-name",), 4)
+        second = cursor_page(
+            self.queryset, ("-name",), 4, cursor=first.next_cursor
+        )
+        self.assertEqual(self.names(second), ["02", "01", "00"])
+
+    def test_rejects_foreign_cursors(self):
+        for cursor in (
+            "garbage",
+            encode_cursor(["?", "x"]),
+            encode_cursor([1]),
+        ):
+            with self.assertRaises(InvalidCursor):
+                cursor_page(self.queryset, ("name",), 3, cursor=cursor)
+
+    def test_rejects_values_the_ordering_cannot_hold(self):
+        for cursor in (
+            encode_cursor([">", "abc"]),
+            encode_cursor(["<", None]),
+            encode_cursor([">", [1]]),
+        ):
+            with self.assertRaises(InvalidCursor):
+                cursor_page(self.queryset, ("id",), 3, cursor=cursor)
+
+    def test_every_page_is_one_query(self):
+        page = cursor_page(self.queryset, ("name",), 2)
+        for _ in range(3):
+            with self.assertNumQueries(1):
+                page = cursor_page(
+                    self.queryset, ("name",), 2, cursor=page.next_cursor
+                )
+
+
+class CursorPaginationMixinTestCase(TestCase):
+    def setUp(self):
+        Position.objects.bulk_create(
+            [Position(name=f"Position {number:02}") for number in range(25)]
+        )
+        self.client.force_login(Worker.objects.create(username="user"))
+        self.url = reverse("board:position-list")
+
+    def test_renders_cursor_links_without_counting(self):
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url)
+        page = response.context["page_obj"]
+        self.assertTrue(response.context["is_paginated"])
+        self.assertContains(response, f"cursor={page.next_cursor}")
+        self.assertNotContains(response, "Previous")
+
+        response = self.client.get(self.url, {"cursor": page.next_cursor})
+        page = response.context["page_obj"]
+        self.assertEqual(page.object_list[0].name, "Position 10")
+        self.assertContains(response, f"cursor={page.previous_cursor}")
+
+    def test_invalid_cursor_is_not_found(self):
+        response = self.client.get(self.url, {"cursor": "garbage"})
+        self.assertEqual(response.status_code, 404)
+
+    def test_cursor_with_a_malformed_value_is_not_found(self):
+        for url, cursor in (
+            (self.url, encode_cursor([">", {}])),
+            (reverse("board:project-list"), encode_cursor([">", "abc"])),
+        ):
+            with self.subTest(url=url):
+                response = self.client.get(url, {"cursor": cursor})
+                self.assertEqual(response.status_code, 404)
@@ -0,0 +1,67 @@
+from unittest import mock
+
+from django.db import transaction
+from django.test import TestCase
+
+from board import benchmarks, budgets
+from board.synthetic import Generator
+
+
+class QueryBudgetTestCase(TestCase):
+    def record(self, size):
+        with transaction.atomic():
+            Generator(budgets.DATASETS[size]).run()
+            statements = budgets.record(benchmarks.Targets.pick())
+            transaction.set_rollback(True)
+        return statements
+
+    def test_every_route_has_a_budget(self):
+        self.assertEqual(
+            set(budgets.QUERY_BUDGETS),
+            {scenario.label for scenario in benchmarks.SCENARIOS},
+        )
+
+    def test_routes_keep_to_their_budgets(self):
+        small = self.record(budgets.SMALL)
+        large = self.record(budgets.LARGE)
+        found = budgets.problems(small, large)
+        for label in large:
+            with self.subTest(route=label):
+                if label in found:
+                    self.fail(found[label])
+
+
+class ProblemsTestCase(TestCase):
+    small = {"list": ["SELECT page", "SELECT row"]}
+    large = {"list": ["SELECT page"] + ["SELECT row"] * 5}
+
+    def problems(self, allowed):
+        with mock.patch.dict(budgets.QUERY_BUDGETS, {"list": allowed}):
+            return budgets.problems(self.small, self.large)
+
+    def test_growth_names_the_repeated_statement(self):
+        message = self.problems(10)["list"]
+        self.assertIn("went from 2 to 6 queries", message)
+        self.assertIn("4 x SELECT row", message)
+        self.assertNotIn("SELECT page", message)
+
+    def test_over_budget(self):
+        message = self.problems(4)["list"]
+        self.assertIn("6 queries on the large dataset", message)
+        self.assertIn("5 x SELECT row", message)
+
+    def test_growth_can_be_budgeted_per_size(self):
+        self.assertEqual(
+            self.problems({budgets.SMALL: 2, budgets.LARGE: 6}), {}
+        )
+        self.assertIn(
+            "small dataset",
+            self.problems({budgets.SMALL: 1, budgets.LARGE: 6})["list"],
+        )
+
+    def test_missing_budget(self):
+        with mock.patch.dict(budgets.QUERY_BUDGETS, clear=True):
+            self.assertIn(
+                "no query budget",
+                budgets.problems(self.small, self.large)["list"],
+            )
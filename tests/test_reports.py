@@ -0,0 +1,161 @@
+from datetime import date, timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from board.models import Board, BoardSnapshot, TaskType, Worker
+from tests.factories import create_project, create_task
+
+
+class SnapshotTestCase(TestCase):
+    def setUp(self):
+        self.owner = Worker.objects.create(username="owner")
+        self.task_type = TaskType.objects.create(name="Bug")
+        self.project = self.create_project("Active")
+        self.todo = Board.objects.create(name="Todo", project=self.project)
+        self.done = Board.objects.create(name="Done", project=self.project)
+
+    def create_project(self, name, **fields):
+        return create_project(name, self.owner, **fields)
+
+    def create_task(self, board, **fields):
+        return create_task("Task", board, self.task_type, **fields)
+
+    def snapshot(self, **options):
+        call_command("snapshot_tasks", stdout=StringIO(), **options)
+        return {
+            snapshot.board_id: (
+                snapshot.open_count,
+                snapshot.completed_count,
+                snapshot.overdue_count,
+            )
+            for snapshot in BoardSnapshot.objects.filter(date=date.today())
+        }
+
+    def test_counts_each_board_of_active_projects(self):
+        self.create_task(self.todo)
+        self.create_task(self.todo, days=-1)
+        task = self.create_task(self.done, is_completed=True, days=-1)
+        finished = self.create_project("Finished", is_completed=True)
+        Board.objects.create(name="Old", project=finished)
+
+        self.assertEqual(
+            self.snapshot(),
+            {self.todo.pk: (2, 0, 1), self.done.pk: (0, 1, 0)},
+        )
+
+        task.delete()
+        self.assertEqual(
+            self.snapshot(batch_size=1),
+            {self.todo.pk: (2, 0, 1), self.done.pk: (0, 0, 0)},
+        )
+        self.assertEqual(BoardSnapshot.objects.count(), 2)
+
+    def test_batches(self):
+        for index in range(5):
+            project = self.create_project(f"Project {index}")
+            Board.objects.create(name="Todo", project=project)
+        self.assertEqual(len(self.snapshot(batch_size=2)), 7)
+
+
+class ReportViewTestCase(TestCase):
+    def setUp(self):
+        self.owner = Worker.objects.create(username="owner")
+        self.project = create_project("Project", self.owner, days=0)
+        self.todo = Board.objects.create(name="Todo", project=self.project)
+        self.done = Board.objects.create(name="Done", project=self.project)
+        self.start = date(2024, 3, 1)
+        self.add_snapshots(
+            {
+                self.todo.pk: [(5, 0, 0), (4, 0, 1), (2, 0, 2)],
+                self.done.pk: [None, (0, 1, 0), (0, 3, 0)],
+                self.done.pk + 100: [(1, 0, 0), None, None],
+            }
+        )
+        self.client.force_login(self.owner)
+
+    def add_snapshots(self, counts_by_board):
+        BoardSnapshot.objects.bulk_create(
+            BoardSnapshot(
+                date=self.start + timedelta(days=offset),
+                project=self.project,
+                board_id=board_id,
+                open_count=counts[0],
+                completed_count=counts[1],
+                overdue_count=counts[2],
+            )
+            for board_id, days in counts_by_board.items()
+            for offset, counts in enumerate(days)
+            if counts
+        )
+
+    def get(self, name, **params):
+        return self.client.get(
+            reverse(f"board:{name}", args=[self.project.pk]), params
+        )
+
+    def test_burndown(self):
+        # Session, user, the project, the series.
+        with self.assertNumQueries(4):
+            response = self.get(
+                "project-burndown", start="2024-03-01", end="2024-03-31"
+            )
+        self.assertEqual(
+            response.json(),
+            {
+                "project": self.project.pk,
+                "start": "2024-03-01",
+                "end": "2024-03-31",
+                "dates": ["2024-03-01", "2024-03-02", "2024-03-03"],
+                "open": [6, 4, 2],
+                "completed": [0, 1, 3],
+                "overdue": [0, 1, 2],
+            },
+        )
+
+    def test_cumulative_flow_fills_missing_days(self):
+        response = self.get(
+            "project-cumulative-flow", start="2024-03-02", end="2024-03-03"
+        )
+        data = response.json()
+        self.assertEqual(data["dates"], ["2024-03-02", "2024-03-03"])
+        self.assertEqual(
+            data["boards"],
+            [
+                {"id": self.todo.pk, "name": "Todo", "counts": [4, 2]},
+                {"id": self.done.pk, "name": "Done", "counts": [1, 3]},
+            ],
+        )
+        self.assertEqual(data["completed"], [1, 3])
+
+        data = self.get("project-cumulative-flow", end="2024-03-01").json()
+        self.assertEqual(
+            [board["counts"] for board in data["boards"]], [[5], [1]]
+        )
+        self.assertEqual(
+            data["boards"][1]["name"], f"Deleted board {self.done.pk + 100}"
+        )
+
+    def test_defaults_to_the_last_30_days(self):
+        data = self.get("project-burndown").json()
+        self.assertEqual(data["end"], date.today().isoformat())
+        self.assertEqual(
+            data["start"], (date.today() - timedelta(days=29)).isoformat()
+        )
+        self.assertEqual(data["dates"], [])
+
+    def test_rejects_bad_ranges(self):
+        response = self.get(
+            "project-burndown", start="2024-03-02", end="2024-03-01"
+        )
+        self.assertEqual(response.status_code, 400)
+        response = self.get("project-burndown", start="yesterday")
+        self.assertEqual(response.status_code, 400)
+
+    def test_unknown_project(self):
+        response = self.client.get(
+            reverse("board:project-burndown", args=[self.project.pk + 1])
+        )
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,172 @@
+from datetime import date, timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from board import search
+from board.models import (
+    Board,
+    Project,
+    SearchEntry,
+    Task,
+    TaskType,
+    Team,
+    Worker,
+)
+from board.views import SearchView
+from tests.factories import create_project, create_task
+
+
+class SearchTestCase(TestCase):
+    def setUp(self):
+        self.user = Worker.objects.create(
+            username="jdoe", first_name="Jane", last_name="Doe"
+        )
+        self.project = self.create_project("Payments", "Checkout and invoices")
+        self.board = Board.objects.create(name="Board", project=self.project)
+        self.task = create_task(
+            "Fix invoice rounding",
+            self.board,
+            TaskType.objects.create(name="Bug"),
+            description="Totals are off by a cent",
+        )
+        self.client.force_login(self.user)
+
+    def create_project(self, name, description):
+        return create_project(
+            name,
+            self.user,
+            days=1,
+            team=Team.objects.create(name=name),
+            description=description,
+        )
+
+    def kinds_and_ids(self, query, **kwargs):
+        entries, _ = search.search(query, **kwargs)
+        return [(entry.kind, entry.object_id) for entry in entries]
+
+    def test_matches_every_kind_by_prefix(self):
+        self.assertEqual(
+            self.kinds_and_ids("invoice"),
+            [("task", self.task.pk), ("project", self.project.pk)],
+        )
+        self.assertEqual(self.kinds_and_ids("jan"), [("worker", self.user.pk)])
+        self.assertEqual(
+            self.kinds_and_ids("invoice", kinds=[SearchEntry.PROJECT]),
+            [("project", self.project.pk)],
+        )
+
+    def test_query_syntax_is_not_interpreted(self):
+        self.assertEqual(self.kinds_and_ids('"OR -- NEAR('), [])
+        self.assertEqual(self.kinds_and_ids("   "), [])
+
+    def test_signals_keep_entries_current(self):
+        self.task.name = "Rounding of totals"
+        self.task.save()
+        self.assertEqual(
+            self.kinds_and_ids("rounding"), [("task", self.task.pk)]
+        )
+        self.assertEqual(self.kinds_and_ids("fix"), [])
+
+        self.task.delete()
+        self.assertEqual(self.kinds_and_ids("rounding"), [])
+
+        self.project.delete()
+        self.assertFalse(
+            SearchEntry.objects.exclude(kind=SearchEntry.WORKER).exists()
+        )
+
+    def test_board_delete_removes_its_task_entries(self):
+        self.board.delete()
+        self.assertEqual(self.kinds_and_ids("rounding"), [])
+        self.assertEqual(
+            self.kinds_and_ids("invoice"), [("project", self.project.pk)]
+        )
+
+    def test_login_does_not_reindex_worker(self):
+        with self.assertNumQueries(1):
+            self.user.save(update_fields=["last_login"])
+
+    def test_rebuild_restores_entries(self):
+        SearchEntry.objects.all().delete()
+        call_command("rebuild_search_index", stdout=StringIO())
+        self.assertEqual(SearchEntry.objects.count(), 3)
+        self.assertEqual(self.kinds_and_ids("cent"), [("task", self.task.pk)])
+
+    def test_endpoint_returns_ranked_results(self):
+        for number in range(3):
+            self.create_project(f"Invoice run {number}", "Monthly")
+        response = self.client.get(
+            reverse("board:search"), {"q": "invoice", "kind": "project"}
+        )
+        data = response.json()
+        self.assertEqual(len(data["results"]), 4)
+        self.assertIsNone(data["next_page"])
+        top = data["results"][0]
+        self.assertEqual(top["kind"], "project")
+        self.assertEqual(
+            top["url"], reverse("board:project-detail", args=[top["id"]])
+        )
+
+    @mock.patch.object(SearchView, "per_page", 2)
+    def test_endpoint_pages_through_results(self):
+        for number in range(3):
+            self.create_project(f"Invoice run {number}", "Monthly")
+        data = self.client.get(
+            reverse("board:search"), {"q": "invoice", "page": 2}
+        ).json()
+        self.assertEqual(data["page"], 2)
+        self.assertEqual(data["next_page"], 3)
+        self.assertEqual(len(data["results"]), 2)
+
+    @mock.patch.object(search, "RANKED_MATCHES", 3)
+    def test_matches_beyond_the_ranked_ones_are_reachable(self):
+        projects = [
+            self.create_project(f"Invoice run {number}", "Monthly")
+            for number in range(4)
+        ]
+        seen = []
+        for page in range(1, 5):
+            entries, has_next = search.search(
+                "invoice", kinds=["project"], page=page, per_page=2
+            )
+            seen.extend(entry.object_id for entry in entries)
+            if not has_next:
+                break
+        # The three newest are ranked, the rest follow newest first.
+        self.assertCountEqual(seen[:3], [p.pk for p in projects[1:]])
+        self.assertEqual(seen[3:], [projects[0].pk, self.project.pk])
+
+    def test_endpoint_requires_query(self):
+        response = self.client.get(reverse("board:search"))
+        self.assertEqual(response.status_code, 400)
+
+    def test_project_list_uses_index(self):
+        self.create_project("Marketing", "Campaigns")
+        response = self.client.get(
+            reverse("board:project-list"), {"name": "pay"}
+        )
+        self.assertEqual(
+            [project.pk for project in response.context["object_list"]],
+            [self.project.pk],
+        )
+
+    def test_project_list_matches_names_only(self):
+        kanban = self.create_project("Kanban board", "Payments backlog")
+        for name, expected in (
+            ("pay", [self.project.pk]),
+            ("kan bo", [kanban.pk]),
+            ("invoices", []),
+            ("anban", []),
+        ):
+            with self.subTest(name=name):
+                response = self.client.get(
+                    reverse("board:project-list"), {"name": name}
+                )
+                self.assertEqual(
+                    [p.pk for p in response.context["object_list"]],
+                    expected,
+                )
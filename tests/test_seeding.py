@@ -0,0 +1,153 @@
+import json
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from board.counters import find_drift
+from board.models import (
+    Board,
+    Project,
+    SearchEntry,
+    SiteCounters,
+    Task,
+    TaskType,
+    Team,
+    Worker,
+)
+from board.seeding import dependency_order, iter_json_array, seed
+
+
+class IterJsonArrayTestCase(TestCase):
+    def test_items_split_across_chunks(self):
+        items = [{"pk": index, "name": "x" * index} for index in range(20)]
+        text = json.dumps(items, indent=2)
+        for chunk_size in (1, 7, 64, len(text)):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(
+                    list(iter_json_array(StringIO(text), chunk_size)), items
+                )
+        self.assertEqual(list(iter_json_array(StringIO(" [ ] "))), [])
+
+    def test_rejects_bad_input(self):
+        for text in ('{"pk": 1}', '[{"pk": 1}, {"pk"', "[{]", ""):
+            with self.subTest(text=text):
+                with self.assertRaises(ValueError):
+                    list(iter_json_array(StringIO(text), 4))
+
+
+class SeedTestCase(TestCase):
+    def test_dependency_order(self):
+        order = dependency_order([Task, Board, Project, Team, Worker])
+        for before, after in [
+            (Worker, Team),
+            (Team, Project),
+            (Project, Board),
+            (Board, Task),
+            (Worker, Task),
+        ]:
+            self.assertLess(order.index(before), order.index(after))
+
+    def test_initial_data(self):
+        out = StringIO()
+        call_command("seed", "initial_data", stdout=out)
+        self.assertIn("Created 52 objects", out.getvalue())
+
+        self.assertEqual(Project.objects.count(), 5)
+        self.assertEqual(Team.objects.get(pk=1).members.count(), 3)
+        self.assertEqual(Task.objects.get(pk=1).assignees.count(), 1)
+        self.assertEqual(find_drift(), [])
+        counters = SiteCounters.load()
+        self.assertEqual((counters.projects, counters.tasks), (5, 20))
+        self.assertEqual(SearchEntry.objects.count(), 5 + 20 + 4)
+        for board_id in Board.objects.values_list("pk", flat=True):
+            positions = list(
+                Task.objects.filter(board_id=board_id)
+                .order_by("pk")
+                .values_list("position", flat=True)
+            )
+            self.assertEqual(
+                positions,
+                [Task.POSITION_GAP * i for i in range(1, len(positions) + 1)],
+            )
+
+        out = StringIO()
+        # A savepoint around one lookup per model of the fixture.
+        with self.assertNumQueries(2 + 8):
+            call_command("seed", "initial_data", stdout=out)
+        self.assertIn("skipped 52", out.getvalue())
+
+    def test_seeded_projects_sync_in_full(self):
+        call_command("seed", "initial_data", stdout=StringIO())
+        project = Project.objects.get(pk=1)
+        self.client.force_login(Worker.objects.first())
+        response = self.client.get(
+            reverse("board:project-changes", args=[project.pk]),
+            {"since": 0},
+        )
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(len(data["boards"]), project.boards.count())
+        self.assertEqual(
+            len(data["tasks"]),
+            Task.objects.filter(board__project=project).count(),
+        )
+        self.assertTrue(data["tasks"])
+
+    def test_adds_only_missing_rows(self):
+        owner = Worker.objects.create(username="owner")
+        project = Project.objects.create(
+            name="Existing",
+            description="Description",
+            deadline="2024-03-01",
+            owner=owner,
+        )
+        board = Board.objects.create(name="Todo", project=project)
+        fixture = [
+            {
+                "model": "board.tasktype",
+                "pk": 1,
+                "fields": {"name": "Bug"},
+            },
+            {
+                "model": "board.task",
+                "pk": 500,
+                "fields": {
+                    "name": "Seeded",
+                    "board": board.pk,
+                    "description": "Description",
+                    "deadline": "2024-03-02",
+                    "is_completed": True,
+                    "task_type": 1,
+                    "assignees": [owner.pk],
+                },
+            },
+            {
+                "model": "board.project",
+                "pk": project.pk,
+                "fields": {
+                    "name": "Renamed",
+                    "description": "Description",
+                    "deadline": "2024-03-01",
+                },
+            },
+        ]
+
+        created, skipped = seed([StringIO(json.dumps(fixture))])
+
+        self.assertEqual(created, {TaskType: 1, Task: 1})
+        self.assertEqual(skipped[Project], 1)
+        project.refresh_from_db()
+        self.assertEqual(project.name, "Existing")
+        self.assertEqual((project.task_count, project.completed_count), (1, 1))
+        self.assertEqual(list(owner.tasks.values_list("pk", flat=True)), [500])
+        self.assertTrue(
+            SearchEntry.objects.filter(
+                kind=SearchEntry.TASK, object_id=500
+            ).exists()
+        )
+
+    def test_unknown_fixture(self):
+        with self.assertRaises(CommandError):
+            call_command("seed", "missing", stdout=StringIO())
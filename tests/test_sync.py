@@ -0,0 +1,106 @@
+from django.test import TestCase
+from django.urls import reverse
+
+from board.models import Board, Project, Task, TaskType, Team, Worker
+from tests.factories import create_project, create_task
+
+
+class ProjectChangesViewTestCase(TestCase):
+    def setUp(self):
+        self.user = Worker.objects.create(username="owner")
+        self.project = create_project(
+            "Test Project",
+            self.user,
+            days=1,
+            team=Team.objects.create(name="Development Team"),
+        )
+        self.board = Board.objects.create(name="Board", project=self.project)
+        self.task_type = TaskType.objects.create(name="Bug")
+        self.task = self.create_task("Task")
+        self.url = reverse("board:project-changes", args=[self.project.pk])
+        self.client.force_login(self.user)
+
+    def create_task(self, name):
+        return create_task(name, self.board, self.task_type)
+
+    def changes(self, since):
+        return self.client.get(self.url, {"since": since})
+
+    def current_version(self):
+        self.project.refresh_from_db()
+        return self.project.sync_version
+
+    def test_full_sync(self):
+        data = self.changes(0).json()
+        self.assertEqual(data["version"], self.current_version())
+        self.assertEqual([b["id"] for b in data["boards"]], [self.board.pk])
+        self.assertEqual([t["id"] for t in data["tasks"]], [self.task.pk])
+        self.assertEqual(data["deleted"], [])
+
+    def test_full_sync_includes_unstamped_rows(self):
+        other = self.create_task("Other")
+        Project.objects.filter(pk=self.project.pk).update(sync_version=0)
+        Board.objects.update(sync_version=0)
+        Task.objects.update(sync_version=0)
+
+        data = self.changes(0).json()
+        self.assertEqual([b["id"] for b in data["boards"]], [self.board.pk])
+        self.assertEqual(len(data["tasks"]), 2)
+
+        other.name = "Edited"
+        other.save()
+        data = self.changes(0).json()
+        self.assertEqual([b["id"] for b in data["boards"]], [self.board.pk])
+        self.assertEqual(
+            sorted(t["id"] for t in data["tasks"]),
+            [self.task.pk, other.pk],
+        )
+
+    def test_unchanged_project_is_one_lookup(self):
+        version = self.current_version()
+        # Session and user, then the project version.
+        with self.assertNumQueries(3):
+            response = self.changes(version)
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(response.content, b"")
+
+    def test_only_changes_after_version_are_returned(self):
+        version = self.current_version()
+        other = self.create_task("Other")
+        data = self.changes(version).json()
+        self.assertEqual(data["boards"], [])
+        self.assertEqual([t["id"] for t in data["tasks"]], [other.pk])
+
+    def test_assignee_change_marks_task_changed(self):
+        version = self.current_version()
+        self.task.assignees.add(self.user)
+        data = self.changes(version).json()
+        self.assertEqual(len(data["tasks"]), 1)
+        self.assertEqual(data["tasks"][0]["assignees"], [self.user.pk])
+
+    def test_deletes_leave_tombstones(self):
+        version = self.current_version()
+        task_id = self.task.pk
+        self.task.delete()
+        data = self.changes(version).json()
+        self.assertEqual(data["tasks"], [])
+        self.assertEqual(
+            [(d["model"], d["object_id"]) for d in data["deleted"]],
+            [("task", task_id)],
+        )
+
+    def test_board_delete_leaves_one_tombstone(self):
+        version = self.current_version()
+        board_id = self.board.pk
+        self.board.delete()
+        deleted = self.changes(version).json()["deleted"]
+        self.assertEqual(
+            [(d["model"], d["object_id"]) for d in deleted],
+            [("board", board_id)],
+        )
+
+    def test_versions_increase_monotonically(self):
+        versions = [self.current_version()]
+        for name in ("A", "B", "C"):
+            versions.append(self.create_task(name).sync_version)
+        self.assertEqual(versions, sorted(set(versions)))
@@ -0,0 +1,140 @@
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from board.counters import find_drift
+from board.models import (
+    Board,
+    Project,
+    SearchEntry,
+    SiteCounters,
+    Task,
+    Team,
+    Worker,
+)
+from board.synthetic import Generator, Sizes
+
+
+class GeneratorTestCase(TestCase):
+    def generate(self, seed=0, prefix="synthetic", **sizes):
+        sizes = Sizes(
+            **{"workers": 20, "teams": 4, "projects": 6, "tasks": 5, **sizes}
+        )
+        return Generator(sizes, seed, prefix).run()
+
+    def snapshot(self, prefix):
+        """The rows of one run, with its prefix taken out of the names."""
+        tasks = Task.objects.filter(board__project__name__startswith=prefix)
+        rows = [
+            Worker.objects.filter(username__startswith=prefix)
+            .order_by("pk")
+            .values_list("username", "position__name"),
+            Project.objects.filter(name__startswith=prefix)
+            .order_by("pk")
+            .values_list(
+                "name", "owner__username", "team__name", "task_count"
+            ),
+            tasks.order_by("pk").values_list(
+                "board__name", "name", "deadline", "position"
+            ),
+            Task.assignees.through.objects.filter(task__in=tasks)
+            .order_by("pk")
+            .values_list("task__name", "worker__username"),
+        ]
+        return [
+            [
+                tuple(
+                    (
+                        value.replace(prefix, "")
+                        if isinstance(value, str)
+                        else value
+                    )
+                    for value in row
+                )
+                for row in queryset
+            ]
+            for queryset in rows
+        ]
+
+    def test_same_seed_same_data(self):
+        self.generate(seed=3, prefix="first")
+        self.generate(seed=3, prefix="second")
+        self.generate(seed=4, prefix="first")
+        self.assertEqual(self.snapshot("first-3"), self.snapshot("second-3"))
+        self.assertNotEqual(self.snapshot("first-3"), self.snapshot("first-4"))
+
+    def test_counts_match_rows(self):
+        created = self.generate(attachments=1)
+        self.assertEqual(created["tasks"], Task.objects.count())
+        self.assertEqual(
+            created["assignees"], Task.assignees.through.objects.count()
+        )
+        self.assertEqual(
+            created["task attachments"],
+            Task.attachments.through.objects.count(),
+        )
+        self.assertEqual(find_drift(), [])
+        counters = SiteCounters.load()
+        self.assertEqual(
+            (counters.projects, counters.tasks),
+            (6, created["tasks"]),
+        )
+        for board_id in Board.objects.values_list("pk", flat=True):
+            positions = list(
+                Task.objects.filter(board_id=board_id)
+                .order_by(*Task.COLUMN_ORDERING)
+                .values_list("position", flat=True)
+            )
+            self.assertEqual(
+                positions,
+                [Task.POSITION_GAP * i for i in range(1, len(positions) + 1)],
+            )
+
+    def test_no_skew_gives_the_means(self):
+        created = self.generate(skew=0, boards=3, tasks=4, assignees=2)
+        self.assertEqual(created["boards"], 6 * 3)
+        self.assertEqual(created["tasks"], 6 * 3 * 4)
+        self.assertEqual(
+            set(Project.objects.values_list("task_count", flat=True)), {12}
+        )
+
+    def test_skew_makes_some_workers_busier(self):
+        self.generate(skew=1.5, tasks=20)
+        busiest = Worker.objects.order_by("pk").first()
+        quietest = Worker.objects.order_by("pk").last()
+        self.assertGreater(busiest.tasks.count(), quietest.tasks.count())
+
+
+class GenerateDataCommandTestCase(TestCase):
+    def test_command(self):
+        out = StringIO()
+        call_command(
+            "generate_data",
+            workers=10,
+            teams=2,
+            projects=3,
+            tasks=4,
+            stdout=out,
+        )
+        self.assertIn("3 projects", out.getvalue())
+        self.assertEqual(
+            SearchEntry.objects.count(),
+            Project.objects.count()
+            + Task.objects.count()
+            + Worker.objects.count(),
+        )
+
+        with self.assertRaises(CommandError):
+            call_command("generate_data", workers=10, stdout=out)
+        self.assertEqual(Worker.objects.count(), 10)
+
+    def test_without_search_index(self):
+        call_command(
+            "generate_data",
+            workers=5,
+            projects=2,
+            search_index=False,
+            stdout=StringIO(),
+        )
+        self.assertEqual(SearchEntry.objects.count(), 0)
@@ -0,0 +1,149 @@
+from datetime import date, timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from board.counters import task_count_deltas, with_progress
+from board.models import (
+    Board,
+    Project,
+    SiteCounters,
+    Task,
+    TaskType,
+    Worker,
+)
+from board.ordering import place_task
+from tests.factories import create_project, create_task
+
+
+class TaskCountsTestCase(TestCase):
+    def setUp(self):
+        self.owner = Worker.objects.create(username="owner")
+        self.project = create_project("Project", self.owner)
+        self.todo = Board.objects.create(name="Todo", project=self.project)
+        self.done = Board.objects.create(name="Done", project=self.project)
+        self.task_type = TaskType.objects.create(name="Bug")
+
+    def create_task(self, name, board, is_completed=False):
+        return create_task(
+            name, board, self.task_type, is_completed=is_completed
+        )
+
+    def counts(self, obj):
+        obj.refresh_from_db(fields=["task_count", "completed_count"])
+        return obj.task_count, obj.completed_count
+
+    def test_create_and_toggle(self):
+        task = self.create_task("A", self.todo)
+        self.create_task("B", self.todo, is_completed=True)
+        self.assertEqual(self.counts(self.todo), (2, 1))
+        self.assertEqual(self.counts(self.project), (2, 1))
+
+        task.is_completed = True
+        task.save()
+        task.save()
+        self.assertEqual(self.counts(self.todo), (2, 2))
+        self.assertEqual(self.counts(self.project), (2, 2))
+
+    def test_moves_shift_counts_between_boards(self):
+        task = self.create_task("A", self.todo, is_completed=True)
+        other = self.create_task("B", self.done)
+        place_task(Task.objects.get(pk=task.pk), before=other)
+        self.assertEqual(self.counts(self.todo), (0, 0))
+        self.assertEqual(self.counts(self.done), (2, 1))
+        self.assertEqual(self.counts(self.project), (2, 1))
+
+        self.client.force_login(self.owner)
+        self.client.post(
+            reverse("board:task-change-board", args=[other.pk]),
+            {"board": self.todo.pk},
+        )
+        self.assertEqual(self.counts(self.todo), (1, 0))
+        self.assertEqual(self.counts(self.done), (1, 1))
+
+    def test_deferred_completion_is_left_alone(self):
+        task = self.create_task("A", self.todo, is_completed=True)
+        task = Task.objects.only("name", "board").get(pk=task.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(task_count_deltas(task, created=False), {})
+
+    def test_deletes(self):
+        self.create_task("A", self.todo, is_completed=True)
+        task = self.create_task("B", self.todo)
+        self.create_task("C", self.done, is_completed=True)
+        task.delete()
+        self.assertEqual(self.counts(self.todo), (1, 1))
+        self.assertEqual(self.counts(self.project), (2, 2))
+
+        self.todo.delete()
+        self.assertEqual(self.counts(self.project), (1, 1))
+
+        self.project.delete()
+        self.assertFalse(Board.objects.exists())
+
+    def test_command_repairs_drift(self):
+        self.create_task("A", self.todo)
+        Task.objects.bulk_create(
+            [
+                Task(
+                    name="Bulk",
+                    board=self.done,
+                    description="Description",
+                    deadline=date.today(),
+                    is_completed=True,
+                    task_type=self.task_type,
+                    position=Task.end_position(self.done.pk),
+                )
+            ]
+        )
+        out = StringIO()
+        call_command("check_task_counts", "--dry-run", stdout=out)
+        self.assertIn("2 rows drifted", out.getvalue())
+        self.assertEqual(self.counts(self.done), (0, 0))
+
+        call_command("check_task_counts", stdout=StringIO())
+        self.assertEqual(self.counts(self.done), (1, 1))
+        self.assertEqual(self.counts(self.project), (2, 1))
+        out = StringIO()
+        call_command("check_task_counts", stdout=out)
+        self.assertIn("consistent", out.getvalue())
+
+
+class ProjectProgressTestCase(TaskCountsTestCase):
+    def test_overdue_and_next_deadline(self):
+        today = date.today()
+        for days, is_completed in ((-2, False), (-1, True), (3, False)):
+            task = self.create_task("A", self.todo, is_completed)
+            task.deadline = today + timedelta(days=days)
+            task.save()
+        self.create_task("B", self.done)
+        project = with_progress(Project.objects.all(), today).get()
+        self.assertEqual(project.overdue_count, 1)
+        self.assertEqual(project.next_deadline, today + timedelta(days=1))
+
+        empty = create_project("Empty", self.owner, days=0, description="")
+        empty = with_progress(Project.objects.filter(pk=empty.pk)).get()
+        self.assertEqual(empty.overdue_count, 0)
+        self.assertIsNone(empty.next_deadline)
+
+    def test_project_list_computes_progress_in_its_page_query(self):
+        other = create_project("Other", self.owner, days=0, description="")
+        self.create_task("A", self.todo, is_completed=True)
+        self.create_task("B", Board.objects.create(name="B", project=other))
+        SiteCounters.rebuild()
+        self.client.force_login(self.owner)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("board:project-list"))
+        task_queries = [
+            query for query in queries if "board_task" in query["sql"]
+        ]
+        self.assertEqual(len(task_queries), 1)
+        self.assertIn("board_project", task_queries[0]["sql"])
+        project = response.context["project_list"][1]
+        self.assertEqual((project.task_count, project.completed_count), (1, 1))
+        self.assertContains(response, "1/1 done")
+        self.assertContains(response, "0/1 done")
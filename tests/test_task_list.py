@@ -0,0 +1,109 @@
+from datetime import date, timedelta
+
+from django.test import TestCase
+from django.urls import reverse
+
+from board.models import Board, Project, Task, TaskType, Team, Worker
+from board.pagination import encode_cursor
+from tests.factories import create_project, create_task
+
+
+class TaskListViewTestCase(TestCase):
+    def setUp(self):
+        self.user = Worker.objects.create(username="owner")
+        self.other = Worker.objects.create(username="other")
+        self.project = self.create_project("Alpha")
+        self.board = Board.objects.create(name="Todo", project=self.project)
+        self.other_board = Board.objects.create(
+            name="Other", project=self.create_project("Beta")
+        )
+        self.bug = TaskType.objects.create(name="Bug")
+        self.feature = TaskType.objects.create(name="Feature")
+        self.url = reverse("board:task-list")
+        self.client.force_login(self.user)
+
+    def create_project(self, name):
+        team = Team.objects.create(name=name)
+        return create_project(name, self.user, days=30, team=team)
+
+    def create_task(self, name, days, board=None, task_type=None, **fields):
+        return create_task(
+            name,
+            board or self.board,
+            task_type or self.bug,
+            days=days,
+            **fields,
+        )
+
+    def names(self, **params):
+        response = self.client.get(self.url, params)
+        return [task.name for task in response.context["task_list"]]
+
+    def test_orders_by_deadline_then_id(self):
+        self.create_task("Later", 5)
+        self.create_task("Soon", 1)
+        self.create_task("Soon too", 1)
+        self.assertEqual(self.names(), ["Soon", "Soon too", "Later"])
+
+    def test_filters(self):
+        urgent = self.create_task("Urgent", 1, priority=Task.URGENT)
+        urgent.assignees.add(self.other)
+        self.create_task("Done", 2, is_completed=True)
+        self.create_task("Feature", 3, task_type=self.feature)
+        self.create_task("Elsewhere", 4, board=self.other_board)
+
+        self.assertEqual(
+            self.names(project=self.project.pk), ["Urgent", "Done", "Feature"]
+        )
+        self.assertEqual(self.names(board=self.other_board.pk), [])
+        self.assertEqual(
+            self.names(
+                project=self.other_board.project_id,
+                board=self.other_board.pk,
+            ),
+            ["Elsewhere"],
+        )
+        self.assertEqual(self.names(assignees=self.other.pk), ["Urgent"])
+        self.assertEqual(self.names(priority=Task.URGENT), ["Urgent"])
+        self.assertEqual(self.names(task_type=self.feature.pk), ["Feature"])
+        self.assertEqual(self.names(completion="done"), ["Done"])
+        self.assertEqual(
+            self.names(
+                deadline_after=date.today() + timedelta(days=2),
+                deadline_before=date.today() + timedelta(days=3),
+            ),
+            ["Done", "Feature"],
+        )
+
+    def test_keyset_pages_cost_the_same(self):
+        for number in range(60):
+            self.create_task(f"Task {number:02}", number % 7)
+        seen = []
+        cursor = None
+        pages = 0
+        while True:
+            params = {"cursor": cursor} if cursor else {}
+            # Session, user, the page, its assignees and the filter choices.
+            with self.assertNumQueries(6):
+                response = self.client.get(self.url, params)
+            pages += 1
+            seen.extend(task.pk for task in response.context["task_list"])
+            cursor = response.context["page_obj"].next_cursor
+            if not cursor:
+                break
+        expected = list(
+            Task.objects.order_by("deadline", "id").values_list(
+                "pk", flat=True
+            )
+        )
+        self.assertEqual(seen, expected)
+        self.assertEqual(pages, 3)
+
+    def test_invalid_cursor_is_not_found(self):
+        response = self.client.get(self.url, {"cursor": "nonsense"})
+        self.assertEqual(response.status_code, 404)
+
+    def test_cursor_with_an_invalid_date_is_not_found(self):
+        cursor = encode_cursor([">", "2024-13-45", 1])
+        response = self.client.get(self.url, {"cursor": cursor})
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,291 @@
+import json
+import os
+import tempfile
+from datetime import date
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from board.counters import find_drift
+from board.models import (
+    Attachment,
+    Board,
+    Project,
+    SearchEntry,
+    SiteCounters,
+    Task,
+    TaskType,
+    Team,
+    Worker,
+)
+from board.transfer import (
+    ATTACHMENT,
+    BOARD,
+    TASK,
+    export_lines,
+    export_records,
+)
+from tests.factories import create_project, create_task
+
+
+class ProjectTransferTestCase(TestCase):
+    def setUp(self):
+        SiteCounters.rebuild()
+        self.owner = Worker.objects.create(username="owner")
+        self.worker = Worker.objects.create(username="worker")
+        self.project = create_project(
+            "Project",
+            self.owner,
+            team=Team.objects.create(name="Team"),
+            deadline=date(2024, 3, 1),
+        )
+        self.todo = Board.objects.create(
+            name="Todo", project=self.project, color="#ff0000"
+        )
+        self.done = Board.objects.create(name="Done", project=self.project)
+        Board.objects.create(name="Empty", project=self.project)
+        task_type = TaskType.objects.create(name="Bug")
+        self.first = self.create_task("First", self.todo, task_type)
+        self.second = self.create_task(
+            "Second", self.done, task_type, is_completed=True
+        )
+        self.first.assignees.add(self.owner, self.worker)
+        self.attachment = Attachment.objects.create(
+            name="Spec", file="attachments/spec.pdf"
+        )
+        self.second.attachments.add(self.attachment)
+        Attachment.objects.create(name="Unused", file="attachments/x.pdf")
+
+    def create_task(self, name, board, task_type, is_completed=False):
+        return create_task(
+            name,
+            board,
+            task_type,
+            description=f"{name} description",
+            deadline=date(2024, 3, 2),
+            is_completed=is_completed,
+        )
+
+    def export(self, format):
+        return "".join(export_lines(self.project.pk, format))
+
+    def import_file(self, content, suffix, name, **options):
+        with tempfile.NamedTemporaryFile(
+            "w", suffix=suffix, delete=False
+        ) as file:
+            file.write(content)
+        self.addCleanup(os.remove, file.name)
+        out = StringIO()
+        call_command(
+            "import_project", file.name, name=name, stdout=out, **options
+        )
+        return Project.objects.get(name=name), out
+
+    def snapshot(self, project):
+        """Everything about a project that an export should carry over."""
+        boards = project.boards.order_by("pk")
+        return {
+            "project": (
+                project.description,
+                project.deadline,
+                project.owner_id,
+                project.team_id,
+                project.task_count,
+                project.completed_count,
+            ),
+            "boards": [
+                (board.name, board.color, board.task_count) for board in boards
+            ],
+            "tasks": [
+                (
+                    task.board.name,
+                    task.name,
+                    task.description,
+                    task.deadline,
+                    task.is_completed,
+                    task.priority,
+                    task.task_type_id,
+                    task.position,
+                    sorted(task.assignees.values_list("username", flat=True)),
+                    list(task.attachments.values_list("name", "file")),
+                )
+                for task in Task.objects.filter(
+                    board__project=project
+                ).order_by("pk")
+            ],
+        }
+
+    def test_jsonl_records(self):
+        records = [
+            json.loads(line) for line in self.export("jsonl").splitlines()
+        ]
+        self.assertEqual(
+            [record["type"] for record in records],
+            ["project"]
+            + ["board"] * 3
+            + ["attachment", "task", "task"]
+            + ["assignee"] * 2
+            + ["task_attachment"],
+        )
+        self.assertEqual(
+            records[0],
+            {
+                "type": "project",
+                "name": "Project",
+                "description": "Description",
+                "deadline": "2024-03-01",
+                "is_completed": False,
+                "owner": "owner",
+                "team": "Team",
+            },
+        )
+        self.assertEqual(
+            records[5]["task_type"], "Bug", "task types go by name"
+        )
+
+    def test_round_trip(self):
+        for format in ("jsonl", "csv"):
+            with self.subTest(format=format):
+                name = f"Copy {format}"
+                copy, out = self.import_file(
+                    self.export(format), f".{format}", name=name
+                )
+                self.project.refresh_from_db()
+                self.assertEqual(
+                    self.snapshot(copy), self.snapshot(self.project)
+                )
+                self.assertIn("2 tasks", out.getvalue())
+
+        self.assertEqual(find_drift(), [])
+        self.assertEqual(SiteCounters.load().tasks, Task.objects.count())
+        self.assertEqual(
+            SearchEntry.objects.filter(kind=SearchEntry.TASK).count(), 6
+        )
+
+    def test_blank_cells_round_trip(self):
+        Project.objects.filter(pk=self.project.pk).update(description="")
+        Task.objects.filter(pk=self.first.pk).update(description="")
+        self.project.refresh_from_db()
+        for format in ("jsonl", "csv"):
+            with self.subTest(format=format):
+                copy, _ = self.import_file(
+                    self.export(format), f".{format}", name=f"Copy {format}"
+                )
+                self.assertEqual(
+                    self.snapshot(copy), self.snapshot(self.project)
+                )
+
+    def test_ambiguous_team_names(self):
+        content = self.export("jsonl")
+        namesake = Team.objects.create(name="Team")
+        with self.assertRaisesMessage(CommandError, "More than one team"):
+            self.import_file(content, ".jsonl", name="C")
+        self.assertFalse(Project.objects.filter(name="C").exists())
+
+        copy, _ = self.import_file(
+            content, ".jsonl", name="C", team=namesake.pk
+        )
+        self.assertEqual(copy.team, namesake)
+        with self.assertRaisesMessage(CommandError, "There is no team"):
+            self.import_file(content, ".jsonl", name="D", team=0)
+
+    def test_imported_rows_are_visible_to_sync(self):
+        copy, _ = self.import_file(self.export("jsonl"), ".jsonl", name="C")
+        self.client.force_login(self.owner)
+        data = self.client.get(
+            reverse("board:project-changes", args=[copy.pk]), {"since": 0}
+        ).json()
+        self.assertEqual(len(data["boards"]), 3)
+        self.assertEqual(len(data["tasks"]), 2)
+
+    def test_unknown_assignees_are_skipped(self):
+        content = self.export("jsonl")
+        self.worker.delete()
+        copy, out = self.import_file(content, ".jsonl", name="C")
+        self.assertIn("Skipped 1 assignees", out.getvalue())
+        task = copy.boards.get(name="Todo").tasks.get()
+        self.assertEqual(list(task.assignees.all()), [self.owner])
+
+    def test_export_leaves_out_rows_created_while_it_runs(self):
+        records = export_records(self.project.pk)
+        exported = [next(records)]
+        board = Board.objects.create(name="Later", project=self.project)
+        task = self.create_task("Later", self.todo, self.first.task_type)
+        task.assignees.add(self.owner)
+        self.first.attachments.add(self.attachment)
+        self.second.board = board
+        self.second.save()
+        exported.extend(records)
+
+        ids = {kind: set() for kind in (BOARD, TASK, ATTACHMENT)}
+        for record in exported:
+            if record["type"] in ids:
+                ids[record["type"]].add(record["id"])
+        self.assertNotIn(board.pk, ids[BOARD])
+        self.assertEqual(ids[TASK], {self.first.pk})
+        for record in exported:
+            for field, kind in (
+                ("board", BOARD),
+                ("task", TASK),
+                ("attachment", ATTACHMENT),
+            ):
+                if record["type"] != kind and field in record:
+                    self.assertIn(record[field], ids[kind])
+
+    def test_dangling_references_are_skipped(self):
+        lines = [
+            line
+            for line in self.export("jsonl").splitlines()
+            if not line.startswith('{"type":"board","id":%d,' % self.done.pk)
+            and not line.startswith('{"type":"task","id":%d,' % self.first.pk)
+        ]
+        copy, out = self.import_file("\n".join(lines), ".jsonl", name="C")
+        self.assertIn("Skipped 1 tasks", out.getvalue())
+        self.assertIn("Skipped 2 assignees", out.getvalue())
+        self.assertIn("Skipped 1 attachment links", out.getvalue())
+        self.assertFalse(Task.objects.filter(board__project=copy).exists())
+        self.assertEqual(find_drift(), [])
+
+    def test_failed_import_leaves_nothing_behind(self):
+        lines = self.export("jsonl").splitlines()
+        content = "\n".join(lines[:6] + ['{"type": "comment"}'])
+        with self.assertRaises(CommandError):
+            self.import_file(content, ".jsonl", name="Broken")
+        self.assertFalse(Project.objects.filter(name="Broken").exists())
+
+    def test_export_command(self):
+        out = StringIO()
+        call_command(
+            "export_project", self.project.pk, format="csv", stdout=out
+        )
+        self.assertEqual(out.getvalue(), self.export("csv"))
+        with self.assertRaises(CommandError):
+            call_command("export_project", 0, stdout=out)
+
+    def test_export_view_streams(self):
+        self.client.force_login(self.owner)
+        url = reverse("board:project-export", args=[self.project.pk])
+
+        response = self.client.get(url)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertEqual(
+            b"".join(response.streaming_content).decode(),
+            self.export("jsonl"),
+        )
+
+        response = self.client.get(url, {"format": "csv"})
+        self.assertIn('filename="project-', response["Content-Disposition"])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            self.client.get(url, {"format": "xml"}).status_code, 400
+        )
+
+    def test_export_view_requires_edit_rights(self):
+        self.client.force_login(Worker.objects.create(username="outsider"))
+        response = self.client.get(
+            reverse("board:project-export", args=[self.project.pk])
+        )
+        self.assertEqual(response.status_code, 403)
@@ -0,0 +1,516 @@
+from datetime import date, timedelta
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from board import views
+from board.cache import fragment_cache
+from board.models import (
+    Attachment,
+    Board,
+    Position,
+    Project,
+    SiteCounters,
+    Task,
+    TaskType,
+    Team,
+    Worker,
+)
+from board.ordering import place_task
+from board.pagination import encode_cursor
+
+
+class ProjectDetailViewTestCase(TestCase):
+    def setUp(self):
+        self.position = Position.objects.create(name="Developer")
+        self.user = Worker.objects.create(
+            username="owner", position=self.position
+        )
+        self.team = Team.objects.create(name="Development Team")
+        self.team.members.add(self.user)
+        self.project = Project.objects.create(
+            name="Test Project",
+            team=self.team,
+            description="Test description",
+            deadline=date.today() + timedelta(days=1),
+            owner=self.user,
+        )
+        self.task_type = TaskType.objects.create(name="Bug")
+        self.client.force_login(self.user)
+        fragment_cache().clear()
+        self.url = reverse("board:project-detail", args=[self.project.pk])
+
+    def add_board(self, tasks):
+        board = Board.objects.create(name="Board", project=self.project)
+        for i in range(tasks):
+            task = Task.objects.create(
+                name=f"Task {i}",
+                board=board,
+                description="Description",
+                deadline=date.today() + timedelta(days=1),
+                is_completed=False,
+                task_type=self.task_type,
+            )
+            worker = Worker.objects.create(
+                username=f"worker-{board.pk}-{i}", position=self.position
+            )
+            self.team.members.add(worker)
+            task.assignees.add(worker, self.user)
+            task.attachments.add(
+                Attachment.objects.create(name="a", file="attachments/a.png")
+            )
+        return board
+
+    def count_queries(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries)
+
+    def test_query_count_does_not_grow_with_boards_and_tasks(self):
+        self.add_board(tasks=1)
+        small = self.count_queries()
+
+        self.add_board(tasks=5)
+        self.add_board(tasks=3)
+        large = self.count_queries()
+
+        self.assertEqual(small, large)
+
+    def test_renders_preloaded_tasks(self):
+        board = self.add_board(tasks=2)
+        response = self.client.get(self.url)
+        self.assertContains(response, board.name)
+        self.assertContains(response, "Task 1")
+        self.assertContains(response, "2 Assignees", count=2)
+
+
+class ProjectListViewTestCase(TestCase):
+    def setUp(self):
+        SiteCounters.rebuild()
+        self.user = Worker.objects.create(username="owner")
+        self.client.force_login(self.user)
+
+    def add_projects(self, count):
+        start = Project.objects.count()
+        for i in range(start, start + count):
+            owner = Worker.objects.create(username=f"owner-{i}")
+            team = Team.objects.create(name=f"Team {i}")
+            team.members.add(
+                owner,
+                *[
+                    Worker.objects.create(username=f"member-{i}-{j}")
+                    for j in range(2)
+                ],
+            )
+            Project.objects.create(
+                name=f"Project {i}",
+                description="Description",
+                deadline=date.today() + timedelta(days=1),
+                owner=owner,
+                team=team,
+            )
+
+    def test_query_budget(self):
+        self.add_projects(1)
+        url = reverse("board:project-list")
+        # Session, user, ETag state, the page, team members.
+        with self.assertNumQueries(5):
+            response = self.client.get(url)
+        self.assertContains(response, "owner-0")
+
+        self.add_projects(4)
+        with self.assertNumQueries(5):
+            response = self.client.get(url)
+        self.assertEqual(len(response.context["project_list"]), 3)
+
+    def test_loads_only_listed_columns(self):
+        self.add_projects(1)
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(reverse("board:project-list"))
+        page_query = next(
+            query["sql"]
+            for query in context.captured_queries
+            if "overdue_count" in query["sql"]
+        )
+        self.assertNotIn("password", page_query)
+        self.assertNotIn("sync_version", page_query)
+
+
+class BoardTasksViewTestCase(TestCase):
+    def setUp(self):
+        self.user = Worker.objects.create(username="owner")
+        self.project = Project.objects.create(
+            name="Test Project",
+            team=Team.objects.create(name="Development Team"),
+            description="Test description",
+            deadline=date.today() + timedelta(days=1),
+            owner=self.user,
+        )
+        self.board = Board.objects.create(name="Board", project=self.project)
+        task_type = TaskType.objects.create(name="Bug")
+        for i in range(views.TASKS_PER_COLUMN * 2 + 5):
+            Task.objects.create(
+                name=f"Task #{i}#",
+                board=self.board,
+                description="Description",
+                deadline=date.today() + timedelta(days=1),
+                is_completed=False,
+                task_type=task_type,
+            )
+        self.client.force_login(self.user)
+        fragment_cache().clear()
+
+    def test_project_page_renders_first_page_only(self):
+        response = self.client.get(
+            reverse("board:project-detail", args=[self.project.pk])
+        )
+        self.assertContains(response, "Task #0#")
+        self.assertContains(response, f"Task #{views.TASKS_PER_COLUMN - 1}#")
+        self.assertNotContains(response, f"Task #{views.TASKS_PER_COLUMN}#")
+        self.assertContains(response, "load-more-tasks")
+
+    def test_cursor_walks_every_task_once(self):
+        url = reverse("board:board-tasks", args=[self.board.pk])
+        seen = []
+        cursor = None
+        while True:
+            response = self.client.get(
+                url, {"cursor": cursor} if cursor else {}
+            )
+            self.assertEqual(response.status_code, 200)
+            seen.extend(task.pk for task in response.context["tasks"])
+            cursor = response.context["next_cursor"]
+            if cursor is None:
+                break
+        expected = list(
+            self.board.tasks.order_by(*Task.COLUMN_ORDERING).values_list(
+                "pk", flat=True
+            )
+        )
+        self.assertEqual(seen, expected)
+
+    def test_invalid_cursor(self):
+        response = self.client.get(
+            reverse("board:board-tasks", args=[self.board.pk]),
+            {"cursor": "not-a-cursor"},
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_cursor_with_values_of_the_wrong_type(self):
+        url = reverse("board:board-tasks", args=[self.board.pk])
+        for values in (["x", 1], [1, "y"], [None, 1], [{}, 1]):
+            with self.subTest(values=values):
+                response = self.client.get(
+                    url, {"cursor": encode_cursor(values)}
+                )
+                self.assertEqual(response.status_code, 404)
+
+
+class ColumnCacheTestCase(TestCase):
+    def setUp(self):
+        self.user = Worker.objects.create(username="owner")
+        self.project = Project.objects.create(
+            name="Test Project",
+            team=Team.objects.create(name="Development Team"),
+            description="Test description",
+            deadline=date.today() + timedelta(days=1),
+            owner=self.user,
+        )
+        self.board = Board.objects.create(name="Board", project=self.project)
+        self.task = Task.objects.create(
+            name="Cached task",
+            board=self.board,
+            description="Description",
+            deadline=date.today() + timedelta(days=1),
+            is_completed=False,
+            task_type=TaskType.objects.create(name="Bug"),
+        )
+        self.url = reverse("board:project-detail", args=[self.project.pk])
+        self.client.force_login(self.user)
+        fragment_cache().clear()
+
+    def get(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url)
+        task_queries = [
+            query
+            for query in context.captured_queries
+            if 'FROM "board_task"' in query["sql"]
+        ]
+        return response, task_queries
+
+    def test_second_render_is_served_from_cache(self):
+        self.assertTrue(self.get()[1])
+        response, task_queries = self.get()
+        self.assertEqual(task_queries, [])
+        self.assertContains(response, "Cached task")
+
+    def test_task_change_invalidates_column(self):
+        self.get()
+        self.task.name = "Renamed task"
+        self.task.save()
+        response, task_queries = self.get()
+        self.assertTrue(task_queries)
+        self.assertContains(response, "Renamed task")
+
+    def test_assignee_change_invalidates_column(self):
+        version = Board.objects.get(pk=self.board.pk).version
+        self.task.assignees.add(self.user)
+        self.assertGreater(
+            Board.objects.get(pk=self.board.pk).version, version
+        )
+
+    def test_team_change_invalidates_columns(self):
+        self.get()
+        team = Team.objects.create(name="Operations Team")
+        self.project.team = team
+        self.project.save()
+        response, task_queries = self.get()
+        self.assertTrue(task_queries)
+        self.assertContains(
+            response, reverse("board:team-update", args=[team.pk])
+        )
+
+    def test_move_invalidates_both_boards(self):
+        other = Board.objects.create(name="Other", project=self.project)
+        version = Board.objects.get(pk=self.board.pk).version
+        task = Task.objects.get(pk=self.task.pk)
+        task.board = other
+        task.save()
+        self.assertEqual(
+            Board.objects.get(pk=self.board.pk).version, version + 1
+        )
+        self.assertEqual(Board.objects.get(pk=other.pk).version, 1)
+
+
+class ConditionalGetTestCase(TestCase):
+    def setUp(self):
+        self.user = Worker.objects.create(username="owner")
+        self.team = Team.objects.create(name="Development Team")
+        self.project = Project.objects.create(
+            name="Test Project",
+            team=self.team,
+            description="Test description",
+            deadline=date.today() + timedelta(days=1),
+            owner=self.user,
+        )
+        self.board = Board.objects.create(name="Board", project=self.project)
+        self.task = Task.objects.create(
+            name="Task",
+            board=self.board,
+            description="Description",
+            deadline=date.today() + timedelta(days=1),
+            is_completed=False,
+            task_type=TaskType.objects.create(name="Bug"),
+        )
+        self.client.force_login(self.user)
+
+    def assertRevalidates(self, url, change):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        etag = response["ETag"]
+
+        with self.assertNumQueries(3):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        change()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_project_detail(self):
+        def change():
+            self.task.name = "Renamed"
+            self.task.save()
+
+        self.assertRevalidates(
+            reverse("board:project-detail", args=[self.project.pk]), change
+        )
+
+    def test_project_detail_team_change(self):
+        self.assertRevalidates(
+            reverse("board:project-detail", args=[self.project.pk]),
+            lambda: self.team.members.add(self.user),
+        )
+
+    def test_project_detail_member_changes(self):
+        member = Worker.objects.create(
+            username="member", position=Position.objects.create(name="Dev")
+        )
+        self.team.members.add(member)
+        other = Project.objects.create(
+            name="Other Project",
+            description="Description",
+            deadline=date.today() + timedelta(days=1),
+            owner=self.user,
+        )
+        elsewhere = Task.objects.create(
+            name="Elsewhere",
+            board=Board.objects.create(name="Board", project=other),
+            description="Description",
+            deadline=date.today() + timedelta(days=1),
+            is_completed=False,
+            task_type=self.task.task_type,
+        )
+
+        def rename():
+            member.username = "renamed"
+            member.save()
+
+        def rename_position():
+            member.position.name = "Lead"
+            member.position.save()
+
+        url = reverse("board:project-detail", args=[self.project.pk])
+        for change in (
+            rename,
+            rename_position,
+            lambda: elsewhere.assignees.add(member),
+            lambda: member.tasks.clear(),
+            lambda: elsewhere.assignees.add(member),
+            lambda: elsewhere.delete(),
+            lambda: member.delete(),
+        ):
+            with self.subTest(change=change):
+                self.assertRevalidates(url, change)
+
+    def test_task_detail(self):
+        self.assertRevalidates(
+            reverse("board:task-detail", args=[self.task.pk]),
+            lambda: self.task.assignees.add(self.user),
+        )
+
+    def test_task_detail_last_modified(self):
+        url = reverse("board:task-detail", args=[self.task.pk])
+        last_modified = self.client.get(url)["Last-Modified"]
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+
+    def test_task_detail_last_modified_after_reorder(self):
+        other = Task.objects.create(
+            name="Other",
+            board=self.board,
+            description="Description",
+            deadline=date.today() + timedelta(days=1),
+            is_completed=False,
+            task_type=self.task.task_type,
+        )
+        an_hour_ago = timezone.now() - timedelta(hours=1)
+        Task.objects.update(updated_at=an_hour_ago)
+        Board.objects.update(updated_at=an_hour_ago)
+        url = reverse("board:task-detail", args=[self.task.pk])
+        last_modified = self.client.get(url)["Last-Modified"]
+
+        place_task(self.task, after=other)
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["Last-Modified"], last_modified)
+
+    def test_project_list(self):
+        def change():
+            Project.objects.create(
+                name="Another",
+                description="Description",
+                deadline=date.today() + timedelta(days=1),
+                owner=self.user,
+            )
+
+        self.assertRevalidates(reverse("board:project-list"), change)
+
+    def test_project_list_task_deadline_change(self):
+        def change():
+            self.task.deadline = date.today() - timedelta(days=1)
+            self.task.save()
+
+        self.assertRevalidates(reverse("board:project-list"), change)
+
+    def test_project_list_owner_and_delete(self):
+        def rename_owner():
+            self.user.username = "renamed"
+            self.user.save()
+
+        other = Project.objects.create(
+            name="Another",
+            description="Description",
+            deadline=date.today() + timedelta(days=1),
+            owner=self.user,
+        )
+        url = reverse("board:project-list")
+        for change in (rename_owner, other.delete):
+            with self.subTest(change=change):
+                self.assertRevalidates(url, change)
+
+    def test_project_list_etag_does_not_scan_projects(self):
+        url = reverse("board:project-list")
+        etag = self.client.get(url)["ETag"]
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertFalse(
+            [q for q in context.captured_queries if "COUNT(" in q["sql"]]
+        )
+
+    def test_etag_is_per_user(self):
+        url = reverse("board:project-detail", args=[self.project.pk])
+        etag = self.client.get(url)["ETag"]
+        self.client.force_login(Worker.objects.create(username="other"))
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+
+class TaskDetailsViewTestCase(TestCase):
+    def setUp(self):
+        self.user = Worker.objects.create(username="owner")
+        project = Project.objects.create(
+            name="Test Project",
+            description="Test description",
+            deadline=date.today() + timedelta(days=1),
+            owner=self.user,
+        )
+        board = Board.objects.create(name="Board", project=project)
+        task_type = TaskType.objects.create(name="Bug")
+        self.tasks = []
+        for i in range(5):
+            task = Task.objects.create(
+                name=f"Task {i}",
+                board=board,
+                description="Description",
+                deadline=date.today() + timedelta(days=1),
+                is_completed=False,
+                task_type=task_type,
+            )
+            task.assignees.add(self.user)
+            task.attachments.add(
+                Attachment.objects.create(name="a", file="attachments/a.txt")
+            )
+            self.tasks.append(task)
+        self.url = reverse("board:task-details")
+        self.client.force_login(self.user)
+
+    def get(self, tasks):
+        return self.client.get(
+            self.url, {"ids": ",".join(str(task.pk) for task in tasks)}
+        )
+
+    def test_returns_records_in_constant_queries(self):
+        with CaptureQueriesContext(connection) as one:
+            self.get(self.tasks[:1])
+        with CaptureQueriesContext(connection) as many:
+            response = self.get(self.tasks)
+        self.assertEqual(len(one.captured_queries), len(many.captured_queries))
+
+        records = {task["id"]: task for task in response.json()["tasks"]}
+        self.assertEqual(set(records), {task.pk for task in self.tasks})
+        record = records[self.tasks[0].pk]
+        self.assertEqual(record["board"]["name"], "Board")
+        self.assertEqual(record["task_type"], "Bug")
+        self.assertEqual(record["assignees"][0]["username"], "owner")
+        self.assertEqual(record["attachments"][0]["name"], "a")
+
+    def test_rejects_bad_ids(self):
+        response = self.client.get(self.url, {"ids": "1,x"})
+        self.assertEqual(response.status_code, 400)